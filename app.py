@@ -1,23 +1,24 @@
 """
 Album Categorizer Application
 """
+import time
 import streamlit as st
 from PIL import Image
-from src.transformations import (
-    transform_label,
-    transform_catalog,
-    transform_artist,
-    transform_title
-)
+from src.transformations import transform_folder_fields
 from src.components.url_input import render_url_input
+from src.components.release_queue import render_release_queue
+from src.components.discography import render_discography
 from src.components.folder_output import render_folder_output
 from src.components.info_panel import render_info_panel
-from src.components.image_gallery import render_image_gallery
+from src.components.image_gallery import render_image_gallery, reset_image_selection
 from src.components.file_manager import render_file_manager
 from src.components.streaming_services import render_streaming_services
 from src.components.settings_modal import init_settings, render_settings
 from src.components.m3u_generator import render_m3u_generator
+from src.components.request_summary import render_request_summary
 from src.api.discogs import fetch_discogs_data
+from src.api.fetch_pipeline import get_release_jobs
+from src.api.release_model import compact_release, get_raw_release
 
 # Load custom favicon
 favicon = Image.open("static/images/favicon.ico")
@@ -69,6 +70,10 @@ with col2:
     # Settings button
     render_settings()
 
+# Render release queue and catalogue prefetch components
+render_release_queue()
+render_discography()
+
 # Render URL input component
 discogs_url, fetch_button = render_url_input()
 
@@ -77,6 +82,8 @@ should_fetch = fetch_button or (discogs_url != st.session_state.previous_url and
 
 if should_fetch:
     st.session_state.previous_url = discogs_url
+    # The request summary counts what loading this release cost from here on
+    st.session_state.release_load_started = time.time()
     with st.spinner('Fetching album data...'):
         data, response, error = fetch_discogs_data(discogs_url)
         
@@ -85,14 +92,18 @@ if should_fetch:
             # Clear API response on error
             st.session_state.api_response = None
         else:
-            # Store API response in session state
-            st.session_state.api_response = response.json()
+            # Store a compact copy of the release in session state, the full
+            # JSON stays in the release cache (response is None for cached releases)
+            st.session_state.api_response = compact_release(data)
+
+            # Start artist lookups and image size lookups in the background (or reuse
+            # prefetched ones), the panels below render as soon as their part is ready
+            get_release_jobs(data, restart=bool(fetch_button))
 
             # Get raw values from API
             raw_label = data.get('labels', [{}])[0].get('name', '')
             raw_catalog = data.get('labels', [{}])[0].get('catno', '')
             raw_artist = ', '.join(artist.get('anv') or artist.get('name', '') for artist in data.get('artists', []))
-            input_artist = ' & '.join(artist.get('anv') or artist.get('name', '') for artist in data.get('artists', []))
             raw_title = data.get('title', '')
             raw_artists_sort = data.get('artists_sort', '')
             raw_country = data.get('country', '')
@@ -125,12 +136,14 @@ if should_fetch:
             
             # Store images in session state
             st.session_state.discogs_images = data.get('images', [])
+            reset_image_selection()
 
             # Apply transformations and update current values
-            st.session_state.label = transform_label(raw_label)
-            st.session_state.catalog = transform_catalog(raw_catalog, raw_label)
-            st.session_state.artist = transform_artist(input_artist, raw_format_descriptions)
-            st.session_state.title = transform_title(raw_title, raw_format_descriptions, input_artist)
+            folder_fields = transform_folder_fields(data)
+            st.session_state.label = folder_fields['label']
+            st.session_state.catalog = folder_fields['catalog']
+            st.session_state.artist = folder_fields['artist']
+            st.session_state.title = folder_fields['title']
             st.session_state.formats_qty = raw_format_qty
             st.session_state.formats_name = raw_format_name
             st.session_state.format_descriptions = raw_format_descriptions
@@ -141,13 +154,20 @@ if should_fetch:
             st.session_state.notes = raw_notes
             st.session_state.discogs_url = discogs_url
 
+            # Derive notes and tracklist again for the freshly fetched release
+            st.session_state.release_snapshot = None
+
             # Reset file manager state
             reset_file_manager_state()
 
 # API Response Debug Section (always visible if we have a response)
 if st.session_state.api_response:
     with st.expander("🔍 View API Response Details"):
-        st.json(st.session_state.api_response)
+        render_request_summary(st.session_state.api_response, st.session_state.get('release_load_started'))
+
+        # The full JSON is only loaded and rendered on demand
+        if st.toggle("Show raw JSON", key="show_raw_json"):
+            st.json(get_raw_release(st.session_state.api_response['id']) or st.session_state.api_response)
 
     # Load global CSS
     with open('static/styles.css') as f:
@@ -0,0 +1,3 @@
+"""
+Offline benchmarks against a local Discogs API stand-in
+"""
@@ -0,0 +1,129 @@
+"""
+Offline fetch-to-render benchmark
+
+Usage:
+    python -m benchmarks.run_benchmark [--latency 120] [--throttle-every 10] [--releases 900001 900002]
+
+Starts the Discogs stand-in server, points the app's API client at it with
+an empty cache directory and times every fixture release from the fetch to
+the moment everything the panels render is ready: release data, artist
+details, the info file and the image sizes. Each release is measured cold
+and then warm, with the stand-in's request counts for each measurement.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import urllib.request
+from typing import Dict, List
+from .standin_server import FIXTURES_DIR, add_config_arguments, get_config, start_server
+
+def get_fixture_release_ids() -> List[str]:
+    """Get the IDs of all release fixtures"""
+    releases_dir = os.path.join(FIXTURES_DIR, 'releases')
+    return sorted(name[:-len('.json')] for name in os.listdir(releases_dir) if name.endswith('.json'))
+
+def read_server_stats(base_url: str, reset: bool = False) -> Dict:
+    """Get the stand-in's request counters, optionally resetting them"""
+    with urllib.request.urlopen(f'{base_url}/_stats') as response:
+        stats = json.load(response)
+    if reset:
+        urllib.request.urlopen(f'{base_url}/_reset').close()
+    return stats
+
+def measure_release(release_id: str) -> Dict:
+    """
+    Fetch and prepare one release the way the app does
+
+    Returns:
+        Dict: Stage timings in milliseconds and the fetch error, if any
+    """
+    # Imported here so DISCOGS_API_URL and the cache directory are set first
+    from src.api.discogs import fetch_release
+    from src.api.fetch_pipeline import get_release_jobs
+    from src.transformations.info import format_info_file, get_release_info
+
+    started = time.perf_counter()
+    timings = {}
+
+    def mark(stage: str) -> None:
+        timings[stage] = (time.perf_counter() - started) * 1000
+
+    data, _, error = fetch_release(release_id)
+    mark('fetch')
+    if error:
+        return {'error': error, **timings}
+
+    jobs = get_release_jobs(data)
+    artist_details = jobs.artist_details.result()
+    mark('artists')
+    fields, tracklist = get_release_info(data, artist_details)
+    format_info_file(fields, tracklist)
+    mark('info')
+    for future in jobs.image_sizes:
+        future.result()
+    mark('images')
+    return timings
+
+def format_row(values: List, widths: List[int]) -> str:
+    """Format a table row with right-aligned columns after the first two"""
+    cells = [str(value).ljust(width) if i < 2 else str(value).rjust(width) for i, (value, width) in enumerate(zip(values, widths))]
+    return '  '.join(cells)
+
+def main(argv: List[str] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Measure fetch-to-render latency against the Discogs stand-in')
+    parser.add_argument('--releases', nargs='+', default=None, help='Fixture release IDs (default: all)')
+    parser.add_argument('--json', default=None, help='Also write the results to this JSON file')
+    add_config_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = start_server(get_config(args))
+    base_url = f'http://127.0.0.1:{server.server_address[1]}'
+    cache_dir = tempfile.mkdtemp(prefix='album-categorizer-bench-')
+    os.environ['DISCOGS_API_URL'] = base_url
+    os.environ['ALBUM_CATEGORIZER_CACHE_DIR'] = cache_dir
+    os.environ['DISCOGS_USE_DUMP'] = '0'
+
+    release_ids = args.releases or get_fixture_release_ids()
+    results = []
+    for phase in ('cold', 'warm'):
+        for release_id in release_ids:
+            read_server_stats(base_url, reset=True)
+            timings = measure_release(release_id)
+            stats = read_server_stats(base_url)
+            results.append({'phase': phase, 'release_id': release_id, **timings, **stats})
+
+    widths = [5, 8, 9, 9, 9, 9, 7, 7, 7, 5, 5, 9]
+    print(format_row(['phase', 'release', 'fetch ms', 'artist ms', 'info ms', 'total ms',
+                      'rel req', 'art req', 'img req', '429', '304', 'KB'], widths))
+    for result in results:
+        requests = result.get('requests', {})
+        if 'error' in result:
+            print(f"{result['phase']:<5}  {result['release_id']:<8}  {result['error']}")
+            continue
+        print(format_row([
+            result['phase'],
+            result['release_id'],
+            f"{result['fetch']:.1f}",
+            f"{result['artists']:.1f}",
+            f"{result['info']:.1f}",
+            f"{result['images']:.1f}",
+            requests.get('release', 0),
+            requests.get('artist', 0),
+            requests.get('image', 0),
+            requests.get('429', 0),
+            requests.get('304', 0),
+            f"{result['bytes'] / 1024:.1f}"
+        ], widths))
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    server.shutdown()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,363 @@
+"""
+Local Discogs API stand-in server
+
+Usage:
+    python -m benchmarks.standin_server [--port 8765] [--latency 120] [--throttle-every 10]
+    python -m benchmarks.standin_server --record   # fill in missing fixtures from the live API
+
+Replays recorded API responses from benchmarks/fixtures, so the fetch paths
+can be measured and exercised offline:
+
+    DISCOGS_API_URL=http://127.0.0.1:8765 streamlit run app.py
+
+Fixtures are stored by request path, e.g. /releases/123 is
+fixtures/releases/123.json and /labels/1/releases?page=2 is
+fixtures/labels/1/releases.page-2.json. API and image URLs inside replayed
+responses point back at the stand-in. Images without a fixture are
+generated at the size encoded in their URL.
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+from urllib.request import Request, urlopen
+from dotenv import load_dotenv
+from PIL import Image
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+UPSTREAM_API_URL = 'https://api.discogs.com'
+UPSTREAM_IMAGE_URL = 'https://i.discogs.com'
+
+@dataclass
+class StandinConfig:
+    """
+    Behaviour of the stand-in server
+
+    Attributes:
+        latency: Added delay per request in milliseconds
+        jitter: Random extra delay of up to this many milliseconds
+        ratelimit: Requests per minute reported in X-Discogs-Ratelimit; API
+            requests beyond it get a 429 like the live API
+        throttle_every: Answer every Nth API request with a 429 (0 to disable)
+        retry_after: Retry-After header of injected 429s, in seconds
+        record: Fetch and store missing fixtures from the live API
+        token: Discogs token used when recording
+    """
+    latency: float = 0.0
+    jitter: float = 0.0
+    ratelimit: int = 60
+    throttle_every: int = 0
+    retry_after: int = 1
+    record: bool = False
+    token: Optional[str] = None
+
+class StandinState:
+    """Request counters and the rate limit window, shared by the handler threads"""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = Counter()
+        self.bytes_sent = 0
+        self.api_requests = 0
+        self.window = deque()
+
+    def reset(self) -> None:
+        """Clear the counters, the rate limit window is kept"""
+        with self.lock:
+            self.counts.clear()
+            self.bytes_sent = 0
+
+    def snapshot(self) -> Dict:
+        """Get the counters as a dict"""
+        with self.lock:
+            return {'requests': dict(self.counts), 'bytes': self.bytes_sent}
+
+def get_request_class(path: str) -> str:
+    """
+    Classify a request path for the counters
+
+    Returns:
+        str: 'release', 'artist', 'listing', 'search', 'image' or 'other'
+    """
+    if path.startswith('/images/'):
+        return 'image'
+    if re.fullmatch(r'/releases/\d+', path):
+        return 'release'
+    if re.fullmatch(r'/artists/\d+', path):
+        return 'artist'
+    if re.fullmatch(r'/(labels|artists)/\d+/releases', path):
+        return 'listing'
+    if path.startswith('/database/search'):
+        return 'search'
+    return 'other'
+
+def get_fixture_path(path: str, query: str = '') -> str:
+    """
+    Get the fixture file of an API request
+
+    Args:
+        path: Request path, e.g. '/labels/1/releases'
+        query: Query string, only the page number is part of the fixture name
+
+    Returns:
+        str: Absolute fixture path
+    """
+    name = path.strip('/')
+    params = parse_qs(query)
+    if params.get('page', ['1'])[0] != '1':
+        name += f".page-{params['page'][0]}"
+    if params.get('q'):
+        name += '.' + hashlib.sha1(query.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(FIXTURES_DIR, *name.split('/')) + '.json'
+
+def get_image_fixture_path(image_path: str) -> str:
+    """Get the fixture file of an image by its path on the image host"""
+    digest = hashlib.sha1(image_path.encode('utf-8')).hexdigest()[:20]
+    return os.path.join(FIXTURES_DIR, 'images', digest)
+
+def generate_image(image_path: str) -> bytes:
+    """
+    Generate a JPEG for an image without a fixture
+
+    The size is taken from the w:/h: segments of Discogs image URLs.
+    """
+    width = re.search(r'/w:(\d+)', image_path)
+    height = re.search(r'/h:(\d+)', image_path)
+    size = (int(width.group(1)) if width else 600, int(height.group(1)) if height else 600)
+    digest = hashlib.sha1(image_path.encode('utf-8')).digest()
+    buffer = BytesIO()
+    Image.new('RGB', size, tuple(digest[:3])).save(buffer, 'JPEG', quality=85)
+    return buffer.getvalue()
+
+def fetch_upstream(url: str, token: str = None) -> Optional[bytes]:
+    """Fetch a live response to record, or None if it fails"""
+    headers = {'User-Agent': 'AlbumCategorizer/1.0 (fixture recorder)'}
+    if token and url.startswith(UPSTREAM_API_URL):
+        headers['Authorization'] = f'Discogs token={token}'
+    try:
+        with urlopen(Request(url, headers=headers), timeout=30) as response:
+            return response.read()
+    except Exception as e:
+        print(f'Recording {url} failed: {e}', file=sys.stderr)
+        return None
+
+def read_fixture(path: str, upstream_url: str, config: StandinConfig) -> Optional[bytes]:
+    """Read a fixture, recording it first if it is missing and recording is on"""
+    if not os.path.exists(path) and config.record:
+        body = fetch_upstream(upstream_url, config.token)
+        if body is None:
+            return None
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(body)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'rb') as f:
+        return f.read()
+
+class StandinHandler(BaseHTTPRequestHandler):
+    """Request handler replaying fixtures"""
+    server_version = 'DiscogsStandin/1.0'
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        """Keep the console quiet, the counters tell what happened"""
+
+    @property
+    def config(self) -> StandinConfig:
+        """Behaviour of the server this request arrived at"""
+        return self.server.config
+
+    @property
+    def state(self) -> StandinState:
+        """Counters of the server this request arrived at"""
+        return self.server.state
+
+    def get_base_url(self) -> str:
+        """Get the URL clients reach the stand-in at"""
+        return f'http://{self.headers.get("Host") or "%s:%s" % self.server.server_address[:2]}'
+
+    def send_body(self, status: int, body: bytes, content_type: str, headers: Dict = None) -> None:
+        """Send a complete response"""
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+        with self.state.lock:
+            self.state.bytes_sent += len(body)
+
+    def send_json(self, status: int, data: Dict, headers: Dict = None) -> None:
+        """Send a JSON response"""
+        self.send_body(status, json.dumps(data).encode('utf-8'), 'application/json', headers)
+
+    def take_ratelimit(self) -> tuple[bool, Dict]:
+        """
+        Count an API request against the rate limit
+
+        Returns:
+            tuple[bool, Dict]: Whether to answer with a 429, and the rate limit headers
+        """
+        state, config = self.state, self.config
+        now = time.time()
+        with state.lock:
+            state.api_requests += 1
+            while state.window and now - state.window[0] >= 60:
+                state.window.popleft()
+            throttled = len(state.window) >= config.ratelimit or (
+                config.throttle_every and state.api_requests % config.throttle_every == 0
+            )
+            if not throttled:
+                state.window.append(now)
+            used = len(state.window)
+        headers = {
+            'X-Discogs-Ratelimit': str(config.ratelimit),
+            'X-Discogs-Ratelimit-Used': str(used),
+            'X-Discogs-Ratelimit-Remaining': str(max(0, config.ratelimit - used))
+        }
+        return throttled, headers
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        path = url.path.rstrip('/')
+
+        # Control endpoints used by the benchmark harness
+        if path == '/_stats':
+            return self.send_json(200, self.state.snapshot())
+        if path == '/_reset':
+            self.state.reset()
+            return self.send_json(200, {})
+
+        request_class = get_request_class(path)
+        with self.state.lock:
+            self.state.counts[request_class] += 1
+
+        delay = self.config.latency + random.uniform(0, self.config.jitter)
+        if delay:
+            time.sleep(delay / 1000)
+
+        if request_class == 'image':
+            image_path = path[len('/images'):]
+            body = read_fixture(
+                get_image_fixture_path(image_path),
+                UPSTREAM_IMAGE_URL + image_path,
+                self.config
+            ) or generate_image(image_path)
+            # The image host answers byte ranges, e.g. for header-only size probes
+            byte_range = re.match(r'bytes=(\d+)-(\d*)$', self.headers.get('Range') or '')
+            if byte_range:
+                start = int(byte_range.group(1))
+                end = min(int(byte_range.group(2) or len(body) - 1), len(body) - 1)
+                return self.send_body(206, body[start:end + 1], 'image/jpeg', {
+                    'Content-Range': f'bytes {start}-{end}/{len(body)}'
+                })
+            return self.send_body(200, body, 'image/jpeg')
+
+        throttled, headers = self.take_ratelimit()
+        if throttled:
+            with self.state.lock:
+                self.state.counts['429'] += 1
+            headers['Retry-After'] = str(self.config.retry_after)
+            return self.send_json(429, {'message': "You are making requests too quickly."}, headers)
+
+        body = read_fixture(
+            get_fixture_path(path, url.query),
+            UPSTREAM_API_URL + self.path,
+            self.config
+        )
+        if body is None:
+            return self.send_json(404, {'message': 'Resource not found.'}, headers)
+
+        # Point API and image links at the stand-in
+        base_url = self.get_base_url()
+        body = body.replace(UPSTREAM_API_URL.encode(), base_url.encode())
+        body = body.replace(UPSTREAM_IMAGE_URL.encode(), f'{base_url}/images'.encode())
+
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        headers['ETag'] = etag
+        if self.headers.get('If-None-Match') == etag:
+            with self.state.lock:
+                self.state.counts['304'] += 1
+            self.send_response(304)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_body(200, body, 'application/json', headers)
+
+    do_HEAD = do_GET
+
+def create_server(config: StandinConfig, host: str = '127.0.0.1', port: int = 0) -> ThreadingHTTPServer:
+    """
+    Create a stand-in server, port 0 picks a free port
+
+    Returns:
+        ThreadingHTTPServer: Server, call serve_forever() to run it
+    """
+    server = ThreadingHTTPServer((host, port), StandinHandler)
+    server.daemon_threads = True
+    server.config = config
+    server.state = StandinState()
+    return server
+
+def start_server(config: StandinConfig, host: str = '127.0.0.1', port: int = 0) -> ThreadingHTTPServer:
+    """Start a stand-in server in a background thread"""
+    server = create_server(config, host, port)
+    threading.Thread(target=server.serve_forever, name='discogs-standin', daemon=True).start()
+    return server
+
+def add_config_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the server behaviour options to a command line parser"""
+    parser.add_argument('--latency', type=float, default=0.0, help='Added delay per request in ms')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Random extra delay of up to this many ms')
+    parser.add_argument('--ratelimit', type=int, default=60, help='Requests per minute before 429s (default: 60)')
+    parser.add_argument('--throttle-every', type=int, default=0, help='Answer every Nth API request with a 429')
+    parser.add_argument('--retry-after', type=int, default=1, help='Retry-After of injected 429s in seconds')
+
+def get_config(args: argparse.Namespace) -> StandinConfig:
+    """Build the server config from parsed command line options"""
+    return StandinConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        ratelimit=args.ratelimit,
+        throttle_every=args.throttle_every,
+        retry_after=args.retry_after,
+        record=getattr(args, 'record', False),
+        token=os.getenv('DISCOGS_TOKEN')
+    )
+
+def main(argv=None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Replay recorded Discogs API responses locally')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--record', action='store_true', help='Fetch and store missing fixtures from the live API')
+    add_config_arguments(parser)
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    server = create_server(get_config(args), args.host, args.port)
+    print(f'Discogs stand-in listening on http://{args.host}:{server.server_address[1]}')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
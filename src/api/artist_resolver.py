@@ -0,0 +1,176 @@
+"""
+Discogs artist resolver with a persistent cache
+"""
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import Future
+from typing import Optional
+import requests
+from .discogs import discogs_get
+from .dump_store import get_dump_artist
+from .rate_limiter import PRIORITY_INTERACTIVE
+from .telemetry import record_cache_lookup
+from ..utils.memory_cache import get_memory_cache
+from ..utils.sqlite_store import connect
+
+ARTIST_CACHE_DB = 'discogs.sqlite3'
+
+# Seconds resolved artists are reused (default: 30 days)
+ARTIST_CACHE_TTL = int(os.getenv('ARTIST_CACHE_TTL', 30 * 24 * 60 * 60))
+
+# Seconds a failed lookup is remembered before it is retried (default: 10 minutes)
+ARTIST_FAILURE_TTL = int(os.getenv('ARTIST_FAILURE_TTL', 10 * 60))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS artists (
+    artist_key TEXT PRIMARY KEY,
+    realname TEXT NOT NULL DEFAULT '',
+    members TEXT NOT NULL DEFAULT '[]',
+    ok INTEGER NOT NULL,
+    fetched_at REAL NOT NULL
+);
+"""
+
+# Lookups currently in flight, shared by every session of this server process
+_in_flight: dict[str, Future] = {}
+_in_flight_lock = threading.Lock()
+
+def _get_connection():
+    """Get a database connection, creating the schema on first use"""
+    return connect(ARTIST_CACHE_DB, _SCHEMA)
+
+def get_artist_key(resource_url: str) -> str:
+    """
+    Get the cache key for an artist resource URL
+
+    Args:
+        resource_url: Artist's resource URL from Discogs API
+
+    Returns:
+        str: Discogs artist ID, or the URL itself if it has no ID
+    """
+    match = re.search(r'/artists/(\d+)', resource_url)
+    return match.group(1) if match else resource_url
+
+def get_cached_artist(resource_url: str) -> Optional[tuple[str, list[str]]]:
+    """
+    Get an artist from the cache
+
+    Args:
+        resource_url: Artist's resource URL from Discogs API
+
+    Returns:
+        Optional[tuple[str, list[str]]]: (realname, member names), or None if the
+        artist is not cached or the entry has expired
+    """
+    key = get_artist_key(resource_url)
+    memory = get_memory_cache('artists')
+    row = memory.get(key)
+    if row is None:
+        row = _get_connection().execute(
+            'SELECT realname, members, ok, fetched_at FROM artists WHERE artist_key = ?',
+            (key,)
+        ).fetchone()
+        if not row:
+            return None
+        memory.put(key, row)
+
+    realname, members, ok, fetched_at = row
+    ttl = ARTIST_CACHE_TTL if ok else ARTIST_FAILURE_TTL
+    if time.time() - fetched_at >= ttl:
+        return None
+    return realname, json.loads(members)
+
+def store_artist(resource_url: str, realname: str, members: list[str], ok: bool = True) -> None:
+    """
+    Store an artist lookup result in the cache
+
+    Args:
+        resource_url: Artist's resource URL from Discogs API
+        realname: Artist's real name
+        members: Member names
+        ok: False for failed lookups, which expire after ARTIST_FAILURE_TTL
+    """
+    row = (realname, json.dumps(members), int(ok), time.time())
+    _get_connection().execute(
+        'INSERT OR REPLACE INTO artists (artist_key, realname, members, ok, fetched_at) '
+        'VALUES (?, ?, ?, ?, ?)',
+        (get_artist_key(resource_url), *row)
+    )
+    get_memory_cache('artists').put(get_artist_key(resource_url), row)
+
+def fetch_artist_details(resource_url: str, priority: int = PRIORITY_INTERACTIVE) -> tuple[str, list[str], bool]:
+    """
+    Fetch artist's details from the local data dump or the Discogs API
+
+    Args:
+        resource_url: Artist's resource URL from Discogs API
+        priority: PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND
+
+    Returns:
+        Tuple of (realname, list of member names, success)
+    """
+    started = time.perf_counter()
+    local = get_dump_artist(get_artist_key(resource_url))
+    if local is not None:
+        record_cache_lookup(resource_url, 'dump', started)
+        return local[0], local[1], True
+
+    try:
+        response = discogs_get(resource_url, priority=priority)
+        response.raise_for_status()
+        artist_data = response.json()
+    except (requests.exceptions.RequestException, ValueError):
+        return '', [], False
+
+    realname = artist_data.get('realname', '') or ''
+    members = [member.get('name', '') for member in artist_data.get('members', [])]
+    # Filter out empty member names
+    members = [name for name in members if name]
+    return realname, members, True
+
+def get_artist_details(resource_url: str, priority: int = PRIORITY_INTERACTIVE) -> tuple[str, list[str]]:
+    """
+    Get artist's details, from the cache when possible
+
+    Concurrent calls for the same artist share a single HTTP request, and
+    failed lookups are cached for a shorter time so they aren't retried on
+    every call.
+
+    Args:
+        resource_url: Artist's resource URL from Discogs API
+        priority: PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND
+
+    Returns:
+        Tuple of (realname, list of member names)
+    """
+    started = time.perf_counter()
+    cached = get_cached_artist(resource_url)
+    if cached is not None:
+        record_cache_lookup(resource_url, 'hit', started)
+        return cached
+
+    key = get_artist_key(resource_url)
+    with _in_flight_lock:
+        future = _in_flight.get(key)
+        is_leader = future is None
+        if is_leader:
+            future = _in_flight[key] = Future()
+
+    if not is_leader:
+        return future.result()
+
+    try:
+        realname, members, ok = fetch_artist_details(resource_url, priority)
+        store_artist(resource_url, realname, members, ok)
+        future.set_result((realname, members))
+    except Exception as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _in_flight_lock:
+            del _in_flight[key]
+    return realname, members
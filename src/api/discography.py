@@ -0,0 +1,200 @@
+"""
+Label and artist discography prefetch
+"""
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from .discogs import DISCOGS_API_URL, discogs_get, fetch_release, get_auth_headers
+from .rate_limiter import PRIORITY_BACKGROUND
+from ..transformations.folder import transform_folder_name
+
+KIND_LABEL = 'labels'
+KIND_ARTIST = 'artists'
+
+# Largest page size the API allows, fewer pages means fewer requests
+PAGE_SIZE = 100
+
+# Concurrent page and release requests per job; the rate limiter still caps API calls
+MAX_DISCOGRAPHY_WORKERS = 4
+
+@dataclass
+class DiscographyJob:
+    """
+    Progress of one label or artist prefetch
+
+    Attributes:
+        kind: KIND_LABEL or KIND_ARTIST
+        entity_id: Discogs label or artist ID
+        release_ids: Releases listed so far, in catalogue order
+        folder_names: Folder name by release ID, once the release is fetched
+        errors: Error message by release ID, or by page for listing errors
+        pages: Number of listing pages, 0 until the first page is in
+        done: True once every release has been processed
+        cancelled: Set to stop the job after the requests in flight
+    """
+    kind: str
+    entity_id: str
+    release_ids: List[str] = field(default_factory=list)
+    folder_names: Dict[str, str] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+    pages: int = 0
+    done: bool = False
+    cancelled: bool = False
+
+_jobs: Dict[tuple[str, str], DiscographyJob] = {}
+_jobs_lock = threading.Lock()
+
+def parse_discography_source(text: str, default_kind: str = KIND_LABEL) -> Optional[tuple[str, str]]:
+    """
+    Get the kind and ID of a label or artist
+
+    Args:
+        text: Discogs label or artist URL, or a bare ID
+        default_kind: Kind of a bare ID
+
+    Returns:
+        Optional[tuple[str, str]]: (kind, ID), or None if nothing matches
+    """
+    text = (text or '').strip()
+    match = re.search(r'(label|artist)s?/(\d+)', text)
+    if match:
+        return match.group(1) + 's', match.group(2)
+    if text.isdigit():
+        return default_kind, text
+    return None
+
+def get_listing_release_ids(kind: str, items: List[Dict]) -> List[str]:
+    """
+    Get the release IDs of a listing page
+
+    Artist listings also contain masters, which are replaced by their main
+    release, and appearances on other artists' releases, which are skipped.
+
+    Args:
+        kind: KIND_LABEL or KIND_ARTIST
+        items: 'releases' of a listing page
+
+    Returns:
+        List[str]: Release IDs
+    """
+    release_ids = []
+    for item in items:
+        if kind == KIND_ARTIST and item.get('role', 'Main') != 'Main':
+            continue
+        release_id = item.get('main_release') if item.get('type') == 'master' else item.get('id')
+        if release_id:
+            release_ids.append(str(release_id))
+    return release_ids
+
+def fetch_listing_page(kind: str, entity_id: str, page: int, token: str = None) -> Dict:
+    """
+    Fetch one page of a label's or artist's releases
+
+    Args:
+        kind: KIND_LABEL or KIND_ARTIST
+        entity_id: Discogs label or artist ID
+        page: One-based page number
+        token: Discogs token, empty for unauthenticated requests
+
+    Returns:
+        Dict: Page JSON with 'pagination' and 'releases'
+    """
+    response = discogs_get(
+        f"{DISCOGS_API_URL}/{kind}/{entity_id}/releases?page={page}&per_page={PAGE_SIZE}",
+        headers=get_auth_headers(token),
+        priority=PRIORITY_BACKGROUND
+    )
+    response.raise_for_status()
+    return response.json()
+
+def prefetch_listed_release(job: DiscographyJob, release_id: str, token: str = None) -> None:
+    """Warm the release cache with one listed release and derive its folder name"""
+    if job.cancelled:
+        return
+    data, _, error = fetch_release(release_id, token, priority=PRIORITY_BACKGROUND)
+    if error:
+        job.errors[release_id] = error
+    else:
+        job.folder_names[release_id] = transform_folder_name(data)
+
+def run_discography_job(job: DiscographyJob, token: str = None) -> None:
+    """
+    Walk every listing page and prefetch the listed releases
+
+    The first page tells how many pages there are, the others are fetched
+    concurrently. Releases are fetched as soon as their page is in, so
+    listing and fetching overlap.
+
+    Args:
+        job: Job to fill in
+        token: Discogs token, empty for unauthenticated requests
+    """
+    with ThreadPoolExecutor(max_workers=MAX_DISCOGRAPHY_WORKERS, thread_name_prefix='discography') as executor:
+        release_futures = []
+        listed = set()
+
+        def add_releases(page_data: Dict) -> None:
+            for release_id in get_listing_release_ids(job.kind, page_data.get('releases', [])):
+                if release_id in listed:
+                    continue
+                listed.add(release_id)
+                job.release_ids.append(release_id)
+                release_futures.append(executor.submit(prefetch_listed_release, job, release_id, token))
+
+        try:
+            first_page = fetch_listing_page(job.kind, job.entity_id, 1, token)
+            job.pages = first_page.get('pagination', {}).get('pages', 1)
+
+            # Queue the other pages ahead of the releases so the listing completes early
+            page_futures = {
+                executor.submit(fetch_listing_page, job.kind, job.entity_id, page, token): page
+                for page in range(2, job.pages + 1)
+            }
+            add_releases(first_page)
+            for future in as_completed(page_futures):
+                try:
+                    add_releases(future.result())
+                except Exception as e:
+                    job.errors[f'page {page_futures[future]}'] = str(e)
+        except Exception as e:
+            job.errors['page 1'] = str(e)
+
+        for future in as_completed(release_futures):
+            future.result()
+    job.done = True
+
+def start_discography_job(kind: str, entity_id: str, token: str = None) -> DiscographyJob:
+    """
+    Start prefetching a label's or artist's releases in the background
+
+    A job that is still running for the same label or artist is reused.
+
+    Args:
+        kind: KIND_LABEL or KIND_ARTIST
+        entity_id: Discogs label or artist ID
+        token: Discogs token, empty for unauthenticated requests
+
+    Returns:
+        DiscographyJob: Running job
+    """
+    with _jobs_lock:
+        job = _jobs.get((kind, entity_id))
+        if job and not job.done:
+            return job
+        job = DiscographyJob(kind, entity_id)
+        _jobs[(kind, entity_id)] = job
+
+    threading.Thread(
+        target=run_discography_job,
+        args=(job, token),
+        name=f'discography-{kind}-{entity_id}',
+        daemon=True
+    ).start()
+    return job
+
+def get_discography_job(kind: str, entity_id: str) -> Optional[DiscographyJob]:
+    """Get the latest job of a label or artist"""
+    with _jobs_lock:
+        return _jobs.get((kind, entity_id))
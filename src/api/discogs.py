@@ -1,12 +1,38 @@
 """
 Discogs API integration module
 """
+import os
 import requests
+import random
 import re
+import time
 import streamlit as st
+from .dump_store import get_dump_release
+from .http_client import http_get
+from .release_index import queue_index_release
+from .telemetry import record_cache_lookup
+from .rate_limiter import (
+    PRIORITY_INTERACTIVE,
+    acquire,
+    calibrate,
+    block_for
+)
+from .release_cache import (
+    get_cached_release,
+    is_fresh,
+    store_release,
+    touch_release,
+    get_revalidation_headers,
+    record_cache_event
+)
 
-DISCOGS_API_URL = "https://api.discogs.com"
-DISCOGS_USER_AGENT = "AlbumCategorizer/1.0"
+# Base URL of the API, e.g. a local stand-in server for benchmarks (see README)
+DISCOGS_API_URL = os.getenv('DISCOGS_API_URL', "https://api.discogs.com").rstrip('/')
+
+# Retries for 429, 5xx and connection errors, with jittered exponential backoff
+MAX_RETRIES = 4
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
 
 def extract_release_id(url):
     """Extract release ID from Discogs URL"""
@@ -14,23 +40,163 @@ def extract_release_id(url):
     match = re.search(pattern, url)
     return match.group(1) if match else None
 
-def fetch_discogs_data(url):
-    """Fetch album data from Discogs API"""
-    release_id = extract_release_id(url)
-    if not release_id:
-        return None, None, "Invalid Discogs URL. Please use a release URL (e.g., https://www.discogs.com/release/123)"
+def get_backoff_delay(attempt: int, retry_after: str = None) -> float:
+    """
+    Get the delay before the next retry
+
+    Args:
+        attempt: Zero-based attempt number
+        retry_after: Retry-After response header, if any
+
+    Returns:
+        float: Delay in seconds
+    """
+    try:
+        if retry_after:
+            return float(retry_after)
+    except ValueError:
+        pass
+    delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt)
+    return random.uniform(delay / 2, delay)
+
+def discogs_get(url: str, headers: dict = None, priority: int = PRIORITY_INTERACTIVE) -> requests.Response:
+    """
+    Send a GET request to the Discogs API within the shared rate budget
+
+    Every response recalibrates the budget from the X-Discogs-Ratelimit
+    headers. 429 responses pause the budget for all processes, 429, 5xx and
+    connection errors are retried with jittered exponential backoff.
+
+    Args:
+        url: Discogs API URL
+        headers: Extra request headers
+        priority: PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND
+
+    Returns:
+        requests.Response: Last response received
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        acquire(priority=priority)
+        try:
+            response = http_get(url, headers=headers, retries=attempt)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            if attempt == MAX_RETRIES:
+                raise
+            time.sleep(get_backoff_delay(attempt))
+            continue
+
+        calibrate(response.headers)
+        if attempt < MAX_RETRIES:
+            if response.status_code == 429:
+                # acquire() waits until the pause is over
+                block_for(get_backoff_delay(attempt, response.headers.get('Retry-After')))
+                continue
+            if response.status_code >= 500:
+                time.sleep(get_backoff_delay(attempt))
+                continue
+        return response
+
+def get_auth_headers(token: str = None) -> dict:
+    """
+    Get the Discogs authorization header for a personal access token
+
+    Args:
+        token: Discogs token, empty for unauthenticated requests
+
+    Returns:
+        dict: Authorization header, or an empty dict
+    """
+    return {'Authorization': f'Discogs token={token}'} if token else {}
 
-    # Get Discogs token from settings
-    headers = {'User-Agent': DISCOGS_USER_AGENT}
-    if st.session_state.get('discogs_token'):
-        headers['Authorization'] = f'Discogs token={st.session_state.discogs_token}'
+def has_image_urls(data: dict) -> bool:
+    """Check if a release lists images that can be downloaded"""
+    return any(image.get('uri') for image in data.get('images', []))
+
+def fetch_release(release_id: str, token: str = None, priority: int = PRIORITY_INTERACTIVE, revalidate: bool = False,
+                  need_images: bool = False):
+    """
+    Fetch a release by ID, without touching session state
+
+    Releases are served from the local release cache while they are fresh.
+    Stale cache entries are revalidated with a conditional request, so an
+    unchanged release costs a 304 instead of a full download, and served
+    stale if Discogs can't be reached. Releases that were never cached come
+    from the imported data dump if there is one; dump releases have no image
+    URLs, so callers that show images fetch them from Discogs instead.
+
+    Args:
+        release_id: Discogs release ID
+        token: Discogs token, empty for unauthenticated requests
+        priority: PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND
+        revalidate: Ask Discogs even if the cached copy is fresh or the release is in the dump
+        need_images: Skip dump releases without image URLs
+
+    Returns:
+        Tuple of (release data, response or None if served from cache, error message)
+    """
+    started = time.perf_counter()
+    release_url = f"{DISCOGS_API_URL}/releases/{release_id}"
+    cached = get_cached_release(release_id)
+    dump_data = None if cached else get_dump_release(release_id)
+    if not revalidate:
+        if cached and is_fresh(cached):
+            record_cache_event('hit')
+            record_cache_lookup(release_url, 'hit', started)
+            return cached['data'], None, None
+
+        if dump_data and (not need_images or has_image_urls(dump_data)):
+            record_cache_event('dump')
+            record_cache_lookup(release_url, 'dump', started)
+            return dump_data, None, None
+
+    headers = get_auth_headers(token)
+    headers.update(get_revalidation_headers(cached))
     
     try:
-        response = requests.get(
-            f"{DISCOGS_API_URL}/releases/{release_id}",
-            headers=headers
+        response = discogs_get(
+            release_url,
+            headers=headers,
+            priority=priority
         )
+        if response.status_code == 304 and cached:
+            touch_release(release_id)
+            record_cache_event('revalidated')
+            return cached['data'], response, None
+
         response.raise_for_status()
-        return response.json(), response, None
+        data = response.json()
+        store_release(
+            release_id,
+            data,
+            response.headers.get('ETag'),
+            response.headers.get('Last-Modified')
+        )
+        queue_index_release(data)
+        record_cache_event('miss')
+        return data, response, None
     except requests.exceptions.RequestException as e:
+        if cached:
+            # Serve the stale copy rather than failing
+            record_cache_event('stale')
+            record_cache_lookup(release_url, 'stale', started)
+            return cached['data'], None, None
+        if dump_data:
+            # The dump copy, even without images, beats no release at all
+            record_cache_event('dump')
+            record_cache_lookup(release_url, 'dump', started)
+            return dump_data, None, None
         return None, None, f"Error fetching data: {str(e)}"
+
+def fetch_discogs_data(url):
+    """
+    Fetch album data from Discogs API
+
+    Returns:
+        Tuple of (release data, response or None if served locally, error message)
+    """
+    release_id = extract_release_id(url)
+    if not release_id:
+        return None, None, "Invalid Discogs URL. Please use a release URL (e.g., https://www.discogs.com/release/123)"
+
+    # Get Discogs token from settings; the gallery and artwork need image URLs
+    return fetch_release(release_id, st.session_state.get('discogs_token'), need_images=True)
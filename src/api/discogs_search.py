@@ -0,0 +1,73 @@
+"""
+Discogs database search with a persistent cache
+"""
+import json
+import os
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlencode
+import requests
+from .discogs import DISCOGS_API_URL, discogs_get, get_auth_headers
+from .rate_limiter import PRIORITY_BACKGROUND
+from ..utils.sqlite_store import connect
+
+SEARCH_CACHE_DB = 'discogs.sqlite3'
+
+# Seconds search results are reused (default: 7 days)
+SEARCH_CACHE_TTL = int(os.getenv('SEARCH_CACHE_TTL', 7 * 24 * 60 * 60))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS searches (
+    query TEXT PRIMARY KEY,
+    results TEXT NOT NULL,
+    fetched_at REAL NOT NULL
+);
+"""
+
+def _get_connection():
+    """Get a database connection, creating the schema on first use"""
+    return connect(SEARCH_CACHE_DB, _SCHEMA)
+
+def get_search_query(params: Dict[str, str]) -> str:
+    """Get the canonical query string of search parameters, used as cache key"""
+    return urlencode(sorted((key, value) for key, value in params.items() if value))
+
+def search_database(params: Dict[str, str], token: str = None, priority: int = PRIORITY_BACKGROUND) -> Optional[List[Dict]]:
+    """
+    Search Discogs releases, from the cache when possible
+
+    Database search needs a Discogs token.
+
+    Args:
+        params: Search parameters, e.g. {'catno': 'WARP123', 'label': 'Warp'};
+            type=release is added
+        token: Discogs token
+        priority: PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND
+
+    Returns:
+        Optional[List[Dict]]: First page of results, or None if the search failed
+    """
+    query = get_search_query({'type': 'release', **params})
+    row = _get_connection().execute(
+        'SELECT results, fetched_at FROM searches WHERE query = ?',
+        (query,)
+    ).fetchone()
+    if row and time.time() - row[1] < SEARCH_CACHE_TTL:
+        return json.loads(row[0])
+
+    try:
+        response = discogs_get(
+            f"{DISCOGS_API_URL}/database/search?{query}",
+            headers=get_auth_headers(token),
+            priority=priority
+        )
+        response.raise_for_status()
+        results = response.json().get('results', [])
+    except (requests.exceptions.RequestException, ValueError):
+        return None
+
+    _get_connection().execute(
+        'INSERT OR REPLACE INTO searches (query, results, fetched_at) VALUES (?, ?, ?)',
+        (query, json.dumps(results), time.time())
+    )
+    return results
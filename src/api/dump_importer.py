@@ -0,0 +1,329 @@
+"""
+Discogs XML data dump importer
+
+Usage:
+    python -m src.api.dump_importer discogs_20250101_artists.xml.gz discogs_20250101_releases.xml.gz
+
+Releases, artists and labels dumps from https://discogs-data-dumps.s3.us-west-2.amazonaws.com
+are stream-parsed, converted to the API JSON shape by a pool of worker
+processes and written to the local dump store in batches.
+"""
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional
+from .discogs import DISCOGS_API_URL
+from .dump_store import get_dump_connection, create_indexes, index_dump_releases
+from .release_index import normalize_catno
+from .release_cache import compress_payload
+
+# Records per worker task and per insert transaction
+BATCH_SIZE = 500
+
+RECORD_TAGS = {
+    'releases': 'release',
+    'artists': 'artist',
+    'labels': 'label'
+}
+
+def _text(elem: Optional[ET.Element], path: str) -> str:
+    """Get the stripped text of a child element, or an empty string"""
+    child = elem.find(path) if elem is not None else None
+    return (child.text or '').strip() if child is not None else ''
+
+def _convert_artist_credit(elem: ET.Element) -> Dict:
+    """Convert an <artist> credit of a release or track to the API shape"""
+    artist_id = _text(elem, 'id')
+    credit = {
+        'id': int(artist_id) if artist_id.isdigit() else None,
+        'name': _text(elem, 'name'),
+        'anv': _text(elem, 'anv'),
+        'join': _text(elem, 'join'),
+        'role': _text(elem, 'role'),
+        'tracks': _text(elem, 'tracks'),
+        'resource_url': f'{DISCOGS_API_URL}/artists/{artist_id}' if artist_id else ''
+    }
+    return credit
+
+def _convert_credits(elem: ET.Element, path: str) -> List[Dict]:
+    """Convert a list of artist credits"""
+    return [_convert_artist_credit(artist) for artist in elem.findall(f'{path}/artist')]
+
+def get_artists_sort(artists: List[Dict]) -> str:
+    """
+    Build the artists_sort field the API returns from the artist credits
+
+    Args:
+        artists: Release artist credits
+
+    Returns:
+        str: Artist names joined with their join strings, e.g. 'Artist A & Artist B'
+    """
+    parts = []
+    for artist in artists:
+        parts.append(artist['name'])
+        join = artist.get('join', '')
+        if join == ',':
+            parts.append(', ')
+        elif join:
+            parts.append(f' {join} ')
+    return ''.join(parts).strip().rstrip(',')
+
+def convert_release(xml: bytes) -> tuple:
+    """
+    Convert a <release> element to an insert row
+
+    Args:
+        xml: Serialized <release> element
+
+    Returns:
+        tuple: (release_id, compressed API JSON, title, artist, label, catno, catno_norm, barcode)
+    """
+    elem = ET.fromstring(xml)
+    release_id = int(elem.get('id'))
+    artists = _convert_credits(elem, 'artists')
+
+    labels = [{
+        'id': int(label.get('id')) if (label.get('id') or '').isdigit() else None,
+        'name': label.get('name', ''),
+        'catno': label.get('catno', ''),
+        'resource_url': f"{DISCOGS_API_URL}/labels/{label.get('id')}" if label.get('id') else ''
+    } for label in elem.findall('labels/label')]
+
+    formats = [{
+        'name': fmt.get('name', ''),
+        'qty': fmt.get('qty', ''),
+        'text': fmt.get('text', ''),
+        'descriptions': [(desc.text or '').strip() for desc in fmt.findall('descriptions/description')]
+    } for fmt in elem.findall('formats/format')]
+
+    tracklist = []
+    for track in elem.findall('tracklist/track'):
+        track_data = {
+            'position': _text(track, 'position'),
+            'type_': 'track',
+            'title': _text(track, 'title'),
+            'duration': _text(track, 'duration')
+        }
+        if track.find('artists') is not None:
+            track_data['artists'] = _convert_credits(track, 'artists')
+        if track.find('extraartists') is not None:
+            track_data['extraartists'] = _convert_credits(track, 'extraartists')
+        tracklist.append(track_data)
+
+    # Image URLs are stripped from public dumps, keep only usable entries
+    images = [
+        {key: (int(value) if key in ('width', 'height') and value.isdigit() else value)
+         for key, value in image.attrib.items()}
+        for image in elem.findall('images/image') if image.get('uri')
+    ]
+
+    identifiers = [{
+        'type': identifier.get('type', ''),
+        'value': identifier.get('value', ''),
+        'description': identifier.get('description', '')
+    } for identifier in elem.findall('identifiers/identifier')]
+
+    master_id = _text(elem, 'master_id')
+    data = {
+        'id': release_id,
+        'status': elem.get('status', ''),
+        'title': _text(elem, 'title'),
+        'artists': artists,
+        'artists_sort': get_artists_sort(artists),
+        'labels': labels,
+        'extraartists': _convert_credits(elem, 'extraartists'),
+        'formats': formats,
+        'genres': [(genre.text or '').strip() for genre in elem.findall('genres/genre')],
+        'styles': [(style.text or '').strip() for style in elem.findall('styles/style')],
+        'country': _text(elem, 'country'),
+        'released': _text(elem, 'released'),
+        'notes': _text(elem, 'notes'),
+        'data_quality': _text(elem, 'data_quality'),
+        'master_id': int(master_id) if master_id.isdigit() else None,
+        'tracklist': tracklist,
+        'images': images,
+        'identifiers': identifiers,
+        'uri': f'https://www.discogs.com/release/{release_id}',
+        'resource_url': f'{DISCOGS_API_URL}/releases/{release_id}'
+    }
+
+    catno = labels[0]['catno'] if labels else ''
+    barcode = next((identifier['value'] for identifier in identifiers if identifier['type'] == 'Barcode'), '')
+    return (
+        release_id,
+        compress_payload(data),
+        data['title'],
+        data['artists_sort'],
+        labels[0]['name'] if labels else '',
+        catno,
+        normalize_catno(catno),
+        ''.join(ch for ch in barcode if ch.isdigit())
+    )
+
+def convert_artist(xml: bytes) -> tuple:
+    """
+    Convert an <artist> element to an insert row
+
+    Returns:
+        tuple: (artist_id, name, realname, members JSON)
+    """
+    elem = ET.fromstring(xml)
+    # Members are <name id="..."> elements, older dumps list them as <id>/<name> pairs
+    members = [(member.text or '').strip() for member in elem.findall('members/name')]
+    return (
+        int(_text(elem, 'id')),
+        _text(elem, 'name'),
+        _text(elem, 'realname'),
+        json.dumps([name for name in members if name])
+    )
+
+def convert_label(xml: bytes) -> tuple:
+    """
+    Convert a <label> element to an insert row
+
+    Returns:
+        tuple: (label_id, name, profile)
+    """
+    elem = ET.fromstring(xml)
+    return int(_text(elem, 'id')), _text(elem, 'name'), _text(elem, 'profile')
+
+def convert_batch(kind: str, records: List[bytes]) -> List[tuple]:
+    """Convert a batch of serialized records in a worker process"""
+    convert = {'releases': convert_release, 'artists': convert_artist, 'labels': convert_label}[kind]
+    rows = []
+    for xml in records:
+        try:
+            rows.append(convert(xml))
+        except (ET.ParseError, ValueError, TypeError):
+            continue
+    return rows
+
+INSERT_SQL = {
+    'releases': 'INSERT OR REPLACE INTO releases VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+    'artists': 'INSERT OR REPLACE INTO artists VALUES (?, ?, ?, ?)',
+    'labels': 'INSERT OR REPLACE INTO labels VALUES (?, ?, ?)'
+}
+
+def detect_dump_kind(path: str) -> str:
+    """
+    Detect the dump type from its file name
+
+    Args:
+        path: Dump file path, e.g. 'discogs_20250101_releases.xml.gz'
+
+    Returns:
+        str: 'releases', 'artists' or 'labels'
+    """
+    name = os.path.basename(path).lower()
+    for kind in RECORD_TAGS:
+        if kind in name:
+            return kind
+    raise ValueError(f'Cannot tell the dump type of {path}, expected releases, artists or labels in the name')
+
+def iter_records(path: str, kind: str) -> Iterator[bytes]:
+    """
+    Stream the top-level records of a dump with bounded memory
+
+    Args:
+        path: Dump file path (.xml or .xml.gz)
+        kind: 'releases', 'artists' or 'labels'
+
+    Yields:
+        bytes: Serialized record element
+    """
+    tag = RECORD_TAGS[kind]
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rb') as f:
+        depth = 0
+        root = None
+        for event, elem in ET.iterparse(f, events=('start', 'end')):
+            if event == 'start':
+                if root is None:
+                    root = elem
+                depth += 1
+                continue
+            depth -= 1
+            # Records are direct children of the root; nested <artist>/<label> are credits
+            if depth == 1 and elem.tag == tag:
+                yield ET.tostring(elem)
+                root.clear()
+
+def import_dump(path: str, workers: int = None, progress=None) -> int:
+    """
+    Import one dump file into the local dump store
+
+    Args:
+        path: Dump file path (.xml or .xml.gz)
+        workers: Worker processes, defaults to the CPU count
+        progress: Optional callback receiving the number of imported records
+
+    Returns:
+        int: Number of imported records
+    """
+    kind = detect_dump_kind(path)
+    workers = workers or os.cpu_count() or 1
+    conn = get_dump_connection(create=True)
+    imported = 0
+
+    def write(rows: List[tuple]) -> None:
+        nonlocal imported
+        conn.execute('BEGIN')
+        conn.executemany(INSERT_SQL[kind], rows)
+        conn.execute('COMMIT')
+        imported += len(rows)
+        if progress:
+            progress(imported)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        batch = []
+        for record in iter_records(path, kind):
+            batch.append(record)
+            if len(batch) >= BATCH_SIZE:
+                pending.append(executor.submit(convert_batch, kind, batch))
+                batch = []
+                # Keep only a few batches in flight so memory stays bounded
+                while len(pending) >= workers * 2:
+                    write(pending.popleft().result())
+        if batch:
+            pending.append(executor.submit(convert_batch, kind, batch))
+        while pending:
+            write(pending.popleft().result())
+
+    return imported
+
+def main(argv: List[str] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Import Discogs XML data dumps into the local dump store')
+    parser.add_argument('paths', nargs='+', help='Dump files (.xml or .xml.gz), e.g. discogs_20250101_releases.xml.gz')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    args = parser.parse_args(argv)
+
+    # Artists and labels first, so they are available as soon as releases start resolving
+    order = {'artists': 0, 'labels': 1, 'releases': 2}
+    for path in sorted(args.paths, key=lambda p: order[detect_dump_kind(p)]):
+        started = time.time()
+        print(f'Importing {path}...')
+        count = import_dump(
+            path,
+            args.workers,
+            lambda n: print(f'\r  {n} records', end='', flush=True)
+        )
+        print(f'\r  {count} records in {time.time() - started:.0f}s')
+
+    print('Creating indexes...')
+    create_indexes()
+    if any(detect_dump_kind(path) == 'releases' for path in args.paths):
+        print('Updating release search index...')
+        index_dump_releases()
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
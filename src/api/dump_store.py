@@ -0,0 +1,121 @@
+"""
+Local store of imported Discogs data dumps
+"""
+import json
+import os
+from typing import Dict, Optional
+from .release_cache import decompress_payload
+from .release_index import index_rows, format_catnos
+from ..utils.sqlite_store import connect, get_cache_dir
+
+# Database file, relative to the cache directory unless an absolute path is given
+DUMP_DB = os.getenv('DISCOGS_DUMP_DB', 'discogs_dump.sqlite3')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS releases (
+    release_id INTEGER PRIMARY KEY,
+    payload BLOB NOT NULL,
+    title TEXT NOT NULL DEFAULT '',
+    artist TEXT NOT NULL DEFAULT '',
+    label TEXT NOT NULL DEFAULT '',
+    catno TEXT NOT NULL DEFAULT '',
+    catno_norm TEXT NOT NULL DEFAULT '',
+    barcode TEXT NOT NULL DEFAULT ''
+);
+CREATE TABLE IF NOT EXISTS artists (
+    artist_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL DEFAULT '',
+    realname TEXT NOT NULL DEFAULT '',
+    members TEXT NOT NULL DEFAULT '[]'
+);
+CREATE TABLE IF NOT EXISTS labels (
+    label_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL DEFAULT '',
+    profile TEXT NOT NULL DEFAULT ''
+);
+"""
+
+# Secondary indexes are created after an import, bulk inserts are faster without them
+_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_releases_catno_norm ON releases(catno_norm);
+CREATE INDEX IF NOT EXISTS idx_releases_barcode ON releases(barcode);
+CREATE INDEX IF NOT EXISTS idx_labels_name ON labels(name COLLATE NOCASE);
+"""
+
+def get_dump_db_path() -> str:
+    """Get the absolute path of the dump database"""
+    return os.path.join(get_cache_dir(), DUMP_DB)
+
+def is_dump_enabled() -> bool:
+    """
+    Check if lookups should use the local dump
+
+    The dump is used once it has been imported, unless DISCOGS_USE_DUMP=0.
+    """
+    return os.getenv('DISCOGS_USE_DUMP', '1') != '0' and os.path.exists(get_dump_db_path())
+
+def get_dump_connection(create: bool = False):
+    """
+    Get a connection to the dump database
+
+    Args:
+        create: Create the schema if it doesn't exist yet
+    """
+    return connect(get_dump_db_path(), _SCHEMA if create else None)
+
+def create_indexes() -> None:
+    """Create the secondary lookup indexes"""
+    get_dump_connection(create=True).executescript(_INDEXES)
+
+def get_dump_release(release_id: str) -> Optional[Dict]:
+    """
+    Get a release from the local dump
+
+    Args:
+        release_id: Discogs release ID
+
+    Returns:
+        Optional[Dict]: Release in the same JSON shape as the API response, or None
+    """
+    if not is_dump_enabled():
+        return None
+    row = get_dump_connection().execute(
+        'SELECT payload FROM releases WHERE release_id = ?',
+        (int(release_id),)
+    ).fetchone()
+    return decompress_payload(row[0]) if row else None
+
+def get_dump_artist(artist_id: str) -> Optional[tuple[str, list[str]]]:
+    """
+    Get an artist's real name and members from the local dump
+
+    Args:
+        artist_id: Discogs artist ID
+
+    Returns:
+        Optional[tuple[str, list[str]]]: (realname, member names), or None
+    """
+    if not is_dump_enabled() or not str(artist_id).isdigit():
+        return None
+    row = get_dump_connection().execute(
+        'SELECT realname, members FROM artists WHERE artist_id = ?',
+        (int(artist_id),)
+    ).fetchone()
+    if not row:
+        return None
+    return row[0], json.loads(row[1])
+
+def index_dump_releases() -> int:
+    """
+    Add every imported release to the release search index
+
+    Returns:
+        int: Number of indexed releases
+    """
+    cursor = get_dump_connection().execute(
+        'SELECT release_id, artist, title, label, catno, barcode FROM releases'
+    )
+    return index_rows(
+        (release_id, artist, title, label, format_catnos([catno]), barcode)
+        for release_id, artist, title, label, catno, barcode in cursor
+    )
@@ -0,0 +1,90 @@
+"""
+Registry of exported info files
+"""
+import json
+import time
+from typing import Dict, Iterator
+from ..utils.sqlite_store import connect
+
+EXPORT_REGISTRY_DB = 'discogs.sqlite3'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS exports (
+    release_id INTEGER PRIMARY KEY,
+    folder_name TEXT NOT NULL,
+    info_path TEXT NOT NULL,
+    fields TEXT NOT NULL,
+    content TEXT NOT NULL,
+    exported_at REAL NOT NULL,
+    checked_at REAL NOT NULL DEFAULT 0
+);
+"""
+
+def _get_connection():
+    """Get a database connection, creating the schema on first use"""
+    return connect(EXPORT_REGISTRY_DB, _SCHEMA)
+
+def record_export(release_id: str, folder_name: str, info_path: str, fields: Dict, content: str) -> None:
+    """
+    Remember an exported info file
+
+    Args:
+        release_id: Discogs release ID
+        folder_name: Album folder name
+        info_path: Absolute path of the written info file
+        fields: Release fields the info file was rendered from, as returned
+            by get_release_info, so later changes can be detected
+        content: Content written to the info file
+    """
+    now = time.time()
+    _get_connection().execute(
+        'INSERT OR REPLACE INTO exports '
+        '(release_id, folder_name, info_path, fields, content, exported_at, checked_at) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?)',
+        (int(release_id), folder_name, info_path, json.dumps(fields, ensure_ascii=False), content, now, now)
+    )
+
+def iter_exports() -> Iterator[Dict]:
+    """
+    Iterate over exported releases, least recently checked first
+
+    Yields:
+        Dict: 'release_id', 'folder_name', 'info_path', 'fields', 'content',
+        'exported_at' and 'checked_at'
+    """
+    rows = _get_connection().execute(
+        'SELECT release_id, folder_name, info_path, fields, content, exported_at, checked_at '
+        'FROM exports ORDER BY checked_at'
+    ).fetchall()
+    for release_id, folder_name, info_path, fields, content, exported_at, checked_at in rows:
+        yield {
+            'release_id': str(release_id),
+            'folder_name': folder_name,
+            'info_path': info_path,
+            'fields': json.loads(fields),
+            'content': content,
+            'exported_at': exported_at,
+            'checked_at': checked_at
+        }
+
+def mark_checked(release_id: str) -> None:
+    """Remember that an exported release was just checked for changes"""
+    _get_connection().execute(
+        'UPDATE exports SET checked_at = ? WHERE release_id = ?',
+        (time.time(), int(release_id))
+    )
+
+def update_export(release_id: str, fields: Dict, content: str) -> None:
+    """
+    Remember a refreshed info file
+
+    Args:
+        release_id: Discogs release ID
+        fields: Release fields the new info file was rendered from
+        content: New info file content
+    """
+    now = time.time()
+    _get_connection().execute(
+        'UPDATE exports SET fields = ?, content = ?, exported_at = ?, checked_at = ? WHERE release_id = ?',
+        (json.dumps(fields, ensure_ascii=False), content, now, now, int(release_id))
+    )
@@ -0,0 +1,136 @@
+"""
+Background fetch pipeline for the follow-up requests of a release
+"""
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List
+from .artist_resolver import get_cached_artist
+from .image_analysis import analyze_release_images
+from .images import get_image_size
+from .rate_limiter import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE
+from .release_model import compact_release
+from ..transformations.info.artist_details import collect_artist_resources, resolve_artist_details
+
+# Worker threads shared by every session; the rate limiter still caps API calls
+MAX_PIPELINE_WORKERS = 16
+
+# Releases whose jobs are kept around for reruns and other sessions
+MAX_TRACKED_RELEASES = 64
+
+@dataclass
+class ReleaseJobs:
+    """
+    Follow-up requests of a release, running in the background
+
+    Attributes:
+        artist_details: Resolves to (realname, members) by artist resource URL
+        image_sizes: One future per release image, resolving to (width, height) or None
+        image_analysis: Resolves to the ImageAnalysis of the release images
+        priority: Rate limiter priority the jobs were started with
+        fingerprint: Content fingerprint of the release the jobs were started for
+    """
+    artist_details: Future
+    image_sizes: List[Future]
+    image_analysis: Future
+    priority: int = PRIORITY_INTERACTIVE
+    fingerprint: str = ''
+
+    def get_futures(self) -> List[Future]:
+        """Get every future of the jobs"""
+        return [self.artist_details, self.image_analysis, *self.image_sizes]
+
+    def is_done(self) -> bool:
+        """Check if every job has finished"""
+        return all(future.done() for future in self.get_futures())
+
+    def has_failed(self) -> bool:
+        """
+        Check if a finished job raised or resolved to results that have expired
+
+        Artist lookups that failed are negative-cached for ARTIST_FAILURE_TTL;
+        once an artist's cache entry is gone, its result here is stale too.
+        """
+        if any(future.done() and future.exception() for future in self.get_futures()):
+            return True
+        if self.artist_details.done():
+            return any(get_cached_artist(url) is None for url in self.artist_details.result())
+        return False
+
+_executor = ThreadPoolExecutor(max_workers=MAX_PIPELINE_WORKERS, thread_name_prefix='release-fetch')
+_jobs: OrderedDict[str, ReleaseJobs] = OrderedDict()
+_jobs_lock = threading.Lock()
+
+def get_image_size_future(image: Dict) -> Future:
+    """
+    Get a future for the dimensions of a release image
+
+    Sizes the API lists resolve immediately, only images without them are probed.
+
+    Args:
+        image: Image object of the release
+
+    Returns:
+        Future: Resolves to (width, height) or None
+    """
+    if image.get('width') and image.get('height'):
+        future = Future()
+        future.set_result((image['width'], image['height']))
+        return future
+    return _executor.submit(get_image_size, image)
+
+def start_release_jobs(data: Dict, priority: int = PRIORITY_INTERACTIVE) -> ReleaseJobs:
+    """
+    Start the artist resolutions, image size lookups and image analysis of a release in parallel
+
+    Args:
+        data: Release JSON from the API
+        priority: Rate limiter priority of the artist lookups; background jobs
+            also download thumbnails on the background pool
+
+    Returns:
+        ReleaseJobs: Futures for the started jobs
+    """
+    jobs = ReleaseJobs(
+        artist_details=_executor.submit(resolve_artist_details, collect_artist_resources(data), priority),
+        image_sizes=[get_image_size_future(image) for image in data.get('images', [])],
+        image_analysis=_executor.submit(analyze_release_images, data.get('images', []), priority),
+        priority=priority,
+        fingerprint=compact_release(data)['fingerprint']
+    )
+    with _jobs_lock:
+        _jobs[str(data.get('id'))] = jobs
+        _jobs.move_to_end(str(data.get('id')))
+        while len(_jobs) > MAX_TRACKED_RELEASES:
+            _jobs.popitem(last=False)
+    return jobs
+
+def get_release_jobs(data: Dict, priority: int = PRIORITY_INTERACTIVE, restart: bool = False) -> ReleaseJobs:
+    """
+    Get the background jobs of a release, starting them if needed
+
+    Jobs started earlier, e.g. by the prefetch queue, are reused unless they
+    failed, were started for different release data, or are still running at
+    background priority while an interactive caller waits for them.
+
+    Args:
+        data: Release JSON from the API
+        priority: Rate limiter priority of the artist lookups, if they are started
+        restart: Start the jobs again even if they can be reused, e.g. when
+            the user fetches the release explicitly
+
+    Returns:
+        ReleaseJobs: Futures for the release's jobs
+    """
+    with _jobs_lock:
+        jobs = _jobs.get(str(data.get('id')))
+    if (
+        restart
+        or jobs is None
+        or jobs.fingerprint != compact_release(data)['fingerprint']
+        or jobs.has_failed()
+        or (priority == PRIORITY_INTERACTIVE and jobs.priority == PRIORITY_BACKGROUND and not jobs.is_done())
+    ):
+        jobs = start_release_jobs(data, priority)
+    return jobs
@@ -0,0 +1,82 @@
+"""
+Shared HTTP client for all outbound requests
+"""
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from .telemetry import record_error, record_response
+
+USER_AGENT = "AlbumCategorizer/1.0"
+
+# (connect, read) timeout in seconds used when the caller doesn't pass one
+DEFAULT_TIMEOUT = (5, 30)
+
+# Number of hosts to keep connection pools for (api.discogs.com, i.discogs.com, ...)
+POOL_CONNECTIONS = 10
+
+# Maximum open connections per host; further requests wait for a free connection
+MAX_CONNECTIONS_PER_HOST = 8
+
+_session = None
+_session_lock = threading.Lock()
+
+def create_session() -> requests.Session:
+    """
+    Create a session with keep-alive connection pools and default headers
+
+    Returns:
+        requests.Session: Configured session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=MAX_CONNECTIONS_PER_HOST,
+        pool_block=True
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({
+        'User-Agent': USER_AGENT,
+        'Accept-Encoding': 'gzip, deflate'
+    })
+    return session
+
+def get_session() -> requests.Session:
+    """
+    Get the process-wide session, shared by every Streamlit session and thread
+
+    Returns:
+        requests.Session: Shared session
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
+
+def http_get(url: str, headers: dict = None, timeout=DEFAULT_TIMEOUT, retries: int = 0, **kwargs) -> requests.Response:
+    """
+    Send a GET request through the shared session
+
+    Every request is recorded in the request telemetry.
+
+    Args:
+        url: Request URL
+        headers: Extra headers, merged over the session defaults
+        timeout: Request timeout, defaults to DEFAULT_TIMEOUT
+        retries: Retry number of this request, for the telemetry
+        **kwargs: Passed through to requests (e.g. stream, params)
+
+    Returns:
+        requests.Response: Response object
+    """
+    started = time.perf_counter()
+    try:
+        response = get_session().get(url, headers=headers, timeout=timeout, **kwargs)
+    except requests.exceptions.RequestException as e:
+        record_error(url, e, started, retries)
+        raise
+    record_response(url, response, started, retries, streamed=kwargs.get('stream', False))
+    return response
@@ -0,0 +1,192 @@
+"""
+Near-duplicate detection and front cover selection for release images
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from .images import fetch_image_path, get_image_size
+from .rate_limiter import PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE
+from ..utils.artwork import analyze_image_file, get_hash_distance
+
+# Threads hashing thumbnails, shared by every session; PIL releases the GIL
+# while decoding and resizing, and 150 px thumbnails are too small to be
+# worth shipping to worker processes
+MAX_HASH_WORKERS = min(4, os.cpu_count() or 1)
+
+# Thumbnail downloads and size probes shared by every session; prefetched
+# releases queue on a smaller pool, so they never hold up interactive loads
+MAX_THUMBNAIL_WORKERS = 8
+MAX_BACKGROUND_THUMBNAIL_WORKERS = 2
+
+# Images analyzed for interactive loads, the first gallery page; prefetched
+# releases are analyzed in full
+MAX_ANALYZED_IMAGES = 48
+
+# Hashes differing in at most this many of their 64 bits are near-duplicates
+DUPLICATE_DISTANCE = 6
+
+# Grayscale standard deviation below which an image is too plain to compare;
+# the hashes of blank sleeves and labels are alike whatever their color
+MIN_HASH_CONTRAST = 8
+
+@dataclass
+class ImageAnalysis:
+    """
+    Near-duplicates and the best front cover of a release's images
+
+    Attributes:
+        metrics: Per image 'dhash', 'width', 'height', 'bytes' and 'contrast'
+            (of the thumbnail), None if the image couldn't be read
+        groups: Indexes of near-duplicate images, best image first; images
+            without duplicates aren't listed
+        best_front: Index of the image to use as front cover, None without images
+    """
+    metrics: List[Optional[Dict]] = field(default_factory=list)
+    groups: List[List[int]] = field(default_factory=list)
+    best_front: Optional[int] = None
+
+    def get_duplicate_of(self) -> Dict[int, int]:
+        """Map every image that has a better near-duplicate to that image"""
+        return {idx: group[0] for group in self.groups for idx in group[1:]}
+
+_hash_executor = ThreadPoolExecutor(max_workers=MAX_HASH_WORKERS, thread_name_prefix='image-hash')
+_thumbnail_executors = {
+    PRIORITY_INTERACTIVE: ThreadPoolExecutor(max_workers=MAX_THUMBNAIL_WORKERS, thread_name_prefix='thumbnail'),
+    PRIORITY_BACKGROUND: ThreadPoolExecutor(
+        max_workers=MAX_BACKGROUND_THUMBNAIL_WORKERS,
+        thread_name_prefix='thumbnail-background'
+    )
+}
+
+def read_metrics(path: Optional[str]) -> Optional[Dict]:
+    """Hash and measure an image file, None if it can't be read"""
+    try:
+        return analyze_image_file(path) if path else None
+    except Exception:
+        return None
+
+def hash_image_files(paths: List[Optional[str]]) -> List[Optional[Dict]]:
+    """
+    Hash and measure image files on the shared hashing threads
+
+    Args:
+        paths: Image file paths, None for images that couldn't be downloaded
+
+    Returns:
+        List[Optional[Dict]]: Metrics per path, None for unreadable images
+    """
+    return list(_hash_executor.map(read_metrics, paths))
+
+def get_quality_score(size: Optional[tuple[int, int]], metrics: Optional[Dict]) -> tuple:
+    """
+    Rank an image as front cover candidate
+
+    Args:
+        size: (width, height) of the full image
+        metrics: Image metrics, see analyze_image_file
+
+    Returns:
+        tuple: Sort key, higher is better: the side of the largest square the
+        image holds, then how square it is, then thumbnail bytes per pixel (blank
+        or blurry scans compress better)
+    """
+    if not size:
+        return (0, 0.0, 0.0)
+    width, height = size
+    squareness = min(width, height) / max(width, height) if max(width, height) else 0.0
+    detail = metrics['bytes'] / (metrics['width'] * metrics['height']) if metrics else 0.0
+    return (min(width, height), round(squareness, 2), detail)
+
+def group_near_duplicates(metrics: List[Optional[Dict]]) -> List[List[int]]:
+    """
+    Group images whose hashes are close
+
+    Plain images are never grouped.
+
+    Args:
+        metrics: Per image metrics, None for unreadable images
+
+    Returns:
+        List[List[int]]: Groups of two or more image indexes, in image order
+    """
+    groups = []
+    for idx, item in enumerate(metrics):
+        if item is None or item['contrast'] < MIN_HASH_CONTRAST:
+            continue
+        for group in groups:
+            if get_hash_distance(metrics[group[0]]['dhash'], item['dhash']) <= DUPLICATE_DISTANCE:
+                group.append(idx)
+                break
+        else:
+            groups.append([idx])
+    return [group for group in groups if len(group) > 1]
+
+def pick_best_front(images: List[Dict], sizes: List[Optional[tuple[int, int]]],
+                    metrics: List[Optional[Dict]], groups: List[List[int]]) -> Optional[int]:
+    """
+    Pick the front cover
+
+    The best near-duplicate of the 'primary' image wins; releases without a
+    primary image use their best image overall.
+
+    Args:
+        images: Image objects of the release
+        sizes: (width, height) per image
+        metrics: Metrics per image
+        groups: Near-duplicate groups, best first
+
+    Returns:
+        Optional[int]: Image index, None without images
+    """
+    if not images:
+        return None
+    primary = next((idx for idx, image in enumerate(images) if image.get('type') == 'primary'), None)
+    if primary is None:
+        candidates = range(len(images))
+    else:
+        candidates = next((group for group in groups if primary in group), [primary])
+    return max(candidates, key=lambda idx: get_quality_score(sizes[idx], metrics[idx]))
+
+def fetch_thumbnail(image: Dict) -> Optional[str]:
+    """Download an image's thumbnail to the image cache, None if it fails"""
+    try:
+        return fetch_image_path(image.get('uri150') or image['uri'])
+    except Exception:
+        return None
+
+def analyze_release_images(images: List[Dict], priority: int = PRIORITY_INTERACTIVE) -> ImageAnalysis:
+    """
+    Find near-duplicate images and the best front cover of a release
+
+    Thumbnails are downloaded on the shared thumbnail pool of the priority and
+    hashed in parallel; resolution comes from the API (or a header probe).
+    Interactive loads only analyze the first MAX_ANALYZED_IMAGES images.
+
+    Args:
+        images: Image objects of the release
+        priority: PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND
+
+    Returns:
+        ImageAnalysis: Metrics, duplicate groups and the front cover; indexes
+        refer to the release's images
+    """
+    if priority == PRIORITY_INTERACTIVE:
+        images = images[:MAX_ANALYZED_IMAGES]
+    if not images:
+        return ImageAnalysis()
+    executor = _thumbnail_executors[priority]
+    path_futures = [executor.submit(fetch_thumbnail, image) for image in images]
+    size_futures = [executor.submit(get_image_size, image) for image in images]
+    paths = [future.result() for future in path_futures]
+    sizes = [future.result() for future in size_futures]
+
+    metrics = hash_image_files(paths)
+    groups = group_near_duplicates(metrics)
+    for group in groups:
+        group.sort(key=lambda idx: get_quality_score(sizes[idx], metrics[idx]), reverse=True)
+    return ImageAnalysis(
+        metrics=metrics,
+        groups=groups,
+        best_front=pick_best_front(images, sizes, metrics, groups)
+    )
@@ -0,0 +1,206 @@
+"""
+Content-addressed on-disk image cache
+"""
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Iterable, Optional
+from ..utils.sqlite_store import connect, get_cache_dir
+
+IMAGE_CACHE_DB = 'image_cache.sqlite3'
+
+# Byte budget of the image files, least recently used images are evicted beyond it
+IMAGE_CACHE_MB = float(os.getenv('IMAGE_CACHE_MB', 1024))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS images (
+    url TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    content_type TEXT,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS images_last_access ON images (last_access);
+CREATE INDEX IF NOT EXISTS images_sha256 ON images (sha256);
+"""
+
+# Evictions run one at a time, so two writers don't delete the same files
+_evict_lock = threading.Lock()
+
+def _get_connection():
+    """Get a database connection, creating the schema on first use"""
+    return connect(IMAGE_CACHE_DB, _SCHEMA)
+
+def get_image_dir() -> str:
+    """Get the directory the image files are stored in, creating it if needed"""
+    image_dir = os.path.join(get_cache_dir(), 'images')
+    os.makedirs(image_dir, exist_ok=True)
+    return image_dir
+
+def get_blob_path(sha256: str) -> str:
+    """Get the file path of an image by its content hash"""
+    return os.path.join(get_image_dir(), sha256[:2], sha256)
+
+def get_cached_image_path(url: str) -> Optional[str]:
+    """
+    Get the cached file of an image and mark it as recently used
+
+    Args:
+        url: Image URL
+
+    Returns:
+        Optional[str]: Path of the image file, or None if it isn't cached
+    """
+    conn = _get_connection()
+    row = conn.execute('SELECT sha256 FROM images WHERE url = ?', (url,)).fetchone()
+    if not row:
+        return None
+    path = get_blob_path(row[0])
+    if not os.path.exists(path):
+        # The file was removed behind the cache's back
+        conn.execute('DELETE FROM images WHERE url = ?', (url,))
+        return None
+    conn.execute('UPDATE images SET last_access = ? WHERE url = ?', (time.time(), url))
+    return path
+
+def get_cached_image(url: str) -> Optional[bytes]:
+    """
+    Get a cached image
+
+    Args:
+        url: Image URL
+
+    Returns:
+        Optional[bytes]: Image data, or None if it isn't cached
+    """
+    path = get_cached_image_path(url)
+    if path is None:
+        return None
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+def forget_image(url: str) -> None:
+    """Drop an image's index row, e.g. after its file disappeared"""
+    _get_connection().execute('DELETE FROM images WHERE url = ?', (url,))
+
+def store_image_stream(url: str, chunks: Iterable[bytes], content_type: str = None) -> str:
+    """
+    Store an image while it downloads
+
+    The chunks are hashed and written to a temporary file, which is then
+    renamed to its content hash, so readers never see partial files and equal
+    images under different URLs are stored once.
+
+    Args:
+        url: Image URL
+        chunks: Image data in chunks, e.g. response.iter_content()
+        content_type: Content-Type of the image
+
+    Returns:
+        str: Path of the image file
+    """
+    image_dir = get_image_dir()
+    digest = hashlib.sha256()
+    size = 0
+    fd, temp_path = tempfile.mkstemp(dir=image_dir, suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            for chunk in chunks:
+                digest.update(chunk)
+                size += len(chunk)
+                f.write(chunk)
+        sha256 = digest.hexdigest()
+        path = get_blob_path(sha256)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    _get_connection().execute(
+        'INSERT OR REPLACE INTO images (url, sha256, size, content_type, last_access) '
+        'VALUES (?, ?, ?, ?, ?)',
+        (url, sha256, size, content_type, time.time())
+    )
+    evict_images()
+    return path
+
+def store_image(url: str, data: bytes, content_type: str = None) -> str:
+    """
+    Store an image
+
+    Args:
+        url: Image URL
+        data: Image data
+        content_type: Content-Type of the image
+
+    Returns:
+        str: Path of the image file
+    """
+    return store_image_stream(url, [data], content_type)
+
+def get_cached_content_type(url: str) -> Optional[str]:
+    """Get the Content-Type a cached image was served with"""
+    row = _get_connection().execute('SELECT content_type FROM images WHERE url = ?', (url,)).fetchone()
+    return row[0] if row else None
+
+def get_total_bytes() -> int:
+    """Get the size of the stored image files, counting shared files once"""
+    row = _get_connection().execute(
+        'SELECT SUM(size) FROM (SELECT MAX(size) AS size FROM images GROUP BY sha256)'
+    ).fetchone()
+    return row[0] or 0
+
+def evict_images(max_bytes: int = None) -> int:
+    """
+    Remove least recently used images until the cache fits its budget
+
+    Args:
+        max_bytes: Byte budget, defaults to IMAGE_CACHE_MB
+
+    Returns:
+        int: Number of removed URLs
+    """
+    max_bytes = int(IMAGE_CACHE_MB * 1024 * 1024) if max_bytes is None else max_bytes
+    conn = _get_connection()
+    with _evict_lock:
+        total = get_total_bytes()
+        if total <= max_bytes:
+            return 0
+        evicted = 0
+        rows = conn.execute('SELECT url, sha256, size FROM images ORDER BY last_access').fetchall()
+        for url, sha256, size in rows:
+            if total <= max_bytes:
+                break
+            conn.execute('DELETE FROM images WHERE url = ?', (url,))
+            evicted += 1
+            # Files shared with other URLs stay until their last URL is evicted
+            if not conn.execute('SELECT 1 FROM images WHERE sha256 = ?', (sha256,)).fetchone():
+                try:
+                    os.remove(get_blob_path(sha256))
+                except FileNotFoundError:
+                    pass
+                total -= size
+        return evicted
+
+def get_image_cache_stats() -> Dict[str, float]:
+    """
+    Get the image cache size
+
+    Returns:
+        Dict[str, float]: 'images' (cached URLs), 'files', 'size_mb' and 'max_mb'
+    """
+    conn = _get_connection()
+    images, files = conn.execute('SELECT COUNT(*), COUNT(DISTINCT sha256) FROM images').fetchone()
+    return {
+        'images': images,
+        'files': files,
+        'size_mb': round(get_total_bytes() / 1024 / 1024, 2),
+        'max_mb': IMAGE_CACHE_MB
+    }
@@ -0,0 +1,234 @@
+"""
+Image downloads
+"""
+import threading
+import time
+from typing import BinaryIO, Dict, Optional
+from PIL import ImageFile
+from .http_client import http_get
+from .image_cache import forget_image, get_cached_image_path, store_image_stream
+from .telemetry import record_cache_lookup
+from ..utils.artwork import ARTWORK_MAX_SIZE, ARTWORK_QUALITY, prepare_artwork
+from ..utils.memory_cache import get_memory_cache
+
+# Bytes requested to read an image header; JPEG headers can follow large EXIF blocks
+IMAGE_PROBE_BYTES = 64 * 1024
+
+# Chunk size when reading a probe response
+PROBE_CHUNK_SIZE = 4096
+
+# Chunk size when streaming a download to the image cache
+IMAGE_CHUNK_SIZE = 64 * 1024
+
+_download_locks: Dict[str, threading.Lock] = {}
+_download_locks_lock = threading.Lock()
+
+def _get_download_lock(image_url: str) -> threading.Lock:
+    """Get the lock that makes concurrent requests for an image wait for one download"""
+    with _download_locks_lock:
+        lock = _download_locks.get(image_url)
+        if lock is None:
+            lock = _download_locks[image_url] = threading.Lock()
+        return lock
+
+def fetch_image_path(image_url: str, headers: dict = None) -> str:
+    """
+    Get an image as a file of the on-disk image cache, downloading it if needed
+
+    The download is streamed to the cache; concurrent calls for the same
+    image wait for the first download instead of starting their own.
+
+    Args:
+        image_url: Image URL
+        headers: Extra request headers
+
+    Returns:
+        str: Path of the cached image file
+
+    Raises:
+        requests.exceptions.RequestException: If the download fails
+    """
+    started = time.perf_counter()
+    path = get_cached_image_path(image_url)
+    if path is not None:
+        record_cache_lookup(image_url, 'hit', started)
+        return path
+
+    lock = _get_download_lock(image_url)
+    try:
+        with lock:
+            path = get_cached_image_path(image_url)
+            if path is not None:
+                record_cache_lookup(image_url, 'hit', started)
+                return path
+            response = http_get(image_url, headers=headers, stream=True)
+            with response:
+                response.raise_for_status()
+                return store_image_stream(
+                    image_url,
+                    response.iter_content(IMAGE_CHUNK_SIZE),
+                    response.headers.get('Content-Type')
+                )
+    finally:
+        # Later calls find the image in the cache and don't need the lock
+        with _download_locks_lock:
+            if _download_locks.get(image_url) is lock:
+                del _download_locks[image_url]
+
+def open_image(image_url: str, headers: dict = None) -> BinaryIO:
+    """
+    Open an image file of the on-disk image cache, downloading it if needed
+
+    Eviction can remove a file between the lookup and the open; the image
+    is then downloaded again once. Open files stay readable when evicted.
+
+    Args:
+        image_url: Image URL
+        headers: Extra request headers
+
+    Returns:
+        BinaryIO: Image file opened for binary reading
+
+    Raises:
+        requests.exceptions.RequestException: If the download fails
+    """
+    try:
+        return open(fetch_image_path(image_url, headers), 'rb')
+    except FileNotFoundError:
+        forget_image(image_url)
+        return open(fetch_image_path(image_url, headers), 'rb')
+
+def fetch_image(image_url: str, headers: dict = None) -> bytes:
+    """
+    Get an image from the shared memory cache, the on-disk cache or Discogs
+
+    Args:
+        image_url: Image URL
+        headers: Extra request headers
+
+    Returns:
+        bytes: Image data
+
+    Raises:
+        requests.exceptions.RequestException: If the download fails
+    """
+    started = time.perf_counter()
+    cache = get_memory_cache('images')
+    data = cache.get(image_url)
+    if data is not None:
+        record_cache_lookup(image_url, 'hit', started)
+        return data
+
+    with open_image(image_url, headers) as f:
+        data = f.read()
+    cache.put(image_url, data)
+    return data
+
+def parse_image_size(data: bytes) -> Optional[tuple[int, int]]:
+    """
+    Get the dimensions of an image from its first bytes
+
+    Args:
+        data: Start of the image file
+
+    Returns:
+        Optional[tuple[int, int]]: (width, height), or None if the header isn't complete
+    """
+    parser = ImageFile.Parser()
+    try:
+        parser.feed(data)
+    except Exception:
+        return None
+    return parser.image.size if parser.image else None
+
+def probe_image_size(image_url: str, headers: dict = None) -> Optional[tuple[int, int]]:
+    """
+    Get the dimensions of an image by downloading only its header
+
+    The image is requested with a Range header and read until the header is
+    parsed, so servers that ignore Range don't send the whole image either.
+    Images in the memory or on-disk cache are read from there.
+
+    Args:
+        image_url: Image URL
+        headers: Extra request headers
+
+    Returns:
+        Optional[tuple[int, int]]: (width, height), or None if the image can't be read
+    """
+    started = time.perf_counter()
+    data = get_memory_cache('images').get(image_url)
+    if data is not None:
+        record_cache_lookup(image_url, 'hit', started)
+        return parse_image_size(data)
+    path = get_cached_image_path(image_url)
+    if path is not None:
+        try:
+            with open(path, 'rb') as f:
+                data = f.read(IMAGE_PROBE_BYTES)
+            record_cache_lookup(image_url, 'hit', started)
+            return parse_image_size(data)
+        except FileNotFoundError:
+            # Evicted since the lookup, probe Discogs instead
+            forget_image(image_url)
+
+    parser = ImageFile.Parser()
+    read = 0
+    try:
+        response = http_get(
+            image_url,
+            headers={**(headers or {}), 'Range': f'bytes=0-{IMAGE_PROBE_BYTES - 1}'},
+            stream=True
+        )
+        with response:
+            response.raise_for_status()
+            for chunk in response.iter_content(PROBE_CHUNK_SIZE):
+                parser.feed(chunk)
+                read += len(chunk)
+                if parser.image or read >= IMAGE_PROBE_BYTES:
+                    break
+    except Exception:
+        return None
+    return parser.image.size if parser.image else None
+
+def get_image_size(image: Dict) -> Optional[tuple[int, int]]:
+    """
+    Get the dimensions of a Discogs image object
+
+    Args:
+        image: Image object of a release, with 'uri' and usually 'width' and 'height'
+
+    Returns:
+        Optional[tuple[int, int]]: (width, height) from the API, probed if missing
+    """
+    if image.get('width') and image.get('height'):
+        return image['width'], image['height']
+    return probe_image_size(image['uri'])
+
+def fetch_artwork(image_url: str, max_size: int = ARTWORK_MAX_SIZE, quality: int = ARTWORK_QUALITY,
+                  headers: dict = None) -> bytes:
+    """
+    Get an image prepared for embedding in audio files
+
+    Prepared artwork is kept in the shared memory cache per size and quality,
+    so saving an album downloads and resizes its artwork once.
+
+    Args:
+        image_url: Image URL
+        max_size: Longest side in pixels, 0 keeps the original size
+        quality: JPEG quality of re-encoded images
+        headers: Extra request headers
+
+    Returns:
+        bytes: JPEG data
+
+    Raises:
+        requests.exceptions.RequestException: If the download fails
+    """
+    cache = get_memory_cache('images')
+    key = f'{image_url}#artwork:{max_size}:{quality}'
+    data = cache.get(key)
+    if data is None:
+        data = prepare_artwork(fetch_image(image_url, headers), max_size, quality)
+        cache.put(key, data)
+    return data
@@ -0,0 +1,132 @@
+"""
+Background prefetch queue for upcoming releases
+"""
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List
+from .discogs import fetch_release
+from .fetch_pipeline import start_release_jobs
+from .rate_limiter import PRIORITY_BACKGROUND
+from .release_cache import RELEASE_CACHE_TTL
+
+STATUS_QUEUED = 'queued'
+STATUS_FETCHING = 'fetching'
+STATUS_READY = 'ready'
+STATUS_ERROR = 'error'
+
+# Finished releases whose status is kept; queued and fetching ones are always kept
+MAX_TRACKED_STATUSES = 1024
+
+_queue: 'queue.Queue[tuple[str, str]]' = queue.Queue()
+_status: OrderedDict[str, Dict] = OrderedDict()
+_status_lock = threading.Lock()
+_worker = None
+_worker_lock = threading.Lock()
+
+def parse_release_ids(text: str) -> List[str]:
+    """
+    Extract release IDs from pasted text
+
+    Args:
+        text: Discogs release URLs or bare release IDs, separated by whitespace or commas
+
+    Returns:
+        List[str]: Release IDs in the order they appear, without duplicates
+    """
+    release_ids = []
+    for item in re.split(r'[\s,]+', text or ''):
+        match = re.search(r'release/(\d+)', item) or re.fullmatch(r'\[?r?(\d+)\]?', item)
+        if match and match.group(1) not in release_ids:
+            release_ids.append(match.group(1))
+    return release_ids
+
+def _set_status(release_id: str, status: str, **details) -> None:
+    """Update the prefetch status of a release, forgetting the oldest finished releases"""
+    with _status_lock:
+        _status[release_id] = {'status': status, **details}
+        _status.move_to_end(release_id)
+        finished = [key for key, item in _status.items() if item['status'] in (STATUS_READY, STATUS_ERROR)]
+        for key in finished[:max(0, len(finished) - MAX_TRACKED_STATUSES)]:
+            del _status[key]
+
+def get_prefetch_status(release_id: str) -> Dict:
+    """
+    Get the prefetch status of a release
+
+    Returns:
+        Dict: 'status' plus 'title' and 'fetched_at' once fetched or 'error'
+        if it failed; the status is '' for releases that were never queued
+        or have been forgotten
+    """
+    with _status_lock:
+        return dict(_status.get(release_id, {'status': ''}))
+
+def is_prefetch_stale(status: Dict) -> bool:
+    """Check if a release's prefetch status was forgotten or is older than the release cache TTL"""
+    if not status['status']:
+        return True
+    return status['status'] == STATUS_READY and time.time() - status['fetched_at'] >= RELEASE_CACHE_TTL
+
+def prefetch_release(release_id: str, token: str = None) -> None:
+    """
+    Fetch a release, its artists and its image metadata at background priority
+
+    Args:
+        release_id: Discogs release ID
+        token: Discogs token, empty for unauthenticated requests
+    """
+    _set_status(release_id, STATUS_FETCHING)
+    # Prefetched releases are loaded into the app, which shows their images
+    data, _, error = fetch_release(release_id, token, priority=PRIORITY_BACKGROUND, need_images=True)
+    if error:
+        _set_status(release_id, STATUS_ERROR, error=error)
+        return
+
+    jobs = start_release_jobs(data, priority=PRIORITY_BACKGROUND)
+    jobs.artist_details.result()
+    for future in jobs.image_sizes:
+        future.result()
+    jobs.image_analysis.result()
+
+    title = f"{data.get('artists_sort', '')} - {data.get('title', '')}"
+    _set_status(release_id, STATUS_READY, title=title, fetched_at=time.time())
+
+def _run_worker() -> None:
+    """Process the queue one release at a time"""
+    while True:
+        release_id, token = _queue.get()
+        try:
+            prefetch_release(release_id, token)
+        except Exception as e:
+            _set_status(release_id, STATUS_ERROR, error=str(e))
+        finally:
+            _queue.task_done()
+
+def enqueue_releases(release_ids: List[str], token: str = None) -> None:
+    """
+    Queue releases for prefetching, starting the worker if needed
+
+    Releases that are already queued, or were prefetched within the release
+    cache TTL, are skipped.
+
+    Args:
+        release_ids: Discogs release IDs
+        token: Discogs token, empty for unauthenticated requests
+    """
+    global _worker
+    with _worker_lock:
+        if _worker is None or not _worker.is_alive():
+            _worker = threading.Thread(target=_run_worker, name='release-prefetch', daemon=True)
+            _worker.start()
+
+    for release_id in release_ids:
+        status = get_prefetch_status(release_id)
+        if status['status'] in (STATUS_QUEUED, STATUS_FETCHING):
+            continue
+        if status['status'] == STATUS_READY and not is_prefetch_stale(status):
+            continue
+        _set_status(release_id, STATUS_QUEUED)
+        _queue.put((release_id, token))
@@ -0,0 +1,186 @@
+"""
+Discogs API rate limiter shared between processes
+"""
+import os
+import time
+from typing import Mapping
+from ..utils.sqlite_store import connect
+
+RATE_LIMIT_DB = 'ratelimit.sqlite3'
+
+# Discogs allows 60 requests per minute with a token and 25 without,
+# start with the lower budget until the response headers tell us otherwise
+DEFAULT_CAPACITY = 25
+WINDOW_SECONDS = 60
+
+# Interactive requests may use the whole budget, background work leaves this
+# fraction of it untouched so fetches triggered from the UI never wait on it
+BACKGROUND_RESERVE = float(os.getenv('DISCOGS_BACKGROUND_RESERVE', 0.3))
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS rate_budget (
+    name TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    capacity REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    blocked_until REAL NOT NULL DEFAULT 0
+);
+"""
+
+def _get_connection():
+    """Get a database connection, creating the schema on first use"""
+    return connect(RATE_LIMIT_DB, _SCHEMA)
+
+def _load_bucket(conn, name: str, now: float) -> tuple[float, float, float]:
+    """
+    Load a bucket inside an open transaction and refill it up to now
+
+    Returns:
+        Tuple of (tokens, capacity, blocked_until)
+    """
+    row = conn.execute(
+        'SELECT tokens, capacity, updated_at, blocked_until FROM rate_budget WHERE name = ?',
+        (name,)
+    ).fetchone()
+    if not row:
+        return DEFAULT_CAPACITY, DEFAULT_CAPACITY, 0.0
+
+    tokens, capacity, updated_at, blocked_until = row
+    refill_rate = capacity / WINDOW_SECONDS
+    tokens = min(capacity, tokens + max(0.0, now - updated_at) * refill_rate)
+    return tokens, capacity, blocked_until
+
+def _save_bucket(conn, name: str, tokens: float, capacity: float, now: float, blocked_until: float) -> None:
+    """Write a bucket back inside an open transaction"""
+    conn.execute(
+        'INSERT OR REPLACE INTO rate_budget (name, tokens, capacity, updated_at, blocked_until) '
+        'VALUES (?, ?, ?, ?, ?)',
+        (name, tokens, capacity, now, blocked_until)
+    )
+
+def try_acquire(name: str = 'discogs', priority: int = PRIORITY_INTERACTIVE) -> float:
+    """
+    Try to take one request token from the shared budget
+
+    Args:
+        name: Budget name
+        priority: PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND
+
+    Returns:
+        float: 0 if a token was taken, otherwise seconds to wait before retrying
+    """
+    conn = _get_connection()
+    now = time.time()
+    # BEGIN IMMEDIATE takes the database write lock, which serializes
+    # concurrent acquires across threads and Streamlit server processes
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        tokens, capacity, blocked_until = _load_bucket(conn, name, now)
+        reserve = capacity * BACKGROUND_RESERVE if priority == PRIORITY_BACKGROUND else 0.0
+
+        if now < blocked_until:
+            wait = blocked_until - now
+        elif tokens - reserve >= 1:
+            tokens -= 1
+            wait = 0.0
+        else:
+            wait = (1 + reserve - tokens) * WINDOW_SECONDS / capacity
+
+        _save_bucket(conn, name, tokens, capacity, now, blocked_until)
+        conn.execute('COMMIT')
+    except Exception:
+        conn.execute('ROLLBACK')
+        raise
+    return wait
+
+def acquire(name: str = 'discogs', priority: int = PRIORITY_INTERACTIVE) -> None:
+    """
+    Block until a request token is available
+
+    Args:
+        name: Budget name
+        priority: PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND
+    """
+    while True:
+        wait = try_acquire(name, priority)
+        if not wait:
+            return
+        time.sleep(min(wait, 5.0))
+
+def calibrate(headers: Mapping[str, str], name: str = 'discogs') -> None:
+    """
+    Adjust the budget from Discogs rate limit response headers
+
+    Discogs reports the per-minute limit in X-Discogs-Ratelimit and the
+    requests left in the current window in X-Discogs-Ratelimit-Remaining.
+
+    Args:
+        headers: Response headers
+        name: Budget name
+    """
+    try:
+        limit = int(headers['X-Discogs-Ratelimit'])
+        remaining = int(headers['X-Discogs-Ratelimit-Remaining'])
+    except (KeyError, TypeError, ValueError):
+        return
+
+    conn = _get_connection()
+    now = time.time()
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        tokens, _, blocked_until = _load_bucket(conn, name, now)
+        # The server count is authoritative when it is lower than ours
+        tokens = min(tokens, float(remaining), float(limit))
+        _save_bucket(conn, name, tokens, float(limit), now, blocked_until)
+        conn.execute('COMMIT')
+    except Exception:
+        conn.execute('ROLLBACK')
+        raise
+
+def block_for(seconds: float, name: str = 'discogs') -> None:
+    """
+    Pause the budget for every process, e.g. after a 429 response
+
+    Args:
+        seconds: Pause length in seconds
+        name: Budget name
+    """
+    conn = _get_connection()
+    now = time.time()
+    conn.execute('BEGIN IMMEDIATE')
+    try:
+        _, capacity, blocked_until = _load_bucket(conn, name, now)
+        _save_bucket(conn, name, 0.0, capacity, now, max(blocked_until, now + seconds))
+        conn.execute('COMMIT')
+    except Exception:
+        conn.execute('ROLLBACK')
+        raise
+
+def get_budget(name: str = 'discogs') -> dict:
+    """
+    Get the current state of a budget
+
+    Returns:
+        dict: 'tokens', 'capacity' and 'blocked_until'
+    """
+    conn = _get_connection()
+    tokens, capacity, blocked_until = _load_bucket(conn, name, time.time())
+    return {'tokens': tokens, 'capacity': capacity, 'blocked_until': blocked_until}
+
+def has_spare_budget(name: str = 'discogs', priority: int = PRIORITY_BACKGROUND) -> bool:
+    """
+    Check if a request could be sent right now without waiting
+
+    Args:
+        name: Budget name
+        priority: PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND
+
+    Returns:
+        bool: True if a token is available above the priority's reserve
+    """
+    budget = get_budget(name)
+    reserve = budget['capacity'] * BACKGROUND_RESERVE if priority == PRIORITY_BACKGROUND else 0.0
+    return time.time() >= budget['blocked_until'] and budget['tokens'] - reserve >= 1
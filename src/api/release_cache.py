@@ -0,0 +1,170 @@
+"""
+Persistent Discogs release cache
+"""
+import json
+import os
+import time
+import zlib
+from typing import Dict, Iterator, Optional
+from ..utils.memory_cache import get_memory_cache
+from ..utils.sqlite_store import connect
+
+RELEASE_CACHE_DB = 'discogs.sqlite3'
+
+# Seconds a cached release is served without asking Discogs (default: 1 day)
+RELEASE_CACHE_TTL = int(os.getenv('RELEASE_CACHE_TTL', 24 * 60 * 60))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS releases (
+    release_id INTEGER PRIMARY KEY,
+    payload BLOB NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS cache_stats (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+def _get_connection():
+    """Get a database connection, creating the schema on first use"""
+    return connect(RELEASE_CACHE_DB, _SCHEMA)
+
+def compress_payload(data: dict) -> bytes:
+    """Serialize and compress a JSON payload for storage"""
+    return zlib.compress(json.dumps(data, separators=(',', ':')).encode('utf-8'), 6)
+
+def decompress_payload(payload: bytes) -> dict:
+    """Decompress and deserialize a stored JSON payload"""
+    return json.loads(zlib.decompress(payload).decode('utf-8'))
+
+def is_fresh(entry: Dict) -> bool:
+    """Check if a cache entry is still within the TTL"""
+    return time.time() - entry['fetched_at'] < RELEASE_CACHE_TTL
+
+def get_cached_release(release_id: str) -> Optional[Dict]:
+    """
+    Get a release from the cache
+
+    Recently used releases are served from the shared memory cache, the rest
+    from the database.
+
+    Args:
+        release_id: Discogs release ID
+
+    Returns:
+        Optional[Dict]: Dict with 'data', 'etag', 'last_modified' and
+        'fetched_at', or None if the release is not cached
+    """
+    memory = get_memory_cache('releases')
+    entry = memory.get(str(release_id))
+    if entry is not None:
+        return entry
+
+    row = _get_connection().execute(
+        'SELECT payload, etag, last_modified, fetched_at FROM releases WHERE release_id = ?',
+        (int(release_id),)
+    ).fetchone()
+    if not row:
+        return None
+
+    payload, etag, last_modified, fetched_at = row
+    entry = {
+        'data': decompress_payload(payload),
+        'etag': etag,
+        'last_modified': last_modified,
+        'fetched_at': fetched_at
+    }
+    memory.put(str(release_id), entry)
+    return entry
+
+def store_release(release_id: str, data: dict, etag: str = None, last_modified: str = None) -> None:
+    """
+    Store a release in the cache
+
+    Args:
+        release_id: Discogs release ID
+        data: Release JSON from the API
+        etag: ETag response header, used for revalidation
+        last_modified: Last-Modified response header, used for revalidation
+    """
+    fetched_at = time.time()
+    _get_connection().execute(
+        'INSERT OR REPLACE INTO releases (release_id, payload, etag, last_modified, fetched_at) '
+        'VALUES (?, ?, ?, ?, ?)',
+        (int(release_id), compress_payload(data), etag, last_modified, fetched_at)
+    )
+    get_memory_cache('releases').put(str(release_id), {
+        'data': data,
+        'etag': etag,
+        'last_modified': last_modified,
+        'fetched_at': fetched_at
+    })
+
+def touch_release(release_id: str) -> None:
+    """Mark a cached release as fresh again after a successful revalidation"""
+    fetched_at = time.time()
+    _get_connection().execute(
+        'UPDATE releases SET fetched_at = ? WHERE release_id = ?',
+        (fetched_at, int(release_id))
+    )
+    memory = get_memory_cache('releases')
+    entry = memory.get(str(release_id))
+    if entry is not None:
+        memory.put(str(release_id), {**entry, 'fetched_at': fetched_at})
+
+def iter_cached_releases() -> Iterator[Dict]:
+    """
+    Iterate over every cached release
+
+    Yields:
+        Dict: Release JSON from the API
+    """
+    for (payload,) in _get_connection().execute('SELECT payload FROM releases'):
+        yield decompress_payload(payload)
+
+def get_revalidation_headers(entry: Optional[Dict]) -> Dict[str, str]:
+    """
+    Build conditional request headers for a cached release
+
+    Args:
+        entry: Cache entry as returned by get_cached_release
+
+    Returns:
+        Dict[str, str]: If-None-Match / If-Modified-Since headers
+    """
+    headers = {}
+    if entry:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+    return headers
+
+def record_cache_event(name: str) -> None:
+    """
+    Increment a cache counter
+
+    Args:
+        name: Counter name ('hit', 'miss', 'revalidated', 'stale' or 'dump')
+    """
+    _get_connection().execute(
+        'INSERT INTO cache_stats (name, value) VALUES (?, 1) '
+        'ON CONFLICT(name) DO UPDATE SET value = value + 1',
+        (name,)
+    )
+
+def get_cache_stats() -> Dict[str, int]:
+    """
+    Get release cache counters and size
+
+    Returns:
+        Dict[str, int]: Counter values plus the number of cached releases
+    """
+    conn = _get_connection()
+    stats = {'hit': 0, 'miss': 0, 'revalidated': 0, 'stale': 0, 'dump': 0}
+    stats.update(dict(conn.execute('SELECT name, value FROM cache_stats').fetchall()))
+    stats['releases'] = conn.execute('SELECT COUNT(*) FROM releases').fetchone()[0]
+    return stats
@@ -0,0 +1,411 @@
+"""
+Batch identification of tagged album folders
+
+Usage:
+    python -m src.api.release_identifier FOLDER [FOLDER ...] [--online] [--limit 5] [--workers 8] [--json PATH]
+
+Reads the catalog number, barcode, label, album and artist tags of every
+audio file in parallel, together with the folder names, and looks the
+releases up in the local search index. With --online (and a Discogs token)
+Discogs database search is queried too, cached and within the background
+share of the rate budget. Prints the best scoring release candidates per
+folder. Folders without audio files directly inside are searched for
+album subfolders, so a whole backlog can be passed as one directory.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+from dotenv import load_dotenv
+from mutagen import File, MutagenError
+from .discogs_search import search_database
+from .rate_limiter import PRIORITY_BACKGROUND
+from .release_index import normalize_catno, search_releases
+
+AUDIO_EXTENSIONS = ('.mp3', '.flac', '.m4a', '.ogg', '.opus', '.wav', '.aif', '.aiff')
+
+# Parallel tag reads and folder lookups
+MAX_IDENTIFY_WORKERS = 8
+
+# Evidence fields and the tags they are read from, first tag found wins
+TAG_FIELDS = {
+    'catno': ['catalognumber'],
+    'barcode': ['barcode'],
+    'label': ['organization', 'label'],
+    'title': ['album'],
+    'artist': ['albumartist', 'artist']
+}
+
+# Candidate score per matching piece of evidence
+SCORE_BARCODE = 100
+SCORE_CATNO = 60
+SCORE_CATNO_NUMBER = 30
+SCORE_TITLE = 20
+SCORE_ARTIST = 15
+SCORE_LABEL = 10
+
+@dataclass
+class FolderEvidence:
+    """
+    What is known about the release of an album folder
+
+    Attributes:
+        path: Folder path
+        files: Number of audio files
+        catno, barcode, label, title, artist: Most common tag values
+        folder_label, folder_catno, folder_artist, folder_title: Parsed from
+            a 'Label Catalog# - Artist - Title' folder name
+    """
+    path: str
+    files: int = 0
+    catno: str = ''
+    barcode: str = ''
+    label: str = ''
+    title: str = ''
+    artist: str = ''
+    folder_label: str = ''
+    folder_catno: str = ''
+    folder_artist: str = ''
+    folder_title: str = ''
+    errors: List[str] = field(default_factory=list)
+
+def find_album_folders(paths: List[str]) -> List[str]:
+    """
+    Find the folders that directly contain audio files
+
+    Args:
+        paths: Album folders or directories of album folders
+
+    Returns:
+        List[str]: Album folders, sorted
+    """
+    folders = set()
+    for path in paths:
+        for root, _, files in os.walk(path):
+            if any(name.lower().endswith(AUDIO_EXTENSIONS) for name in files):
+                folders.add(root)
+    return sorted(folders)
+
+def list_audio_files(folder: str) -> List[str]:
+    """List the audio files directly inside a folder"""
+    return sorted(
+        os.path.join(folder, name) for name in os.listdir(folder)
+        if name.lower().endswith(AUDIO_EXTENSIONS)
+    )
+
+def read_file_tags(path: str) -> Dict[str, str]:
+    """
+    Read the identifying tags of an audio file
+
+    Args:
+        path: Audio file path
+
+    Returns:
+        Dict[str, str]: Evidence field to tag value, only for tags that are set
+    """
+    audio = File(path, easy=True)
+    if audio is None or audio.tags is None:
+        return {}
+    tags = {}
+    for name, keys in TAG_FIELDS.items():
+        for key in keys:
+            try:
+                values = audio.tags.get(key)
+            except (KeyError, ValueError):
+                values = None
+            if values and str(values[0]).strip():
+                tags[name] = str(values[0]).strip()
+                break
+    return tags
+
+def parse_folder_name(name: str) -> Dict[str, str]:
+    """
+    Parse a folder name in the app's 'Label Catalog# - Artist - Title' format
+
+    The catalog number of these names has its label prefix removed, so only
+    its number part is known.
+
+    Args:
+        name: Folder name, e.g. 'Warp 123 - Artist - Title'
+
+    Returns:
+        Dict[str, str]: 'folder_label', 'folder_catno', 'folder_artist' and
+        'folder_title', empty if the name has another format
+    """
+    parts = [part.strip() for part in name.split(' - ', 2)]
+    if len(parts) != 3:
+        return {}
+    label_catno, artist, title = parts
+    label, _, catno = label_catno.rpartition(' ')
+    if not re.search(r'\d', catno):
+        label, catno = label_catno, ''
+    return {
+        'folder_label': label,
+        'folder_catno': catno,
+        'folder_artist': artist,
+        'folder_title': title
+    }
+
+def collect_evidence(folder: str, file_tags: List[Dict[str, str]]) -> FolderEvidence:
+    """
+    Combine the tags of a folder's files and its name
+
+    Args:
+        folder: Folder path
+        file_tags: Tags of every audio file, as returned by read_file_tags
+
+    Returns:
+        FolderEvidence: The most common value of every field
+    """
+    evidence = FolderEvidence(path=folder, files=len(file_tags))
+    for name in TAG_FIELDS:
+        values = Counter(tags[name] for tags in file_tags if tags.get(name))
+        if values:
+            setattr(evidence, name, values.most_common(1)[0][0])
+    for name, value in parse_folder_name(os.path.basename(os.path.normpath(folder))).items():
+        setattr(evidence, name, value)
+    return evidence
+
+def normalize_text(text: str) -> str:
+    """Lower case words of a name or title, for comparisons"""
+    return ' '.join(re.findall(r'\w+', (text or '').lower()))
+
+def texts_match(a: str, b: str) -> bool:
+    """Check if two names are equal or one contains the other, ignoring case and punctuation"""
+    a, b = normalize_text(a), normalize_text(b)
+    return bool(a and b) and (a == b or a in b or b in a)
+
+def get_local_candidates(evidence: FolderEvidence) -> List[Dict]:
+    """
+    Look a folder's release up in the local search index
+
+    Returns:
+        List[Dict]: Candidates with 'release_id', 'artist', 'title', 'label',
+        'catno', 'barcodes' and 'source'
+    """
+    artist = evidence.artist or evidence.folder_artist
+    title = evidence.title or evidence.folder_title
+    queries = [
+        re.sub(r'\D', '', evidence.barcode),
+        evidence.catno,
+        f'{evidence.folder_label} {evidence.folder_catno}' if evidence.folder_catno else '',
+        f'{artist} {title}' if title else ''
+    ]
+    candidates = []
+    for query in queries:
+        if not query.strip():
+            continue
+        for row in search_releases(query, limit=10):
+            candidates.append({
+                'release_id': row['release_id'],
+                'artist': row['artist'],
+                'title': row['title'],
+                'label': row['label'],
+                'catno': row['catno'],
+                'barcodes': row['barcode'].split(),
+                'source': 'local'
+            })
+    return candidates
+
+def get_online_candidates(evidence: FolderEvidence, token: str) -> List[Dict]:
+    """
+    Look a folder's release up with Discogs database search
+
+    Returns:
+        List[Dict]: Candidates in the shape of get_local_candidates
+    """
+    artist = evidence.artist or evidence.folder_artist
+    title = evidence.title or evidence.folder_title
+    searches = []
+    if evidence.barcode:
+        searches.append({'barcode': evidence.barcode})
+    if evidence.catno:
+        searches.append({'catno': evidence.catno, 'label': evidence.label})
+    if title:
+        searches.append({'release_title': title, 'artist': artist})
+
+    candidates = []
+    for params in searches:
+        for result in search_database(params, token, PRIORITY_BACKGROUND) or []:
+            # Search results title releases 'Artist - Title'
+            result_artist, _, result_title = result.get('title', '').partition(' - ')
+            candidates.append({
+                'release_id': result['id'],
+                'artist': result_artist,
+                'title': result_title or result_artist,
+                'label': ' '.join(result.get('label', [])),
+                'catno': result.get('catno', ''),
+                'barcodes': [re.sub(r'\D', '', barcode) for barcode in result.get('barcode', [])],
+                'source': 'discogs'
+            })
+    return candidates
+
+def score_candidate(evidence: FolderEvidence, candidate: Dict) -> tuple[int, List[str]]:
+    """
+    Score how well a candidate release matches a folder
+
+    Args:
+        evidence: Folder evidence
+        candidate: Candidate release
+
+    Returns:
+        tuple[int, List[str]]: Score and the names of the matching evidence
+    """
+    score = 0
+    matched = []
+    barcode = re.sub(r'\D', '', evidence.barcode)
+    if barcode and barcode in candidate['barcodes']:
+        score += SCORE_BARCODE
+        matched.append('barcode')
+    # Releases with several labels list their catalog numbers separated by ','
+    catnos = [normalize_catno(catno) for catno in re.split(r'[,|]', candidate['catno'] or '')]
+    if evidence.catno and normalize_catno(evidence.catno) in catnos:
+        score += SCORE_CATNO
+        matched.append('catno')
+    elif evidence.folder_catno and any(
+        catno.endswith(normalize_catno(evidence.folder_catno)) for catno in catnos if catno
+    ):
+        score += SCORE_CATNO_NUMBER
+        matched.append('catno number')
+    if texts_match(evidence.title or evidence.folder_title, candidate['title']):
+        score += SCORE_TITLE
+        matched.append('title')
+    if texts_match(evidence.artist or evidence.folder_artist, candidate['artist']):
+        score += SCORE_ARTIST
+        matched.append('artist')
+    if texts_match(evidence.label or evidence.folder_label, candidate['label']):
+        score += SCORE_LABEL
+        matched.append('label')
+    return score, matched
+
+def rank_candidates(evidence: FolderEvidence, candidates: List[Dict], limit: int) -> List[Dict]:
+    """
+    Score and deduplicate candidates, best first
+
+    Returns:
+        List[Dict]: Up to limit candidates with a score above 0, with 'score',
+        'matched' and 'url' added
+    """
+    ranked = {}
+    for candidate in candidates:
+        score, matched = score_candidate(evidence, candidate)
+        previous = ranked.get(candidate['release_id'])
+        if score and (previous is None or score > previous['score']):
+            ranked[candidate['release_id']] = {
+                **candidate,
+                'score': score,
+                'matched': matched,
+                'url': f"https://www.discogs.com/release/{candidate['release_id']}"
+            }
+    return sorted(ranked.values(), key=lambda item: -item['score'])[:limit]
+
+def identify_folder(evidence: FolderEvidence, token: Optional[str] = None, limit: int = 5) -> List[Dict]:
+    """
+    Find the release candidates of a folder
+
+    Args:
+        evidence: Folder evidence
+        token: Discogs token to also use database search, None for the local index only
+        limit: Maximum number of candidates
+
+    Returns:
+        List[Dict]: Ranked candidates
+    """
+    candidates = get_local_candidates(evidence)
+    if token:
+        candidates += get_online_candidates(evidence, token)
+    return rank_candidates(evidence, candidates, limit)
+
+def read_folders(folders: List[str], workers: int = MAX_IDENTIFY_WORKERS) -> List[FolderEvidence]:
+    """
+    Read the tags of every audio file of the folders in parallel
+
+    Args:
+        folders: Album folders
+        workers: Maximum parallel reads
+
+    Returns:
+        List[FolderEvidence]: Evidence per folder, in the order of folders
+    """
+    files = {folder: list_audio_files(folder) for folder in folders}
+    paths = [path for folder in folders for path in files[folder]]
+
+    def read(path: str):
+        try:
+            return read_file_tags(path), None
+        except (MutagenError, OSError) as e:
+            return {}, f'{os.path.basename(path)}: {e}'
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='tag-read') as executor:
+        results = dict(zip(paths, executor.map(read, paths)))
+
+    evidence = []
+    for folder in folders:
+        folder_results = [results[path] for path in files[folder]]
+        item = collect_evidence(folder, [tags for tags, _ in folder_results])
+        item.errors = [error for _, error in folder_results if error]
+        evidence.append(item)
+    return evidence
+
+def format_evidence(evidence: FolderEvidence) -> str:
+    """Describe the evidence of a folder in one line"""
+    parts = [
+        f'{name} {value}' for name, value in (
+            ('catno', evidence.catno or evidence.folder_catno),
+            ('barcode', evidence.barcode),
+            ('label', evidence.label or evidence.folder_label),
+            ('artist', evidence.artist or evidence.folder_artist),
+            ('album', evidence.title or evidence.folder_title)
+        ) if value
+    ]
+    return f"{evidence.files} files; " + (', '.join(parts) or 'no tags')
+
+def main(argv: List[str] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Find the Discogs releases of tagged album folders')
+    parser.add_argument('folders', nargs='+', help='Album folders or directories of album folders')
+    parser.add_argument('--online', action='store_true', help='Also use Discogs database search (needs DISCOGS_TOKEN)')
+    parser.add_argument('--limit', type=int, default=5, help='Candidates per folder (default: 5)')
+    parser.add_argument('--workers', type=int, default=MAX_IDENTIFY_WORKERS, help='Parallel tag reads and lookups')
+    parser.add_argument('--json', default=None, help='Also write the candidates to this JSON file')
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    token = os.getenv('DISCOGS_TOKEN') if args.online else None
+    if args.online and not token:
+        print('DISCOGS_TOKEN is not set, using the local index only')
+
+    folders = find_album_folders(args.folders)
+    evidence = read_folders(folders, args.workers)
+    with ThreadPoolExecutor(max_workers=args.workers, thread_name_prefix='identify') as executor:
+        candidates = list(executor.map(lambda item: identify_folder(item, token, args.limit), evidence))
+
+    identified = 0
+    results = []
+    for item, folder_candidates in zip(evidence, candidates):
+        identified += 1 if folder_candidates else 0
+        print(item.path)
+        print(f'  {format_evidence(item)}')
+        for error in item.errors:
+            print(f'  error: {error}')
+        for rank, candidate in enumerate(folder_candidates, 1):
+            print(f"  {rank}. {candidate['score']:>3}  {candidate['url']}  "
+                  f"{candidate['artist']} - {candidate['title']} [{candidate['label']} {candidate['catno']}] "
+                  f"({', '.join(candidate['matched'])})")
+        if not folder_candidates:
+            print('  no candidates')
+        results.append({**asdict(item), 'candidates': folder_candidates})
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f'Found candidates for {identified} of {len(folders)} folders')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,246 @@
+"""
+Full-text search index over cached and imported releases
+"""
+import logging
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List
+from ..utils.sqlite_store import connect
+
+RELEASE_INDEX_DB = 'release_index.sqlite3'
+
+# Rows per transaction when indexing in bulk
+INDEX_BATCH_SIZE = 5000
+
+logger = logging.getLogger('album_categorizer.index')
+
+# Fetched releases are indexed one at a time, off the fetch path
+_index_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='release-index')
+
+_initialized = False
+
+# Held while the index is created and filled, so other threads wait for the full index
+_init_lock = threading.Lock()
+
+def _get_connection():
+    """Get a database connection, creating and filling the index on first use"""
+    global _initialized
+    conn = connect(RELEASE_INDEX_DB)
+    if not _initialized:
+        with _init_lock:
+            if not _initialized:
+                exists = conn.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'release_search'"
+                ).fetchone()
+                if not exists:
+                    # Prefix indexes keep as-you-type queries fast
+                    conn.execute(
+                        "CREATE VIRTUAL TABLE IF NOT EXISTS release_search USING fts5("
+                        "artist, title, label, catno, barcode, "
+                        "tokenize = 'unicode61 remove_diacritics 2', prefix = '1 2 3')"
+                    )
+                    try:
+                        _index_cached_releases(conn)
+                    except BaseException:
+                        # Start over next time rather than keep a partial index
+                        conn.execute('DROP TABLE IF EXISTS release_search')
+                        raise
+                _initialized = True
+    return conn
+
+def _index_cached_releases(conn) -> None:
+    """Index releases that were cached before the search index existed"""
+    from .release_cache import iter_cached_releases
+    _write_rows(conn, get_search_rows(iter_cached_releases()))
+
+def normalize_catno(catno: str) -> str:
+    """
+    Normalize a catalog number for matching
+
+    Args:
+        catno: Catalog number, e.g. 'WARP CD 123'
+
+    Returns:
+        str: Upper case catalog number without spaces and punctuation, e.g. 'WARPCD123'
+    """
+    return re.sub(r'[^0-9A-Z]', '', (catno or '').upper())
+
+def format_catnos(catnos: List[str]) -> str:
+    """
+    Format catalog numbers for the catno column
+
+    'WARPCD123', 'WARP CD 123' and 'WARP 123' are all indexed so any
+    spelling matches.
+
+    Args:
+        catnos: Catalog numbers as listed on the release
+
+    Returns:
+        str: Original, normalized and split catalog numbers separated by ' | '
+    """
+    catnos = [catno for catno in catnos if catno]
+    normalized = [normalize_catno(catno) for catno in catnos]
+    # Split letter and digit runs: 'WARPCD123' -> 'WARPCD 123'
+    split = [re.sub(r'(?<=[A-Z])(?=\d)|(?<=\d)(?=[A-Z])', ' ', catno) for catno in normalized]
+    return ' | '.join(catnos + normalized + split)
+
+def get_search_row(data: Dict) -> tuple:
+    """
+    Get the indexed fields of a release
+
+    Args:
+        data: Release in the API JSON shape
+
+    Returns:
+        tuple: (release_id, artist, title, label, catno, barcode)
+    """
+    artist = data.get('artists_sort') or ', '.join(
+        artist.get('name', '') for artist in data.get('artists', [])
+    )
+    labels = data.get('labels', [])
+    catnos = [label.get('catno', '') for label in labels if label.get('catno')]
+    barcodes = [
+        identifier.get('value', '') for identifier in data.get('identifiers', [])
+        if identifier.get('type') == 'Barcode'
+    ]
+    return (
+        int(data['id']),
+        artist,
+        data.get('title', ''),
+        ' '.join(label.get('name', '') for label in labels),
+        format_catnos(catnos),
+        ' '.join(re.sub(r'\D', '', barcode) for barcode in barcodes)
+    )
+
+def get_search_rows(releases: Iterable[Dict]) -> Iterator[tuple]:
+    """Get the indexed fields of every release that has an ID"""
+    return (get_search_row(data) for data in releases if data and data.get('id'))
+
+def index_release(data: Dict) -> None:
+    """
+    Add or update a release in the search index
+
+    Args:
+        data: Release in the API JSON shape
+    """
+    if data and data.get('id'):
+        index_releases([data])
+
+def _index_release_logged(data: Dict) -> None:
+    """Index a release, logging instead of raising if the index can't be written"""
+    try:
+        index_release(data)
+    except Exception as e:
+        logger.warning('Could not index release %s: %s', data.get('id'), e)
+
+def queue_index_release(data: Dict) -> Future:
+    """
+    Index a release in the background
+
+    A locked or unavailable index is logged and never fails the caller.
+
+    Args:
+        data: Release in the API JSON shape
+
+    Returns:
+        Future: Resolves once the release is indexed or the failure logged
+    """
+    return _index_executor.submit(_index_release_logged, data)
+
+def index_releases(releases: Iterable[Dict]) -> int:
+    """
+    Add or update many releases in the search index
+
+    Args:
+        releases: Releases in the API JSON shape
+
+    Returns:
+        int: Number of indexed releases
+    """
+    return index_rows(get_search_rows(releases))
+
+def index_rows(rows: Iterable[tuple]) -> int:
+    """
+    Add or update prepared search rows in batches
+
+    Args:
+        rows: (release_id, artist, title, label, catno, barcode) tuples
+
+    Returns:
+        int: Number of indexed rows
+    """
+    return _write_rows(_get_connection(), rows)
+
+def _write_rows(conn, rows: Iterable[tuple]) -> int:
+    """Write search rows in batches of INDEX_BATCH_SIZE, one transaction each"""
+    count = 0
+    batch = []
+
+    def flush():
+        conn.execute('BEGIN')
+        try:
+            conn.executemany(
+                'INSERT OR REPLACE INTO release_search (rowid, artist, title, label, catno, barcode) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                batch
+            )
+        except BaseException:
+            # Leave the per-thread connection usable for the next transaction
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= INDEX_BATCH_SIZE:
+            flush()
+            count += len(batch)
+            batch = []
+    if batch:
+        flush()
+        count += len(batch)
+    return count
+
+def build_match_query(query: str) -> str:
+    """
+    Turn user input into an FTS5 query where every word is a prefix match
+
+    Args:
+        query: Search text, e.g. 'daft disc'
+
+    Returns:
+        str: FTS5 query, e.g. '"daft"* "disc"*'
+    """
+    words = re.findall(r'\w+', query or '')
+    return ' '.join('"' + word.replace('"', '""') + '"*' for word in words)
+
+def search_releases(query: str, limit: int = 20) -> List[Dict]:
+    """
+    Search the index
+
+    Args:
+        query: Artist, title, label, catalog number or barcode words
+        limit: Maximum number of results
+
+    Returns:
+        List[Dict]: Matching releases ('release_id', 'artist', 'title',
+        'label', 'catno', 'barcode'), best match first
+    """
+    match = build_match_query(query)
+    if not match:
+        return []
+    rows = _get_connection().execute(
+        'SELECT rowid, artist, title, label, catno, barcode FROM release_search '
+        'WHERE release_search MATCH ? ORDER BY rank LIMIT ?',
+        (match, limit)
+    ).fetchall()
+    return [{
+        'release_id': row[0],
+        'artist': row[1],
+        'title': row[2],
+        'label': row[3],
+        # The first catalog number is the original spelling
+        'catno': row[4].split(' | ')[0] if row[4] else '',
+        'barcode': row[5] or ''
+    } for row in rows]
@@ -0,0 +1,93 @@
+"""
+Compact release representation kept in session state
+"""
+import hashlib
+import json
+from typing import Dict, List, Optional
+from .dump_store import get_dump_release
+from .release_cache import get_cached_release
+
+# Bump when the compact fields change, so stored releases are rebuilt
+COMPACT_RELEASE_VERSION = 1
+
+# Fields the transforms and panels read, everything else stays in the release cache
+RELEASE_FIELDS = ['id', 'title', 'artists_sort', 'country', 'released', 'year', 'notes', 'genres', 'styles', 'uri']
+CREDIT_FIELDS = ['id', 'name', 'anv', 'join', 'role', 'resource_url']
+LABEL_FIELDS = ['id', 'name', 'catno']
+FORMAT_FIELDS = ['name', 'qty', 'descriptions', 'text']
+TRACK_FIELDS = ['position', 'type_', 'title', 'duration']
+IMAGE_FIELDS = ['type', 'uri', 'uri150', 'width', 'height']
+
+def _pick(item: Dict, fields: List[str]) -> Dict:
+    """Copy the given fields of a dict, skipping missing ones"""
+    return {name: item[name] for name in fields if name in item}
+
+def _credits(credits: List[Dict]) -> List[Dict]:
+    """Compact a list of artist credits"""
+    return [_pick(credit, CREDIT_FIELDS) for credit in credits or []]
+
+def get_fingerprint(release: Dict) -> str:
+    """
+    Get a fingerprint of a release's content
+
+    Args:
+        release: Compact release without its fingerprint
+
+    Returns:
+        str: SHA-1 of the canonical JSON, equal for equal content
+    """
+    content = json.dumps(release, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+def compact_release(data: Dict) -> Dict:
+    """
+    Keep only the release fields the app uses
+
+    The result has the same shape as the API JSON, so it can be passed to
+    every transform, plus 'compact_version' and a content 'fingerprint'.
+
+    Args:
+        data: Release JSON from the API
+
+    Returns:
+        Dict: Compact release
+    """
+    if is_compact(data):
+        return data
+
+    release = _pick(data, RELEASE_FIELDS)
+    release['artists'] = _credits(data.get('artists'))
+    release['extraartists'] = _credits(data.get('extraartists'))
+    release['labels'] = [_pick(label, LABEL_FIELDS) for label in data.get('labels', [])]
+    release['formats'] = [_pick(fmt, FORMAT_FIELDS) for fmt in data.get('formats', [])]
+    release['images'] = [_pick(image, IMAGE_FIELDS) for image in data.get('images', [])]
+    release['tracklist'] = []
+    for track in data.get('tracklist', []):
+        compact_track = _pick(track, TRACK_FIELDS)
+        for credits in ('artists', 'extraartists'):
+            if credits in track:
+                compact_track[credits] = _credits(track[credits])
+        release['tracklist'].append(compact_track)
+
+    release['compact_version'] = COMPACT_RELEASE_VERSION
+    release['fingerprint'] = get_fingerprint(release)
+    return release
+
+def is_compact(data: Optional[Dict]) -> bool:
+    """Check if a release is a compact release of the current version"""
+    return bool(data) and data.get('compact_version') == COMPACT_RELEASE_VERSION
+
+def get_raw_release(release_id: str) -> Optional[Dict]:
+    """
+    Get the full API JSON of a release from the local caches
+
+    Args:
+        release_id: Discogs release ID
+
+    Returns:
+        Optional[Dict]: Release JSON, or None if it isn't stored locally
+    """
+    cached = get_cached_release(release_id)
+    if cached:
+        return cached['data']
+    return get_dump_release(release_id)
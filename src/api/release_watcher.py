@@ -0,0 +1,163 @@
+"""
+Release change watcher
+
+Usage:
+    python -m src.api.release_watcher [--report PATH] [--limit N] [--dry-run]
+
+Revalidates the releases whose info files were saved, least recently
+checked first, with conditional requests and only while the background
+share of the rate budget has tokens left. Info files are re-rendered only
+when a field they show changed; files that were edited by hand are left
+alone. Every change is written to a diff report. Meant to run from cron,
+each run continues where the previous one stopped.
+"""
+import argparse
+import difflib
+import os
+import sys
+import time
+from typing import Dict, List
+from dotenv import load_dotenv
+from .discogs import fetch_release
+from .export_registry import iter_exports, mark_checked, update_export
+from .rate_limiter import PRIORITY_BACKGROUND, has_spare_budget
+from ..transformations.info import (
+    collect_artist_resources,
+    resolve_artist_details,
+    format_info_file,
+    get_release_info
+)
+from ..utils.file_operations import get_export_dir
+
+STATUS_UNCHANGED = 'unchanged'
+STATUS_UPDATED = 'updated'
+STATUS_EDITED = 'edited by hand, not updated'
+STATUS_ERROR = 'error'
+
+def render_recorded_fields(fields: Dict) -> str:
+    """Render an info file from fields stored in the export registry"""
+    fields = dict(fields)
+    tracklist = fields.pop('tracklist', [])
+    return format_info_file(fields, tracklist)
+
+def read_text(path: str) -> str:
+    """Read a text file, or return None if it doesn't exist"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+def check_export(export: Dict, token: str = None, dry_run: bool = False) -> Dict:
+    """
+    Revalidate an exported release and refresh its info file if needed
+
+    Args:
+        export: Export registry entry
+        token: Discogs token, empty for unauthenticated requests
+        dry_run: Report changes without writing info files
+
+    Returns:
+        Dict: 'status' and, for changed releases, the unified 'diff'
+    """
+    data, response, error = fetch_release(
+        export['release_id'],
+        token,
+        priority=PRIORITY_BACKGROUND,
+        revalidate=True
+    )
+    if error:
+        return {'status': STATUS_ERROR, 'error': error}
+    if response is None:
+        # fetch_release fell back to the cached copy
+        return {'status': STATUS_ERROR, 'error': 'Discogs could not be reached'}
+
+    artist_details = resolve_artist_details(collect_artist_resources(data), PRIORITY_BACKGROUND)
+    fields, tracklist = get_release_info(data, artist_details)
+    new_fields = {**fields, 'tracklist': tracklist}
+    if not dry_run:
+        mark_checked(export['release_id'])
+    if new_fields == export['fields']:
+        return {'status': STATUS_UNCHANGED}
+
+    old_content = render_recorded_fields(export['fields'])
+    new_content = format_info_file(fields, tracklist)
+    diff = ''.join(difflib.unified_diff(
+        (old_content + '\n').splitlines(keepends=True),
+        (new_content + '\n').splitlines(keepends=True),
+        fromfile=f"{export['folder_name']} (exported)",
+        tofile=f"{export['folder_name']} (Discogs)"
+    ))
+    if not diff:
+        # Only fields outside the info file changed
+        if not dry_run:
+            update_export(export['release_id'], new_fields, export['content'])
+        return {'status': STATUS_UNCHANGED}
+
+    # Files that differ from what the API fields render to were edited in the app or on disk
+    if export['content'] != old_content or read_text(export['info_path']) != export['content']:
+        return {'status': STATUS_EDITED, 'diff': diff}
+
+    if not dry_run:
+        with open(export['info_path'], 'w', encoding='utf-8') as f:
+            f.write(new_content)
+        update_export(export['release_id'], new_fields, new_content)
+    return {'status': STATUS_UPDATED, 'diff': diff}
+
+def write_report(path: str, results: List[tuple[Dict, Dict]]) -> None:
+    """
+    Write the diff report of the changed releases
+
+    Args:
+        path: Report file path
+        results: (export, result) pairs of the changed releases
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        for export, result in results:
+            f.write(f"# Release {export['release_id']}: {export['folder_name']} ({result['status']})\n")
+            f.write(result['diff'])
+            f.write('\n')
+
+def main(argv: List[str] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description='Refresh exported info files whose Discogs release changed')
+    parser.add_argument('--report', default=None, help='Diff report path (default: export/release-changes-<time>.diff)')
+    parser.add_argument('--limit', type=int, default=None, help='Check at most this many releases')
+    parser.add_argument('--dry-run', action='store_true', help='Report changes without writing info files')
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    token = os.getenv('DISCOGS_TOKEN')
+    report_path = args.report or os.path.join(
+        get_export_dir(),
+        f"release-changes-{time.strftime('%Y%m%d-%H%M%S')}.diff"
+    )
+
+    checked = 0
+    counts = {}
+    changed = []
+    for export in iter_exports():
+        if args.limit is not None and checked >= args.limit:
+            break
+        if not has_spare_budget(priority=PRIORITY_BACKGROUND):
+            print('Rate budget used up, stopping until the next run')
+            break
+
+        result = check_export(export, token, args.dry_run)
+        checked += 1
+        counts[result['status']] = counts.get(result['status'], 0) + 1
+        if result['status'] == STATUS_ERROR:
+            print(f"{export['release_id']}: {result['error']}")
+        elif result['status'] != STATUS_UNCHANGED:
+            print(f"{export['release_id']}: {export['folder_name']} ({result['status']})")
+            changed.append((export, result))
+
+    if changed:
+        write_report(report_path, changed)
+        print(f'Wrote {report_path}')
+    print(f"Checked {checked} releases: " + ', '.join(f'{count} {status}' for status, count in counts.items()))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,306 @@
+"""
+Telemetry of outbound requests and cache lookups
+"""
+import json
+import logging
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+# Latency histogram bucket upper bounds in milliseconds, the last bucket is open
+LATENCY_BUCKETS_MS = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+# Recent records kept for per-release summaries
+MAX_RECORDS = 5000
+
+# JSON lines file to log every record to, logging goes to the
+# 'album_categorizer.http' logger either way
+HTTP_TELEMETRY_LOG = os.getenv('HTTP_TELEMETRY_LOG')
+
+logger = logging.getLogger('album_categorizer.http')
+
+@dataclass
+class RequestRecord:
+    """
+    One outbound request or cache lookup
+
+    Attributes:
+        endpoint: 'release', 'artist', 'listing', 'search', 'image' or 'other'
+        url: Requested URL
+        status: HTTP status, None for cache hits and connection errors
+        latency_ms: Time until the response or the cache lookup completed
+        size: Response body bytes
+        cache: 'hit', 'dump', 'stale', 'revalidated' or 'miss'
+        retries: Retry number of this request, 0 for the first attempt
+        ratelimit_remaining: X-Discogs-Ratelimit-Remaining of the response
+        error: Exception name for failed requests
+        timestamp: Unix time the record was made
+    """
+    endpoint: str
+    url: str
+    status: Optional[int]
+    latency_ms: float
+    size: int = 0
+    cache: str = 'miss'
+    retries: int = 0
+    ratelimit_remaining: Optional[int] = None
+    error: Optional[str] = None
+    timestamp: float = field(default_factory=time.time)
+
+_records: deque = deque(maxlen=MAX_RECORDS)
+_histograms: Dict[str, Dict] = {}
+_lock = threading.Lock()
+_log_configured = False
+
+def get_endpoint_class(url: str) -> str:
+    """
+    Classify a URL by the kind of resource it requests
+
+    Args:
+        url: Request URL
+
+    Returns:
+        str: 'release', 'artist', 'listing', 'search', 'image' or 'other'
+    """
+    path = re.sub(r'^\w+://[^/]+', '', url).split('?')[0].rstrip('/')
+    if re.search(r'/(labels|artists)/\d+/releases$', path):
+        return 'listing'
+    if re.search(r'/releases/\d+$', path):
+        return 'release'
+    if re.search(r'/artists/\d+$', path):
+        return 'artist'
+    if '/database/search' in path:
+        return 'search'
+    if 'i.discogs.com' in url or path.startswith('/images/') or re.search(r'\.(jpe?g|png|gif|webp)$', path, re.I):
+        return 'image'
+    return 'other'
+
+def _configure_log() -> None:
+    """Attach the JSON lines file handler once, if HTTP_TELEMETRY_LOG is set"""
+    global _log_configured
+    _log_configured = True
+    if HTTP_TELEMETRY_LOG:
+        handler = logging.FileHandler(HTTP_TELEMETRY_LOG, encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+
+def _new_histogram() -> Dict:
+    """Create the empty aggregates of an endpoint class"""
+    return {
+        'count': 0,
+        'latency_buckets': [0] * (len(LATENCY_BUCKETS_MS) + 1),
+        'latency_total_ms': 0.0,
+        'bytes': 0,
+        'statuses': {},
+        'cache': {},
+        'retries': 0
+    }
+
+def add_record(record: RequestRecord) -> RequestRecord:
+    """
+    Store a record, add it to the histograms and log it as JSON
+
+    Args:
+        record: Record to store
+
+    Returns:
+        RequestRecord: The stored record
+    """
+    with _lock:
+        if not _log_configured:
+            _configure_log()
+        _records.append(record)
+        histogram = _histograms.setdefault(record.endpoint, _new_histogram())
+        histogram['count'] += 1
+        histogram['latency_buckets'][bisect_left(LATENCY_BUCKETS_MS, record.latency_ms)] += 1
+        histogram['latency_total_ms'] += record.latency_ms
+        histogram['bytes'] += record.size
+        status = str(record.status) if record.status is not None else (record.error or 'cache')
+        histogram['statuses'][status] = histogram['statuses'].get(status, 0) + 1
+        histogram['cache'][record.cache] = histogram['cache'].get(record.cache, 0) + 1
+        histogram['retries'] += 1 if record.retries else 0
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps(asdict(record)))
+    return record
+
+def record_response(url: str, response, started: float, retries: int = 0, streamed: bool = False) -> RequestRecord:
+    """
+    Record a completed HTTP request
+
+    Args:
+        url: Requested URL
+        response: requests.Response
+        started: time.perf_counter() when the request was sent
+        retries: Retry number of this request
+        streamed: The body hasn't been read, its size is taken from Content-Length
+
+    Returns:
+        RequestRecord: The stored record
+    """
+    remaining = response.headers.get('X-Discogs-Ratelimit-Remaining')
+    if streamed:
+        size = int(response.headers.get('Content-Length') or 0)
+    else:
+        size = len(response.content or b'')
+    return add_record(RequestRecord(
+        endpoint=get_endpoint_class(url),
+        url=url,
+        status=response.status_code,
+        latency_ms=(time.perf_counter() - started) * 1000,
+        size=size,
+        cache='revalidated' if response.status_code == 304 else 'miss',
+        retries=retries,
+        ratelimit_remaining=int(remaining) if remaining and remaining.isdigit() else None
+    ))
+
+def record_error(url: str, error: Exception, started: float, retries: int = 0) -> RequestRecord:
+    """Record a request that failed without a response"""
+    return add_record(RequestRecord(
+        endpoint=get_endpoint_class(url),
+        url=url,
+        status=None,
+        latency_ms=(time.perf_counter() - started) * 1000,
+        retries=retries,
+        error=type(error).__name__
+    ))
+
+def record_cache_lookup(url: str, cache: str, started: float) -> RequestRecord:
+    """
+    Record a lookup that was answered without a request
+
+    Args:
+        url: URL that would have been requested
+        cache: 'hit', 'dump' or 'stale'
+        started: time.perf_counter() when the lookup started
+    """
+    return add_record(RequestRecord(
+        endpoint=get_endpoint_class(url),
+        url=url,
+        status=None,
+        latency_ms=(time.perf_counter() - started) * 1000,
+        cache=cache
+    ))
+
+def get_records(urls: Iterable[str] = None, since: float = None) -> List[RequestRecord]:
+    """
+    Get the recent records, optionally only those of some URLs or time span
+
+    Args:
+        urls: URLs to keep, e.g. the release, artist and image URLs of a release
+        since: Unix time; older records are skipped, e.g. those of earlier loads
+
+    Returns:
+        List[RequestRecord]: Records, oldest first
+    """
+    with _lock:
+        records = list(_records)
+    if since is not None:
+        records = [item for item in records if item.timestamp >= since]
+    if urls is None:
+        return records
+    urls = set(urls)
+    return [item for item in records if item.url in urls]
+
+def summarize_records(records: List[RequestRecord]) -> List[Dict]:
+    """
+    Aggregate records per endpoint class
+
+    Args:
+        records: Records to aggregate
+
+    Returns:
+        List[Dict]: One row per endpoint with 'endpoint', 'lookups', 'requests',
+        'cache_hits', 'retries', 'throttled', 'errors', 'total_ms', 'max_ms',
+        'bytes' and 'ratelimit_remaining' (the latest value seen)
+    """
+    rows = {}
+    for item in records:
+        row = rows.setdefault(item.endpoint, {
+            'endpoint': item.endpoint,
+            'lookups': 0,
+            'requests': 0,
+            'cache_hits': 0,
+            'retries': 0,
+            'throttled': 0,
+            'errors': 0,
+            'total_ms': 0.0,
+            'max_ms': 0.0,
+            'bytes': 0,
+            'ratelimit_remaining': None
+        })
+        row['lookups'] += 1
+        if item.cache in ('hit', 'dump', 'stale'):
+            row['cache_hits'] += 1
+        else:
+            row['requests'] += 1
+        row['retries'] += 1 if item.retries else 0
+        row['throttled'] += 1 if item.status == 429 else 0
+        row['errors'] += 1 if item.error or (item.status or 0) >= 400 else 0
+        row['total_ms'] += item.latency_ms
+        row['max_ms'] = max(row['max_ms'], item.latency_ms)
+        row['bytes'] += item.size
+        if item.ratelimit_remaining is not None:
+            row['ratelimit_remaining'] = item.ratelimit_remaining
+    return list(rows.values())
+
+def get_histograms() -> Dict[str, Dict]:
+    """
+    Get the aggregates of every record since the process started
+
+    Returns:
+        Dict[str, Dict]: By endpoint class: 'count', 'latency_buckets' (counts
+        per LATENCY_BUCKETS_MS bucket plus one open bucket), 'latency_total_ms',
+        'bytes', 'statuses', 'cache' and 'retries'
+    """
+    with _lock:
+        return json.loads(json.dumps(_histograms))
+
+def get_bucket_percentile(buckets: List[int], fraction: float) -> Optional[float]:
+    """
+    Estimate a latency percentile from histogram buckets
+
+    Args:
+        buckets: Counts per LATENCY_BUCKETS_MS bucket plus the open bucket
+        fraction: Percentile as a fraction, e.g. 0.95
+
+    Returns:
+        Optional[float]: Upper bound of the bucket the percentile falls in,
+        infinity for the open bucket, None without records
+    """
+    total = sum(buckets)
+    if not total:
+        return None
+    seen = 0
+    for bound, count in zip(LATENCY_BUCKETS_MS + [float('inf')], buckets):
+        seen += count
+        if seen >= total * fraction:
+            return bound
+    return float('inf')
+
+def get_latency_summary() -> List[Dict]:
+    """
+    Summarize the histograms for display
+
+    Returns:
+        List[Dict]: One row per endpoint class with the record count, average,
+        p50 and p95 latency, kilobytes received and cache hits
+    """
+    rows = []
+    for endpoint, histogram in sorted(get_histograms().items()):
+        cache_hits = sum(count for cache, count in histogram['cache'].items() if cache in ('hit', 'dump', 'stale'))
+        rows.append({
+            'endpoint': endpoint,
+            'count': histogram['count'],
+            'avg ms': round(histogram['latency_total_ms'] / histogram['count'], 1),
+            'p50 ms ≤': get_bucket_percentile(histogram['latency_buckets'], 0.5),
+            'p95 ms ≤': get_bucket_percentile(histogram['latency_buckets'], 0.95),
+            'KB': round(histogram['bytes'] / 1024, 1),
+            'cache hits': cache_hits
+        })
+    return rows
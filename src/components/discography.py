@@ -0,0 +1,101 @@
+"""
+Label / artist discography prefetch component
+"""
+import streamlit as st
+from ..api.discography import (
+    KIND_ARTIST,
+    KIND_LABEL,
+    get_discography_job,
+    parse_discography_source,
+    start_discography_job
+)
+
+KIND_OPTIONS = {KIND_LABEL: "Label", KIND_ARTIST: "Artist"}
+
+def on_prefetch_discography():
+    """Start prefetching the entered label or artist"""
+    source = parse_discography_source(
+        st.session_state.get('discography_source', ''),
+        st.session_state.get('discography_kind', KIND_LABEL)
+    )
+    st.session_state.discography_job = source
+    if source:
+        start_discography_job(*source, st.session_state.get('discogs_token'))
+
+def render_discography():
+    """Render the discography prefetch component"""
+    with st.expander("💿 Label / Artist Catalogue"):
+        col1, col2, col3 = st.columns([4, 12, 5], vertical_alignment="bottom")
+
+        with col1:
+            st.selectbox(
+                label="Type",
+                options=list(KIND_OPTIONS.keys()),
+                format_func=lambda kind: KIND_OPTIONS[kind],
+                key="discography_kind"
+            )
+
+        with col2:
+            st.text_input(
+                label="Label / Artist",
+                placeholder="https://www.discogs.com/label/... or ID",
+                help="Every release of the label or artist is fetched in the background and cached",
+                key="discography_source"
+            )
+
+        with col3:
+            st.button(
+                "Prefetch Catalogue",
+                on_click=on_prefetch_discography,
+                use_container_width=True
+            )
+
+        source = st.session_state.get('discography_job')
+        if not source:
+            if 'discography_job' in st.session_state:
+                st.warning("Enter a Discogs label or artist URL or ID")
+            return
+
+        job = get_discography_job(*source)
+        if job is None:
+            return
+
+        # Copies, the job keeps filling these in from its worker threads
+        release_ids = list(job.release_ids)
+        folder_names = dict(job.folder_names)
+        errors = dict(job.errors)
+
+        processed = len(folder_names) + sum(1 for key in errors if not key.startswith('page'))
+        total = len(release_ids)
+        st.progress(
+            processed / total if total else 0.0,
+            text=f"{processed} / {total} releases" + ("" if job.done else " (listing and fetching...)")
+        )
+
+        col1, col2, _ = st.columns([4, 4, 13])
+        with col1:
+            st.button("Refresh", key="discography_refresh", use_container_width=True)
+        with col2:
+            if not job.done and st.button("Stop", key="discography_stop", use_container_width=True):
+                job.cancelled = True
+
+        if release_ids:
+            st.dataframe(
+                [{
+                    'Release': release_id,
+                    'Folder Name': folder_names.get(release_id, ''),
+                    'Error': errors.get(release_id, '')
+                } for release_id in release_ids],
+                hide_index=True,
+                use_container_width=True
+            )
+            st.download_button(
+                "Download Folder Names",
+                data='\n'.join(folder_names[release_id] for release_id in release_ids if release_id in folder_names),
+                file_name=f"{KIND_OPTIONS[job.kind].lower()}_{job.entity_id}_folders.txt",
+                disabled=not folder_names
+            )
+
+        for key, error in errors.items():
+            if key.startswith('page'):
+                st.error(f"Error fetching {key}: {error}")
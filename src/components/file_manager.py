@@ -3,14 +3,11 @@ File manager component
 """
 import streamlit as st
 import os
-import shutil
-import tempfile
 from typing import Dict, Optional, List
-from ..utils.file_operations import create_album_folder
+from ..utils.file_operations import create_album_folder, save_audio_files
+from ..utils.tag_cache import start_tag_reads
 from .tag_editor import render_tag_editor, edit_tags
-from mutagen.id3 import ID3, APIC, COMM
-from mutagen.easyid3 import EasyID3
-import requests
+from .image_gallery import IMAGE_ANALYSIS_TIMEOUT, get_artwork_data, get_image_analysis
 import re
 
 def init_track_file_pairs():
@@ -116,43 +113,56 @@ def get_track_info(track_id: str) -> Dict[str, str]:
         'discnumber': disc_number
     }
 
-def get_track_metadata(track_id: str) -> Dict[str, str]:
+def get_artwork_url() -> Optional[str]:
     """
-    Get track metadata from session state
-    
-    Args:
-        track_id: Track ID
-        
+    Get the URL of the artwork selected for the ID3 tags
+
     Returns:
-        Dict[str, str]: Track metadata
+        Optional[str]: Selected image URL, the best front cover if none is
+        selected, or None if the release has no images
     """
     # Get artwork URL from session state
     artwork_url = st.session_state.get('selected_artwork')
     
-    # If no artwork is selected but we have images, automatically select the first one
+    # If no artwork is selected but we have images, automatically select the best
+    # front cover, or the first image if the image analysis isn't available
     if not artwork_url and st.session_state.get('discogs_images') and len(st.session_state.get('discogs_images', [])) > 0:
-        artwork_url = st.session_state.get('discogs_images')[0]['uri']
+        analysis = get_image_analysis(timeout=IMAGE_ANALYSIS_TIMEOUT)
+        best_front = analysis.best_front if analysis and analysis.best_front is not None else 0
+        artwork_url = st.session_state.get('discogs_images')[best_front]['uri']
         st.session_state.selected_artwork = artwork_url
-        st.session_state.selected_artwork_index = 0
-    
-    # Download artwork if URL is available
-    artwork_data = None
-    if artwork_url:
-        try:
-            # Download artwork data with proper headers
-            headers = {
-                'User-Agent': 'AlbumCategorizer/1.0',
-                'Referer': 'https://www.discogs.com/'
-            }
-            response = requests.get(artwork_url, headers=headers)
-            if response.status_code == 200:
-                artwork_data = response.content
-                # st.write("Debug - Downloaded artwork data length:", len(artwork_data))
-            else:
-                st.error(f"Error downloading artwork: {response.status_code} - {response.text}")
-        except Exception as e:
-            st.error(f"Error downloading artwork: {str(e)}")
+        st.session_state.selected_artwork_index = best_front
+    return artwork_url
+
+def prepare_album_artwork() -> Optional[bytes]:
+    """
+    Download and resize the selected artwork once for every track of an album
+
+    Returns:
+        Optional[bytes]: JPEG data sized by the artwork settings, or None
+    """
+    artwork_url = get_artwork_url()
+    if not artwork_url:
+        return None
+    try:
+        # Download artwork data with proper headers
+        headers = {'Referer': 'https://www.discogs.com/'}
+        return get_artwork_data(artwork_url, headers=headers)
+    except Exception as e:
+        st.error(f"Error downloading artwork: {str(e)}")
+        return None
+
+def get_track_metadata(track_id: str, artwork_data: Optional[bytes] = None) -> Dict[str, str]:
+    """
+    Get track metadata from session state
     
+    Args:
+        track_id: Track ID
+        artwork_data: Prepared artwork to embed, see prepare_album_artwork
+        
+    Returns:
+        Dict[str, str]: Track metadata
+    """
     # Get track info
     track_info = get_track_info(track_id)
     
@@ -219,7 +229,11 @@ def save_files(uploaded_files: Dict[str, Dict], edited_tags: Dict[str, Dict]) ->
         if not os.path.exists(album_dir):
             os.makedirs(album_dir)
             
-        # Save each file
+        # Artwork is prepared once and embedded in every track
+        artwork_data = prepare_album_artwork()
+
+        # Collect the files to write with their tags
+        files = []
         for file_id, file_info in uploaded_files.items():
             if 'file' not in file_info:
                 continue
@@ -231,153 +245,33 @@ def save_files(uploaded_files: Dict[str, Dict], edited_tags: Dict[str, Dict]) ->
                 continue
                 
             # Get track metadata
-            metadata = get_track_metadata(track_id)
+            metadata = get_track_metadata(track_id, artwork_data)
                 
             # Get original file extension
             _, ext = os.path.splitext(uploaded_file.name)
             
             # Get the track name that was matched with this file
             new_filename = get_track_name(track_id) + ext
-            
-            # Create full path
-            export_path = os.path.join(album_dir, new_filename)
-            
-            # Create a temporary file
-            tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix=ext)
-            try:
-                # Write the uploaded file to the temporary file
-                tmp_file.write(uploaded_file.getvalue())
-                tmp_file.close()  # Close the file but don't delete it yet
-                
-                if ext == '.flac':
-                    from mutagen.flac import FLAC, Picture
-                    # Load FLAC file
-                    audio = FLAC(tmp_file.name)
-                    
-                    # Clear existing tags and pictures
-                    audio.clear_pictures()
-                    audio.tags.clear()
-                    
-                    # Add new tags
-                    for key, value in metadata.items():
-                        if key == 'artwork' and isinstance(value, bytes):
-                            picture = Picture()
-                            picture.type = 3  # Front cover
-                            picture.mime = 'image/jpeg'
-                            picture.desc = 'Front cover'
-                            picture.data = value
-                            audio.add_picture(picture)
-                        elif key not in ['artwork', 'length']:
-                            # Convert keys to FLAC standard
-                            flac_key = {
-                                'tracknumber': 'TRACKNUMBER',
-                                'discnumber': 'DISCNUMBER',
-                                'albumartist': 'ALBUMARTIST',
-                                'genre': 'GENRE',
-                                'artist': 'ARTIST',
-                                'title': 'TITLE',
-                                'album': 'ALBUM',
-                                'date': 'DATE',
-                                'organization': 'ORGANIZATION',
-                                'copyright': 'COPYRIGHT',
-                                'comment': 'DESCRIPTION'
-                            }.get(key.lower(), key.upper())
-                            
-                            if value:  # Only add non-empty values
-                                audio.tags[flac_key] = str(value)
-                    
-                    # Save changes
-                    audio.save()
-                else:
-                    try:
-                        # First try to delete all existing ID3 tags
-                        id3 = ID3(tmp_file.name)
-                        id3.delete()
-                        id3.save()
-                    except:
-                        # If the file doesn't have ID3 tags yet, create them
-                        try:
-                            id3 = ID3()
-                            id3.save(tmp_file.name)
-                        except Exception as e:
-                            st.error(f'Error initializing ID3 tags: {str(e)}')
-                            return False
-                    
-                    try:
-                        # Initialize EasyID3
-                        audio = EasyID3(tmp_file.name)
-                    except:
-                        # If EasyID3 tags don't exist, add them
-                        try:
-                            EasyID3.create(tmp_file.name)
-                            audio = EasyID3(tmp_file.name)
-                        except Exception as e:
-                            st.error(f'Error initializing EasyID3 tags: {str(e)}')
-                            return False
-                    
-                    # Update standard tags first
-                    for key, value in metadata.items():
-                        if key not in ['artwork', 'length', 'comment'] and value:  # Skip artwork, length and comment
-                            try:
-                                audio[key] = value
-                            except Exception as e:
-                                st.error(f'Error setting {key}: {str(e)}')
-                                return False
-                    
-                    # Save standard tags
-                    audio.save()
-                    
-                    # Now handle comment and artwork with full ID3
-                    id3 = ID3(tmp_file.name)
-                    
-                    # Add comment if present
-                    if metadata.get('comment'):
-                        # Remove existing comments
-                        id3.delall('COMM')
-                        # Add new comment
-                        id3.add(COMM(
-                            encoding=3,
-                            lang='eng',
-                            desc='description',
-                            text=metadata['comment']
-                        ))
-                        # st.write("Debug - Added comment:", metadata['comment'])
-                    
-                    # Add artwork if present
-                    if metadata and metadata.get('artwork'):
-                        # st.write("Debug - Adding artwork...")
-                        try:
-                            # Remove existing artwork
-                            id3.delall('APIC')
-                            # Add new artwork
-                            id3.add(APIC(
-                                encoding=3,  # UTF-8
-                                mime='image/jpeg',  # Image MIME type
-                                type=3,  # Cover (front)
-                                desc='Cover',
-                                data=metadata['artwork']
-                            ))
-                            # st.write("Debug - Successfully added artwork")
-                        except Exception as e:
-                            st.error(f"Error adding artwork: {str(e)}")
-                    
-                    # Save ID3 tags
-                    try:
-                        id3.save(v2_version=3)
-                        # st.write("Debug - Saved ID3 tags")
-                    except Exception as e:
-                        st.error(f"Error saving ID3 tags: {str(e)}")
-                
-                # Copy the file with updated tags to the export directory
-                shutil.copy2(tmp_file.name, export_path)
-                
-            finally:
-                # Clean up the temporary file
-                try:
-                    os.unlink(tmp_file.name)
-                except:
-                    pass
-                    
+            files.append((uploaded_file, os.path.join(album_dir, new_filename), metadata))
+
+        # Files are tagged and written in parallel, progress is reported in one status element
+        with st.status(f'Saving {len(files)} files...') as status:
+            progress = st.progress(0.0)
+
+            def on_progress(done, total, file_name, error):
+                progress.progress(done / total, text=f'{done} of {total} files')
+                if error:
+                    st.write(f'❌ {file_name}: {error}')
+
+            failed = save_audio_files(files, on_progress)
+            status.update(
+                label=f'Saved {len(files) - len(failed)} of {len(files)} files to {folder_name}',
+                state='error' if failed else 'complete',
+                expanded=bool(failed)
+            )
+
+        if failed:
+            return False
         st.toast(f"Successfully saved files to {folder_name}", icon="✅")
         return True
         
@@ -404,6 +298,9 @@ def render_file_manager():
         st.markdown("<div class='separator-line'> </div>", unsafe_allow_html=True)
         return
 
+    # Parse the uploads in the background while the tracks are matched
+    start_tag_reads(uploaded_files)
+
     # Get tracklist from session state
     tracklist = st.session_state.get('tracklist', [])
     if not tracklist:
@@ -480,7 +377,10 @@ def render_file_manager():
         # Show tag editor for the selected file with track info
         if selected_file != "Select file..." and selected_file_obj:
             with st.expander(f"Edit Tags for Track {i + 1}: {edited_name}", expanded=False):
-                edited_tags[track_id] = render_tag_editor(selected_file_obj, track_info)
+                # Expander contents run even when collapsed, so the editor
+                # is only built once it is asked for
+                if st.toggle("Show tags", key=f"show_tags_{track_id}"):
+                    edited_tags[track_id] = render_tag_editor(selected_file_obj, track_info)
 
     col3, col4 = st.columns([31, 10])
     
@@ -2,11 +2,14 @@
 Image Gallery Component
 """
 import streamlit as st
-from PIL import Image
-import requests
-from io import BytesIO
 import os
-from ..utils.file_operations import save_image
+from typing import Optional
+from ..api.image_analysis import MAX_ANALYZED_IMAGES, ImageAnalysis
+from ..api.image_cache import get_cached_image
+from ..api.images import fetch_artwork
+from ..utils.artwork import ARTWORK_MAX_SIZE, ARTWORK_QUALITY
+from ..api.fetch_pipeline import get_release_jobs
+from ..utils.file_operations import save_image, save_images
 
 # Előre definiált kép típusok
 IMAGE_TYPES = ['Select image type'] + [
@@ -14,6 +17,12 @@ IMAGE_TYPES = ['Select image type'] + [
     'Inside', 'Inlay', 'Cover', 'Label', 'Booklet', 'Other'
 ]
 
+# Images per gallery page; releases with more images are paginated
+GALLERY_PAGE_SIZE = MAX_ANALYZED_IMAGES
+
+# Seconds saving files waits for the best front cover before using the first image
+IMAGE_ANALYSIS_TIMEOUT = 10
+
 def init_image_state():
     """Initialize image gallery related session state variables"""
     if 'discogs_images' not in st.session_state:
@@ -25,13 +34,68 @@ def init_image_state():
     if 'selected_artwork' not in st.session_state:
         st.session_state.selected_artwork = None
 
-def get_artwork_data(image_url: str) -> bytes:
-    """Get artwork data from URL"""
-    headers = {
-        'User-Agent': 'AlbumCategorizer/1.0'
-    }
-    response = requests.get(image_url, headers=headers)
-    return response.content
+def reset_image_selection():
+    """Forget the image types and artwork chosen for the previous release"""
+    st.session_state.image_types = {}
+    st.session_state.selected_artwork = None
+    st.session_state.selected_artwork_index = 0
+    st.session_state.pop('artwork_selection', None)
+    for key in [key for key in st.session_state if key.startswith('image_type_')]:
+        del st.session_state[key]
+
+def on_image_type_change(idx: int):
+    """Remember an image's type, so it survives switching gallery pages"""
+    st.session_state.image_types[idx] = st.session_state[f'image_type_{idx}']
+
+def get_image_analysis(timeout: float = 0) -> Optional[ImageAnalysis]:
+    """
+    Get the near-duplicates and best front cover of the current release's images
+
+    Reruns don't wait for the analysis by default; the gallery renders
+    without it until it is ready.
+
+    Args:
+        timeout: Seconds to wait for an analysis that is still running
+
+    Returns:
+        Optional[ImageAnalysis]: Analysis, or None if it isn't ready in time
+    """
+    future = get_release_jobs(st.session_state.get('api_response') or {}).image_analysis
+    if not timeout and not future.done():
+        return None
+    try:
+        return future.result(timeout=timeout)
+    except Exception:
+        return None
+
+def get_thumbnail(image: dict):
+    """
+    Get the thumbnail of a release image
+
+    Thumbnails the image analysis already downloaded are served from the
+    image cache; the others are left to the browser to load from Discogs,
+    so rendering the gallery never waits for downloads.
+
+    Returns:
+        bytes or str: Cached image data, or the thumbnail URL
+    """
+    url = image.get('uri150') or image['uri']
+    return get_cached_image(url) or url
+
+def select_artwork(idx: int):
+    """Select an image as artwork for the ID3 tags"""
+    st.session_state.selected_artwork_index = idx
+    st.session_state.selected_artwork = st.session_state.discogs_images[idx]['uri']
+    st.session_state.artwork_selection = str(idx)
+
+def get_artwork_data(image_url: str, headers: dict = None) -> bytes:
+    """Get artwork data from URL, sized by the artwork settings for embedding"""
+    return fetch_artwork(
+        image_url,
+        st.session_state.get('artwork_max_size', ARTWORK_MAX_SIZE),
+        st.session_state.get('artwork_quality', ARTWORK_QUALITY),
+        headers=headers
+    )
 
 def save_selected_images():
     """Save all images that have a type selected"""
@@ -40,16 +104,31 @@ def save_selected_images():
         return
 
     folder_name = f"{st.session_state.label} {st.session_state.catalog} - {st.session_state.artist} - {st.session_state.title}"
-    saved_count = 0
-    
-    for idx, image in enumerate(st.session_state.discogs_images):
-        selected_type = st.session_state.get(f'image_type_{idx}')
-        if selected_type and selected_type != 'Select image type':
-            if save_image(image['uri'], folder_name, selected_type):
-                saved_count += 1
-    
-    if saved_count > 0:
-        st.toast(f"Successfully saved {saved_count} images", icon="✅")
+    images = [
+        (image['uri'], st.session_state.image_types[idx])
+        for idx, image in enumerate(st.session_state.discogs_images)
+        if st.session_state.image_types.get(idx, 'Select image type') != 'Select image type'
+    ]
+    if not images:
+        st.warning('Select the type of the images to save first')
+        return
+
+    # Downloads run in parallel, progress is reported in one status element
+    with st.status(f'Saving {len(images)} images...') as status:
+        progress = st.progress(0.0)
+
+        def on_progress(done, total, image_type, error):
+            progress.progress(done / total, text=f'{done} of {total} images')
+            if error:
+                st.write(f'❌ {image_type}: {error}')
+
+        failed = save_images(images, folder_name, on_progress)
+        saved_count = len(images) - len(failed)
+        status.update(
+            label=f'Saved {saved_count} of {len(images)} images',
+            state='error' if failed else 'complete',
+            expanded=bool(failed)
+        )
 
 def on_artwork_select():
     """Handle artwork selection change"""
@@ -74,6 +153,12 @@ def render_image_gallery():
             st.info('Load an album from Discogs to see its images')
             return
             
+        # Near-duplicates and the best front cover are found in the background
+        analysis = get_image_analysis()
+        duplicate_of = analysis.get_duplicate_of() if analysis else {}
+        if st.session_state.selected_artwork is None and analysis and analysis.best_front is not None:
+            select_artwork(analysis.best_front)
+
         # Create radio options for artwork selection
         artwork_options = {str(i): f"Image {i+1}" for i in range(len(st.session_state.discogs_images))}
         selected = st.radio(
@@ -85,33 +170,56 @@ def render_image_gallery():
             horizontal=True
         )
             
+        # Image sizes come from the API or are probed in parallel by the fetch pipeline
+        image_sizes = get_release_jobs(st.session_state.get('api_response') or {}).image_sizes
+
+        # Near-duplicates are collapsed into their best scan unless shown
+        images = list(enumerate(st.session_state.discogs_images))
+        if duplicate_of:
+            show_duplicates = st.toggle(
+                f'Show {len(duplicate_of)} near-duplicate images',
+                key='gallery_show_duplicates'
+            )
+            if not show_duplicates:
+                images = [(idx, image) for idx, image in images if idx not in duplicate_of]
+        similar_counts = {}
+        for best in duplicate_of.values():
+            similar_counts[best] = similar_counts.get(best, 0) + 1
+
+        # Only one page of thumbnails is rendered for releases with many scans
+        count = len(images)
+        if count > GALLERY_PAGE_SIZE:
+            start = st.radio(
+                'Images',
+                options=range(0, count, GALLERY_PAGE_SIZE),
+                format_func=lambda i: f"{i + 1}-{min(i + GALLERY_PAGE_SIZE, count)}",
+                key='gallery_page',
+                horizontal=True
+            )
+            images = images[start:start + GALLERY_PAGE_SIZE]
+
         # Create 4 columns for the image grid
         cols = st.columns(4)
         
         # Distribute images across columns
-        for idx, image in enumerate(st.session_state.discogs_images):
-            col_idx = idx % 4  # Cycle through columns
+        for position, (idx, image) in enumerate(images):
+            col_idx = position % 4  # Cycle through columns
             
             with cols[col_idx]:
                 # Get image dimensions
-                try:
-                    headers = {
-                        'User-Agent': 'AlbumCategorizer/1.0'
-                    }
-                    response = requests.get(image['uri'], headers=headers)
-                    
-                    img = Image.open(BytesIO(response.content))
-                    width, height = img.size
-                    resolution_text = f' ({width}x{height})'
-                except Exception as e:
-                    resolution_text = ''
+                size = image_sizes[idx].result() if idx < len(image_sizes) else None
+                resolution_text = f' ({size[0]}x{size[1]})' if size else ''
                 
-                # Display image with caption and resolution if available
-                caption = image.get('type', '').title() + resolution_text
-                st.image(
-                    image['uri'],
-                    caption=caption
-                )
+                # Display the thumbnail with caption and resolution if available
+                caption = f"Image {idx + 1}: " + image.get('type', '').title() + resolution_text
+                if idx in duplicate_of:
+                    caption += f' · duplicate of Image {duplicate_of[idx] + 1}'
+                elif idx in similar_counts:
+                    caption += f' · +{similar_counts[idx]} similar'
+                if analysis and idx == analysis.best_front:
+                    caption += ' · best front'
+                st.image(get_thumbnail(image), caption=caption)
+                st.markdown(f"[Full size]({image['uri']})")
                 
                 # Add type selector and save button
                 col1, col2 = st.columns([2, 1], vertical_alignment="bottom")
@@ -121,7 +229,10 @@ def render_image_gallery():
                     selected_type = st.selectbox(
                         'Image Type',
                         options=IMAGE_TYPES,
-                        key=type_key
+                        index=IMAGE_TYPES.index(st.session_state.image_types.get(idx, IMAGE_TYPES[0])),
+                        key=type_key,
+                        on_change=on_image_type_change,
+                        args=(idx,)
                     )
                 
                 with col2:
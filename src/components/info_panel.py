@@ -6,11 +6,44 @@ from ..transformations.info import (
     transform_info_artist,
     transform_info_label,
     transform_info_format,
-    transform_info_notes,
     transform_info_url,
-    transform_info_tracklist
+    ReleaseSnapshot,
+    build_release_snapshot,
+    get_snapshot_key,
+    format_info_file,
+    get_release_info
 )
-from ..utils.file_operations import create_info_file
+from ..api.export_registry import record_export
+from ..api.fetch_pipeline import get_release_jobs
+from ..utils.file_operations import create_info_file, get_info_file_path
+
+def get_release_snapshot(force: bool = False) -> ReleaseSnapshot:
+    """
+    Get the derived info fields of the current release
+
+    The snapshot is computed when a release is fetched and reused on every
+    rerun; it is only rebuilt when the release or its inputs change. The
+    artist lookups it needs run in the background fetch pipeline.
+
+    Args:
+        force: Rebuild even if the stored snapshot is still current
+
+    Returns:
+        ReleaseSnapshot: Snapshot for the current release
+    """
+    api_response = st.session_state.get('api_response') or {}
+    notes = st.session_state.get('original_notes', '')
+    artists_sort = st.session_state.get('original_artists_sort', '')
+    format_descriptions = st.session_state.get('original_format_descriptions', []) or []
+
+    snapshot = st.session_state.get('release_snapshot')
+    key = get_snapshot_key(api_response, notes, artists_sort, format_descriptions)
+    if force or snapshot is None or snapshot.key != key:
+        with st.spinner('Fetching artist details...'):
+            artist_details = get_release_jobs(api_response).artist_details.result()
+            snapshot = build_release_snapshot(api_response, notes, artists_sort, format_descriptions, artist_details)
+        st.session_state.release_snapshot = snapshot
+    return snapshot
 
 def render_track_editor(track: dict, index: int) -> dict:
     """
@@ -103,6 +136,12 @@ def render_info_panel():
     with st.container():
         st.subheader('Album Information')
 
+        # Network-derived fields are computed once per release, not on every rerun
+        snapshot = get_release_snapshot()
+
+        # Store credit line in session state for use in comment field
+        st.session_state.info_credit_line = snapshot.credit_line
+
         # Main grid
         main_col1, main_sep, main_col2 = st.columns([20, 1, 20])
 
@@ -206,12 +245,7 @@ def render_info_panel():
             notes_label = st.session_state.get('original_notes', '')
             info_notes = st.text_area(
                 f"Notes / API: {notes_label}" if notes_label else "Notes",
-                value=transform_info_notes(
-                    st.session_state.get('original_notes', ''),
-                    st.session_state.get('original_artists_sort', ''),
-                    st.session_state.get('original_format_descriptions', []),
-                    st.session_state.get('api_response', {})
-                ),
+                value=snapshot.notes,
                 key='info_notes',
                 height=202
             )
@@ -220,14 +254,9 @@ def render_info_panel():
             st.markdown('#### Tracklist')
             
             # Initialize or update tracklist in session state
-            api_response = st.session_state.get('api_response', {})
-            if 'tracklist' not in st.session_state or api_response != st.session_state.get('last_api_response'):
-                tracklist_data = transform_info_tracklist(
-                    api_response.get('tracklist', []),
-                    st.session_state.get('info_artist', '')  # Pass the album artist
-                )
-                st.session_state.tracklist = tracklist_data
-                st.session_state.last_api_response = api_response
+            if 'tracklist' not in st.session_state or snapshot.key != st.session_state.get('tracklist_snapshot_key'):
+                st.session_state.tracklist = [dict(track) for track in snapshot.tracklist]
+                st.session_state.tracklist_snapshot_key = snapshot.key
             
             # Edit existing tracks
             updated_tracklist = []
@@ -243,58 +272,19 @@ def render_info_panel():
             st.markdown("<div class='separator'> </div>", unsafe_allow_html=True)
         
         with main_col2:
-            # Format multi-line notes with proper indentation
-            notes_content = st.session_state.info_notes.split('\n')
-            formatted_notes = 'Notes:     ' + notes_content[0]
-            if len(notes_content) > 1:
-                formatted_notes += '\n' + '\n'.join('           ' + line for line in notes_content[1:])
-
-            # Display the template
-            info_file_template = f"""{st.session_state.info_artist} - {st.session_state.info_title}
-
-Label:     {st.session_state.info_label}
-Catalog#:  {st.session_state.info_catalog}
-Format:    {st.session_state.info_format}
-Country:   {st.session_state.info_country}
-Released:  {st.session_state.info_released}
-Style:     {st.session_state.info_style}
-{formatted_notes}
-Discogs:   {transform_info_url(st.session_state.discogs_url)}
-
-Tracklist:"""
-
-            # Calculate the length of the longest title line
-            max_line_length = 0
-            for track in st.session_state.tracklist:
-                line_length = len(f"{track['position']}. ")
-                if track['artist']:
-                    line_length += len(track['artist']) + 3  # +3 for " - "
-                line_length += len(track['title'])
-                max_line_length = max(max_line_length, line_length)
-            
-            # Add 4 spaces padding after the longest line
-            duration_position = max_line_length + 4
-
-            # Add tracks to template
-            for track in st.session_state.tracklist:
-                # Start with position and title
-                line = f"\n{track['position']}. "
-                if track['artist']:
-                    line += f"{track['artist']} - "
-                line += track['title']
-                
-                # Add padding to align duration
-                if track['duration']:
-                    current_length = len(line)
-                    padding = " " * (duration_position - current_length)
-                    line += f"{padding}{track['duration']}"
-                
-                info_file_template += line
-                
-                # Add extra artists
-                for extra in track['extra_artists']:
-                    if extra['role'] and extra['name']:
-                        info_file_template += f"\n    {extra['role']} - {extra['name']}"
+            # Render the info file from the fields above
+            info_file_template = format_info_file({
+                'artist': st.session_state.info_artist,
+                'title': st.session_state.info_title,
+                'label': st.session_state.info_label,
+                'catalog': st.session_state.info_catalog,
+                'format': st.session_state.info_format,
+                'country': st.session_state.info_country,
+                'released': st.session_state.info_released,
+                'style': st.session_state.info_style,
+                'notes': st.session_state.info_notes,
+                'discogs_url': transform_info_url(st.session_state.discogs_url)
+            }, st.session_state.tracklist)
 
             # Preview section
             st.text_area(
@@ -339,6 +329,16 @@ Tracklist:"""
                 ): 
                     # Get folder name from session state
                     folder_name = f"{st.session_state.label} {st.session_state.catalog} - {st.session_state.artist} - {st.session_state.title}"
-                    create_info_file(folder_name, info_file_template)
+                    if create_info_file(folder_name, info_file_template):
+                        # Remember the export so the release watcher can refresh it
+                        api_response = st.session_state.api_response
+                        fields, tracklist = get_release_info(api_response, snapshot.artist_details)
+                        record_export(
+                            api_response.get('id'),
+                            folder_name,
+                            get_info_file_path(folder_name),
+                            {**fields, 'tracklist': tracklist},
+                            info_file_template
+                        )
     
     st.markdown("<div class='separator-line'> </div>", unsafe_allow_html=True)
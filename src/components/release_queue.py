@@ -0,0 +1,76 @@
+"""
+Release queue component
+"""
+import streamlit as st
+from ..api.prefetch_queue import (
+    STATUS_READY,
+    enqueue_releases,
+    get_prefetch_status,
+    is_prefetch_stale,
+    parse_release_ids
+)
+
+def get_release_url(release_id: str) -> str:
+    """Get the Discogs URL of a release"""
+    return f"https://www.discogs.com/release/{release_id}"
+
+def on_add_to_queue():
+    """Queue the pasted releases for prefetching"""
+    release_ids = parse_release_ids(st.session_state.get('release_queue_input', ''))
+    queued = st.session_state.release_queue
+    queued.extend(release_id for release_id in release_ids if release_id not in queued)
+    enqueue_releases(release_ids, st.session_state.get('discogs_token'))
+    st.session_state.release_queue_input = ''
+
+def on_load_next():
+    """Put the next prefetched release into the URL input and drop it from the queue"""
+    for release_id in st.session_state.release_queue:
+        if get_prefetch_status(release_id)['status'] == STATUS_READY:
+            st.session_state.release_queue.remove(release_id)
+            st.session_state.url_input = get_release_url(release_id)
+            return
+
+def render_release_queue():
+    """Render the release queue"""
+    if 'release_queue' not in st.session_state:
+        st.session_state.release_queue = []
+
+    queue = st.session_state.release_queue
+    with st.expander(f"📋 Release Queue ({len(queue)})" if queue else "📋 Release Queue"):
+        st.text_area(
+            label="Releases",
+            placeholder="Paste Discogs release URLs or IDs, one per line",
+            help="Queued releases are fetched in the background while you work on the current one",
+            key="release_queue_input"
+        )
+
+        statuses = {release_id: get_prefetch_status(release_id) for release_id in queue}
+        # Releases the prefetch queue has forgotten, or whose prefetch expired, are fetched again
+        enqueue_releases(
+            [release_id for release_id, status in statuses.items() if is_prefetch_stale(status)],
+            st.session_state.get('discogs_token')
+        )
+        ready = sum(1 for status in statuses.values() if status['status'] == STATUS_READY)
+
+        col1, col2, col3 = st.columns([4, 4, 13])
+        with col1:
+            st.button("Add to Queue", on_click=on_add_to_queue, use_container_width=True)
+        with col2:
+            st.button(
+                f"Load Next ({ready})",
+                type="primary",
+                on_click=on_load_next,
+                disabled=not ready,
+                use_container_width=True
+            )
+
+        if queue:
+            st.dataframe(
+                [{
+                    'Release': release_id,
+                    'Status': status['status'],
+                    'Details': status.get('title') or status.get('error', '')
+                } for release_id, status in statuses.items()],
+                hide_index=True,
+                use_container_width=True
+            )
@@ -0,0 +1,52 @@
+"""
+Request telemetry component
+"""
+import streamlit as st
+from ..api.discogs import DISCOGS_API_URL
+from ..api.telemetry import get_records, summarize_records
+from ..transformations.info import collect_artist_resources
+
+def get_release_urls(api_response: dict) -> set[str]:
+    """Get every URL requested to show a release: the release, its artists and its images"""
+    urls = {f"{DISCOGS_API_URL}/releases/{api_response.get('id')}"}
+    urls.update(collect_artist_resources(api_response).values())
+    for image in api_response.get('images', []):
+        urls.update(url for url in (image.get('uri'), image.get('uri150')) if url)
+    return urls
+
+def render_request_summary(api_response: dict, since: float = None):
+    """
+    Render the requests and cache lookups made for the current release
+
+    Args:
+        api_response: Current release
+        since: Unix time the release started loading; earlier requests for the
+            same URLs, from other loads or sessions, aren't counted
+    """
+    records = get_records(get_release_urls(api_response), since)
+    if not records:
+        return
+
+    rows = summarize_records(records)
+    requests_made = sum(row['requests'] for row in rows)
+    cache_hits = sum(row['cache_hits'] for row in rows)
+    remaining = next((item.ratelimit_remaining for item in reversed(records) if item.ratelimit_remaining is not None), None)
+    st.caption(
+        f"{requests_made} requests, {cache_hits} cache hits"
+        + (f", {remaining} API requests left in the current window" if remaining is not None else "")
+    )
+    st.dataframe(
+        [{
+            'Endpoint': row['endpoint'],
+            'Requests': row['requests'],
+            'Cache Hits': row['cache_hits'],
+            'Retries': row['retries'],
+            '429s': row['throttled'],
+            'Errors': row['errors'],
+            'Total ms': round(row['total_ms'], 1),
+            'Max ms': round(row['max_ms'], 1),
+            'KB': round(row['bytes'] / 1024, 1)
+        } for row in rows],
+        hide_index=True,
+        use_container_width=True
+    )
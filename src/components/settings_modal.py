@@ -5,12 +5,21 @@ import streamlit as st
 from typing import Tuple
 import os
 from dotenv import load_dotenv
+from ..api.image_cache import get_image_cache_stats
+from ..api.release_cache import get_cache_stats
+from ..api.telemetry import get_latency_summary
+from ..utils.artwork import ARTWORK_MAX_SIZE, ARTWORK_QUALITY
+from ..utils.memory_cache import get_memory_cache_stats, clear_memory_caches
 
 def init_settings():
     """Initialize settings related session state variables and load from .env"""
     # Initialize session state variables if not exist
     if 'discogs_token' not in st.session_state:
         st.session_state.discogs_token = ''
+    if 'artwork_max_size' not in st.session_state:
+        st.session_state.artwork_max_size = ARTWORK_MAX_SIZE
+    if 'artwork_quality' not in st.session_state:
+        st.session_state.artwork_quality = ARTWORK_QUALITY
     
     # Load from .env if exists
     load_dotenv()
@@ -18,6 +27,63 @@ def init_settings():
     if os.getenv('DISCOGS_TOKEN'):
         st.session_state.discogs_token = os.getenv('DISCOGS_TOKEN')
 
+def render_artwork_settings() -> None:
+    """Render the size and quality of artwork embedded in audio files"""
+    st.markdown('#### 🖼️ Embedded Artwork')
+    st.session_state.artwork_max_size = st.number_input(
+        'Max size (px, 0 keeps the original)',
+        min_value=0,
+        max_value=5000,
+        step=100,
+        value=st.session_state.artwork_max_size,
+        key='settings_artwork_max_size_input'
+    )
+    st.session_state.artwork_quality = st.slider(
+        'JPEG quality',
+        min_value=50,
+        max_value=95,
+        value=st.session_state.artwork_quality,
+        key='settings_artwork_quality_input'
+    )
+
+def render_cache_settings() -> None:
+    """Render memory cache statistics and the clear button"""
+    st.markdown('#### 🗄️ Cache')
+    st.caption('In-memory caches shared by every session of this server')
+
+    cache_stats = get_memory_cache_stats()
+    if cache_stats:
+        st.dataframe(cache_stats, hide_index=True, use_container_width=True)
+    else:
+        st.info('Caches are empty')
+
+    release_stats = get_cache_stats()
+    st.caption(
+        f"Release cache on disk: {release_stats['releases']} releases, "
+        f"{release_stats['hit']} hits, {release_stats['miss']} misses, "
+        f"{release_stats['revalidated']} revalidated"
+    )
+    image_stats = get_image_cache_stats()
+    st.caption(
+        f"Image cache on disk: {image_stats['images']} images, "
+        f"{image_stats['size_mb']} of {image_stats['max_mb']:g} MB"
+    )
+
+    if st.button('Clear Memory Caches', key='clear_memory_caches_btn', use_container_width=True):
+        clear_memory_caches()
+        st.toast('Memory caches cleared', icon='✅')
+
+def render_request_stats() -> None:
+    """Render request latency histograms"""
+    st.markdown('#### 📈 Requests')
+    st.caption('Requests and cache lookups since this server started')
+
+    latency_summary = get_latency_summary()
+    if latency_summary:
+        st.dataframe(latency_summary, hide_index=True, use_container_width=True)
+    else:
+        st.info('No requests yet')
+
 def render_settings() -> None:
     """Render the settings popover"""
     with st.popover('⚙️ Settings', use_container_width=True):
@@ -38,6 +104,10 @@ def render_settings() -> None:
         )
         st.session_state.discogs_token = discogs_token
         
+        render_artwork_settings()
+        render_cache_settings()
+        render_request_stats()
+
         st.markdown('---')
         st.markdown("""
         💡 **Tip**: You can also set these values in a `.env` file:
@@ -13,6 +13,8 @@ from io import BytesIO
 import tempfile
 import os
 from .image_gallery import get_artwork_data
+from ..utils.audio_tags import AudioFileInfo
+from ..utils.tag_cache import get_audio_info
 
 # Define ordered list of common ID3 tags
 ORDERED_TAGS = [
@@ -51,172 +53,41 @@ def format_duration(seconds: float) -> str:
     remaining_seconds = int(seconds % 60)
     return f"{minutes:02d}:{remaining_seconds:02d}"
 
-def get_audio_length(uploaded_file) -> str:
+def read_uploaded_file(uploaded_file) -> AudioFileInfo:
     """
-    Get audio file length in MM:SS format
-    
+    Read tags, artwork and length of an uploaded file from memory
+
+    Files are parsed once per upload; see start_tag_reads.
+
     Args:
         uploaded_file: Streamlit UploadedFile object
-        
+
     Returns:
-        str: Audio length in MM:SS format
+        AudioFileInfo: Result of a single parse
     """
-    # Create a temporary file
-    with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(uploaded_file.name)[1]) as tmp_file:
-        # Write the uploaded file to the temporary file
-        tmp_file.write(uploaded_file.getvalue())
-        tmp_file.flush()
-        
-        try:
-            # Try as MP3 first
-            audio = MP3(tmp_file.name)
-            return format_duration(audio.info.length)
-        except:
-            try:
-                # Try generic audio file
-                audio = File(tmp_file.name)
-                if audio is not None and hasattr(audio.info, 'length'):
-                    return format_duration(audio.info.length)
-            except:
-                pass
-        finally:
-            # Clean up the temporary file
-            try:
-                os.unlink(tmp_file.name)
-            except:
-                pass
-                
-    return ''
-
-def get_artwork_data_from_file(uploaded_file) -> Optional[bytes]:
-    """Get artwork image data from uploaded file"""
-    # Create a temporary file
-    with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(uploaded_file.name)[1]) as tmp_file:
-        # Write the uploaded file to the temporary file
-        tmp_file.write(uploaded_file.getvalue())
-        tmp_file.flush()
-        
-        try:
-            id3 = ID3(tmp_file.name)
-            for tag in id3.getall('APIC'):
-                if tag.type == 3:  # Front cover
-                    return tag.data
-        except:
-            pass
-        finally:
-            # Clean up the temporary file
-            try:
-                os.unlink(tmp_file.name)
-            except:
-                pass
-    return None
+    return get_audio_info(uploaded_file)
 
-def get_all_id3_tags(uploaded_file) -> Dict[str, str]:
+def get_all_id3_tags(uploaded_file, audio_info: Optional[AudioFileInfo] = None) -> Dict[str, str]:
     """
     Get all available tags from an audio file
     
     Args:
         uploaded_file: Streamlit UploadedFile object
+        audio_info: Already parsed file, read from uploaded_file if not given
         
     Returns:
-        Dict[str, str]: Dictionary of all available tags
+        Dict[str, str]: Dictionary of all available tags, plus 'artwork'
+        (bytes) and 'length' if present
     """
-    tags = {}
-    
-    # Create a temporary file
-    with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(uploaded_file.name)[1]) as tmp_file:
-        # Write the uploaded file to the temporary file
-        tmp_file.write(uploaded_file.getvalue())
-        tmp_file.flush()
-        
-        try:
-            # Check if file is FLAC
-            if uploaded_file.name.lower().endswith('.flac'):
-                from mutagen.flac import FLAC
-                audio = FLAC(tmp_file.name)
-                
-                # Map FLAC tags to our standard format
-                tag_mapping = {
-                    'TITLE': 'title',
-                    'ARTIST': 'artist',
-                    'ALBUM': 'album',
-                    'ALBUMARTIST': 'albumartist',
-                    'DATE': 'date',
-                    'GENRE': 'genre',
-                    'TRACKNUMBER': 'tracknumber',
-                    'DISCNUMBER': 'discnumber',
-                    'ORGANIZATION': 'organization',
-                    'COPYRIGHT': 'copyright',
-                    'DESCRIPTION': 'comment'
-                }
-                
-                # Convert FLAC tags to our standard format
-                for flac_key, value in audio.tags.items():
-                    standard_key = tag_mapping.get(flac_key.upper(), flac_key.lower())
-                    if value:  # Only include non-empty tags
-                        tags[standard_key] = value[0]
-                
-                # Handle artwork separately
-                if audio.pictures:
-                    for pic in audio.pictures:
-                        if pic.type == 3:  # Front cover
-                            tags['artwork'] = pic.data
-                            break
-                
-                # Get length
-                if audio.info.length:
-                    tags['length'] = format_duration(audio.info.length)
-                    
-            else:
-                # Existing ID3 tag handling code
-                try:
-                    # Try to load as ID3 for standard tags
-                    audio = EasyID3(tmp_file.name)
-                    # Get all available tags
-                    for key in audio.valid_keys.keys():
-                        value = audio.get(key, [''])[0]
-                        if value:  # Only include non-empty tags
-                            tags[key] = value
-                            
-                    # Load full ID3 tags for artwork and comments
-                    id3 = ID3(tmp_file.name)
-                    
-                    # Try to get artwork
-                    artwork_data = get_artwork_data_from_file(uploaded_file)
-                    if artwork_data:
-                        tags['artwork'] = artwork_data
-                        
-                    # Try to get comments
-                    for tag in id3.getall('COMM'):
-                        if tag.lang == 'eng':  # Get English comments
-                            tags['comment'] = tag.text[0]
-                            break
-                            
-                except Exception as e:
-                    st.error(f"Error reading tags: {str(e)}")
-                    try:
-                        # If not ID3, try generic tag support
-                        audio = File(tmp_file.name, easy=True)
-                        if audio is not None and hasattr(audio, 'tags'):
-                            tags = {key: str(value[0]) for key, value in audio.tags.items() if value}
-                    except:
-                        pass
-                
-                # Try to get length separately
-                try:
-                    length = get_audio_length(uploaded_file)
-                    if length:
-                        tags['length'] = length
-                except:
-                    pass
-                    
-        finally:
-            # Clean up the temporary file
-            try:
-                os.unlink(tmp_file.name)
-            except:
-                pass
-                
+    audio_info = audio_info or read_uploaded_file(uploaded_file)
+    if audio_info.error:
+        st.error(audio_info.error)
+
+    tags = dict(audio_info.tags)
+    if audio_info.artwork:
+        tags['artwork'] = audio_info.artwork
+    if audio_info.length:
+        tags['length'] = format_duration(audio_info.length)
     return tags
 
 def edit_tags(uploaded_file, edited_tags: Dict[str, str]) -> Tuple[bool, str]:
@@ -393,8 +264,9 @@ def render_tag_editor(uploaded_file, track_info: Optional[Dict] = None) -> Optio
     
     tags_col1, tags_sep, tags_col2 = st.columns([20, 1, 20])
 
-    # Get current tags from file
-    current_tags = get_all_id3_tags(uploaded_file)
+    # Tags, artwork and length come from the tag cache
+    audio_info = read_uploaded_file(uploaded_file)
+    current_tags = get_all_id3_tags(uploaded_file, audio_info)
 
     with tags_col1:
         st.markdown("##### Current Tags")
@@ -439,9 +311,8 @@ def render_tag_editor(uploaded_file, track_info: Optional[Dict] = None) -> Optio
             }
         
         # Add file length to suggested tags
-        length = get_audio_length(uploaded_file)
-        if length:
-            suggested_tags['length'] = length
+        if audio_info.length:
+            suggested_tags['length'] = format_duration(audio_info.length)
             
         st.markdown("##### Suggested Tags")
         
@@ -3,11 +3,53 @@ URL input component
 """
 import streamlit as st
 from ..api.discogs import fetch_discogs_data
+from ..api.release_index import search_releases
 from ..utils.file_operations import create_album_folder
 
+def format_search_result(result: dict) -> str:
+    """Format a release search result for the results list"""
+    label = ' '.join(part for part in [result['label'], result['catno']] if part)
+    return f"{result['artist']} - {result['title']} [{label}] ({result['release_id']})"
+
+def on_search_result_select():
+    """Put the URL of the selected search result into the URL input"""
+    release_id = st.session_state.get('release_search_result')
+    if release_id:
+        st.session_state.url_input = f"https://www.discogs.com/release/{release_id}"
+
+def render_release_search():
+    """Render the local release search box"""
+    col1, col2 = st.columns([8, 13], vertical_alignment="bottom")
+
+    with col1:
+        query = st.text_input(
+            label="Search Releases",
+            placeholder="Artist, title, label, catalog# or barcode",
+            help="Search releases that were fetched before or imported from a Discogs data dump",
+            key="release_search_query"
+        )
+
+    results = search_releases(query) if query else []
+    result_labels = {result['release_id']: format_search_result(result) for result in results}
+
+    with col2:
+        st.selectbox(
+            label=f"Results ({len(results)})" if query else "Results",
+            options=list(result_labels.keys()),
+            format_func=lambda release_id: result_labels[release_id],
+            index=None,
+            placeholder="Select a release..." if results else "No matching releases",
+            disabled=not results,
+            key="release_search_result",
+            on_change=on_search_result_select
+        )
+
 def render_url_input():
     """Render the URL input component"""
 
+    # Search releases known locally instead of pasting a URL
+    render_release_search()
+
     # Main grid
     col1, col2 = st.columns([16, 5], vertical_alignment="bottom")
 
@@ -5,12 +5,16 @@ from .folder import (
     transform_artist,
     transform_catalog,
     transform_label,
-    transform_title
+    transform_title,
+    transform_folder_fields,
+    transform_folder_name
 )
 
 __all__ = [
     'transform_artist',
     'transform_catalog',
     'transform_label',
-    'transform_title'
+    'transform_title',
+    'transform_folder_fields',
+    'transform_folder_name'
 ]
@@ -5,10 +5,13 @@ from .artist import transform_artist
 from .catalog import transform_catalog
 from .label import transform_label
 from .title import transform_title
+from .folder_name import transform_folder_fields, transform_folder_name
 
 __all__ = [
     'transform_artist',
     'transform_catalog',
     'transform_label',
-    'transform_title'
+    'transform_title',
+    'transform_folder_fields',
+    'transform_folder_name'
 ]
@@ -0,0 +1,44 @@
+"""
+Folder name of a release
+"""
+from .artist import transform_artist
+from .catalog import transform_catalog
+from .label import transform_label
+from .title import transform_title
+
+def transform_folder_fields(data: dict) -> dict:
+    """
+    Transform the folder name fields of a release, as filled in after a fetch
+
+    Args:
+        data: Release JSON from Discogs API
+
+    Returns:
+        dict: Transformed 'label', 'catalog', 'artist' and 'title'
+    """
+    labels = data.get('labels') or [{}]
+    formats = data.get('formats') or [{}]
+    raw_label = labels[0].get('name', '')
+    raw_catalog = labels[0].get('catno', '')
+    input_artist = ' & '.join(artist.get('anv') or artist.get('name', '') for artist in data.get('artists', []))
+    format_descriptions = formats[0].get('descriptions', [])
+
+    return {
+        'label': transform_label(raw_label),
+        'catalog': transform_catalog(raw_catalog, raw_label),
+        'artist': transform_artist(input_artist, format_descriptions),
+        'title': transform_title(data.get('title', ''), format_descriptions, input_artist)
+    }
+
+def transform_folder_name(data: dict) -> str:
+    """
+    Transform a release into its folder name
+
+    Args:
+        data: Release JSON from Discogs API
+
+    Returns:
+        str: Folder name in the format 'Label Catalog# - Artist - Title'
+    """
+    fields = transform_folder_fields(data)
+    return f"{fields['label']} {fields['catalog']} - {fields['artist']} - {fields['title']}"
@@ -4,15 +4,26 @@ Info panel specific transformations
 from .artist import transform_info_artist
 from .label import transform_info_label
 from .format import transform_info_format
-from .notes import transform_info_notes
+from .notes import transform_info_notes, transform_info_credit_line
 from .url import transform_info_url
 from .tracklist import transform_info_tracklist
+from .artist_details import collect_artist_resources, resolve_artist_details
+from .snapshot import ReleaseSnapshot, build_release_snapshot, get_snapshot_key
+from .info_file import format_info_file, get_release_info
 
 __all__ = [
     'transform_info_artist',
     'transform_info_label',
     'transform_info_format',
     'transform_info_notes',
+    'transform_info_credit_line',
     'transform_info_url',
-    'transform_info_tracklist'
+    'transform_info_tracklist',
+    'collect_artist_resources',
+    'resolve_artist_details',
+    'ReleaseSnapshot',
+    'build_release_snapshot',
+    'get_snapshot_key',
+    'format_info_file',
+    'get_release_info'
 ]
@@ -0,0 +1,60 @@
+"""
+Artist detail lookups shared by the notes and tracklist transformations
+"""
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Dict, List, Optional
+from ...api.artist_resolver import get_artist_details
+from ...api.rate_limiter import PRIORITY_INTERACTIVE
+
+# Parallel artist lookups; the shared rate limiter still caps the request rate
+MAX_ARTIST_WORKERS = 8
+
+def collect_artist_resources(api_response: Optional[Dict]) -> Dict[str, str]:
+    """
+    Collect every artist the info transformations look up
+
+    These are the release artists (used in the notes credit line) and the
+    Remix credits of every track (used in the tracklist).
+
+    Args:
+        api_response: Full Discogs API response
+
+    Returns:
+        Dict[str, str]: Resource URL for each artist ID
+    """
+    if not api_response:
+        return {}
+
+    artists: List[Dict] = list(api_response.get('artists', []))
+    for track in api_response.get('tracklist', []):
+        artists.extend(
+            extra for extra in track.get('extraartists', [])
+            if extra.get('role') == 'Remix'
+        )
+
+    resources = {}
+    for artist in artists:
+        if artist.get('name') and artist.get('resource_url'):
+            artist_id = str(artist.get('id') or artist['resource_url'])
+            resources.setdefault(artist_id, artist['resource_url'])
+    return resources
+
+def resolve_artist_details(resources: Dict[str, str], priority: int = PRIORITY_INTERACTIVE) -> Dict[str, tuple[str, list[str]]]:
+    """
+    Fetch details for several artists concurrently
+
+    Args:
+        resources: Resource URL for each artist ID, as returned by collect_artist_resources
+        priority: PRIORITY_INTERACTIVE or PRIORITY_BACKGROUND
+
+    Returns:
+        Dict[str, tuple[str, list[str]]]: (realname, member names) for each resource URL
+    """
+    if not resources:
+        return {}
+
+    resource_urls = list(resources.values())
+    with ThreadPoolExecutor(max_workers=min(MAX_ARTIST_WORKERS, len(resource_urls))) as executor:
+        lookup = partial(get_artist_details, priority=priority)
+        return dict(zip(resource_urls, executor.map(lookup, resource_urls)))
@@ -0,0 +1,120 @@
+"""
+Info file rendering
+"""
+from .artist import transform_info_artist
+from .format import transform_info_format
+from .label import transform_info_label
+from .snapshot import build_release_snapshot
+from .url import transform_info_url
+
+def format_info_file(fields: dict, tracklist: list[dict]) -> str:
+    """
+    Render the info file of an album
+
+    Args:
+        fields: 'artist', 'title', 'label', 'catalog', 'format', 'country',
+            'released', 'style', 'notes' and 'discogs_url' as shown in the info panel
+        tracklist: Tracks with 'position', 'artist', 'title', 'duration' and 'extra_artists'
+
+    Returns:
+        str: Info file content
+    """
+    # Format multi-line notes with proper indentation
+    notes_content = fields['notes'].split('\n')
+    formatted_notes = 'Notes:     ' + notes_content[0]
+    if len(notes_content) > 1:
+        formatted_notes += '\n' + '\n'.join('           ' + line for line in notes_content[1:])
+
+    info_file = f"""{fields['artist']} - {fields['title']}
+
+Label:     {fields['label']}
+Catalog#:  {fields['catalog']}
+Format:    {fields['format']}
+Country:   {fields['country']}
+Released:  {fields['released']}
+Style:     {fields['style']}
+{formatted_notes}
+Discogs:   {fields['discogs_url']}
+
+Tracklist:"""
+
+    # Calculate the length of the longest title line
+    max_line_length = 0
+    for track in tracklist:
+        line_length = len(f"{track['position']}. ")
+        if track['artist']:
+            line_length += len(track['artist']) + 3  # +3 for " - "
+        line_length += len(track['title'])
+        max_line_length = max(max_line_length, line_length)
+
+    # Add 4 spaces padding after the longest line
+    duration_position = max_line_length + 4
+
+    # Add tracks to template
+    for track in tracklist:
+        # Start with position and title
+        line = f"\n{track['position']}. "
+        if track['artist']:
+            line += f"{track['artist']} - "
+        line += track['title']
+
+        # Add padding to align duration
+        if track['duration']:
+            current_length = len(line)
+            padding = " " * (duration_position - current_length)
+            line += f"{padding}{track['duration']}"
+
+        info_file += line
+
+        # Add extra artists
+        for extra in track['extra_artists']:
+            if extra['role'] and extra['name']:
+                info_file += f"\n    {extra['role']} - {extra['name']}"
+
+    return info_file
+
+def get_release_info(api_response: dict, artist_details: dict = None) -> tuple[dict, list[dict]]:
+    """
+    Get the info panel fields and tracklist of a release as filled in after a fetch
+
+    Args:
+        api_response: Full Discogs API response
+        artist_details: Already resolved artist details by resource URL;
+            resolved here when not given
+
+    Returns:
+        tuple[dict, list[dict]]: Fields and tracklist for format_info_file
+    """
+    labels = api_response.get('labels') or [{}]
+    formats = api_response.get('formats') or [{}]
+    format_descriptions = formats[0].get('descriptions', [])
+    snapshot = build_release_snapshot(
+        api_response,
+        api_response.get('notes', ''),
+        api_response.get('artists_sort', ''),
+        format_descriptions,
+        artist_details
+    )
+
+    fields = {
+        'artist': transform_info_artist(api_response.get('artists_sort', '')),
+        'title': api_response.get('title', ''),
+        'label': transform_info_label(labels[0].get('name', '')),
+        'catalog': labels[0].get('catno', ''),
+        'format': transform_info_format(
+            formats[0].get('qty', ''),
+            formats[0].get('name', ''),
+            format_descriptions,
+            formats[0].get('text', '')
+        ),
+        'country': api_response.get('country', ''),
+        'released': api_response.get('released', ''),
+        'style': ', '.join(api_response.get('styles', [])),
+        'notes': snapshot.notes,
+        'discogs_url': transform_info_url(api_response.get('uri') or f"https://www.discogs.com/release/{api_response.get('id', '')}")
+    }
+    tracklist = [
+        {**track, 'extra_artists': [dict(extra) for extra in track['extra_artists']]}
+        for track in snapshot.tracklist
+    ]
+    return fields, tracklist
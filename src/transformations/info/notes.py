@@ -2,47 +2,25 @@
 Info notes transformations
 """
 import re
-import requests
+from ...api.artist_resolver import get_artist_details
 
-DISCOGS_USER_AGENT = "AlbumCategorizer/1.0"
-
-def get_artist_details(resource_url: str) -> tuple[str, list[str]]:
-    """
-    Fetch artist's details from Discogs API
-    
-    Args:
-        resource_url: Artist's resource URL from Discogs API
-        
-    Returns:
-        Tuple of (realname, list of member names)
-    """
-    try:
-        headers = {'User-Agent': DISCOGS_USER_AGENT}
-        response = requests.get(resource_url, headers=headers)
-        response.raise_for_status()
-        artist_data = response.json()
-        
-        realname = artist_data.get('realname', '')
-        members = [member.get('name', '') for member in artist_data.get('members', [])]
-        # Filter out empty member names
-        members = [name for name in members if name]
-        
-        return realname, members
-    except:
-        return '', []
-
-def format_artist_with_details(artist_name: str, resource_url: str) -> str:
+def format_artist_with_details(artist_name: str, resource_url: str, artist_details: dict = None) -> str:
     """
     Format artist name with real name or member names if available
     
     Args:
         artist_name: Artist's display name
         resource_url: Artist's resource URL from Discogs API
+        artist_details: Already resolved details by resource URL; the artist is
+            fetched only when this is not given
         
     Returns:
         Formatted artist name, potentially with real name or members in parentheses
     """
-    realname, members = get_artist_details(resource_url)
+    if artist_details is not None:
+        realname, members = artist_details.get(resource_url, ('', []))
+    else:
+        realname, members = get_artist_details(resource_url)
     
     # If we have a realname and it's different from the artist name, use that
     if realname and realname.strip() != artist_name.strip():
@@ -70,21 +48,22 @@ def remove_bbcode_urls(text: str) -> str:
     pattern = r'\[url=.*?\](.*?)\[/url\]'
     return re.sub(pattern, r'\1', text)
 
-def transform_info_notes(notes: str, artist: str, format_descriptions: list[str], api_response: dict = None) -> str:
+def transform_info_credit_line(artist: str, format_descriptions: list[str], api_response: dict = None, artist_details: dict = None) -> str:
     """
-    Transform notes text based on format descriptions
+    Create the artist credit line used in the notes and the comment tag
     
     Args:
-        notes: Original notes text from API
         artist: Artist name (comma separated if multiple)
         format_descriptions: List of format descriptions from API
         api_response: Full Discogs API response containing artist details
+        artist_details: Already resolved artist details by resource URL
         
     Returns:
-        Transformed notes with artist credit line and URLs removed
+        Credit line like "Written & produced by Artist (Real Name).", or an
+        empty string if there is no artist
     """
     if not artist:
-        return remove_bbcode_urls(notes) if notes else ''
+        return ''
         
     # Check if 'Mixed' is in format descriptions
     is_mixed = any(desc.lower() == 'mixed' for desc in format_descriptions)
@@ -96,7 +75,7 @@ def transform_info_notes(notes: str, artist: str, format_descriptions: list[str]
             artist_name = artist_data.get('name', '')
             resource_url = artist_data.get('resource_url', '')
             if artist_name and resource_url:
-                formatted_artists.append(format_artist_with_details(artist_name, resource_url))
+                formatted_artists.append(format_artist_with_details(artist_name, resource_url, artist_details))
     
     # If we couldn't get formatted artists (e.g. no API response), use original artist string
     if not formatted_artists:
@@ -110,11 +89,26 @@ def transform_info_notes(notes: str, artist: str, format_descriptions: list[str]
         formatted_artist_string = 'Various Artists'
     
     # Create credit line based on format
-    credit_line = f"Mixed by {formatted_artist_string}." if is_mixed else f"Written & produced by {formatted_artist_string}."
+    return f"Mixed by {formatted_artist_string}." if is_mixed else f"Written & produced by {formatted_artist_string}."
+
+def transform_info_notes(notes: str, artist: str, format_descriptions: list[str], api_response: dict = None, artist_details: dict = None) -> str:
+    """
+    Transform notes text based on format descriptions
+    
+    Args:
+        notes: Original notes text from API
+        artist: Artist name (comma separated if multiple)
+        format_descriptions: List of format descriptions from API
+        api_response: Full Discogs API response containing artist details
+        artist_details: Already resolved artist details by resource URL
+        
+    Returns:
+        Transformed notes with artist credit line and URLs removed
+    """
+    if not artist:
+        return remove_bbcode_urls(notes) if notes else ''
     
-    # Store credit line in session state for use in comment field
-    import streamlit as st
-    st.session_state['info_credit_line'] = credit_line
+    credit_line = transform_info_credit_line(artist, format_descriptions, api_response, artist_details)
     
     # Combine credit line with original notes, removing URLs from notes
     if notes:
@@ -0,0 +1,97 @@
+"""
+Network-derived release fields, computed once per release
+"""
+import hashlib
+import json
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Mapping
+from .artist import transform_info_artist
+from .artist_details import collect_artist_resources, resolve_artist_details
+from .notes import transform_info_notes, transform_info_credit_line
+from .tracklist import transform_info_tracklist
+
+@dataclass(frozen=True)
+class ReleaseSnapshot:
+    """
+    Derived info panel state for one release and one set of inputs
+
+    Attributes:
+        key: Release ID and a fingerprint of the inputs the fields were computed from
+        notes: Transformed notes, including the credit line
+        credit_line: Artist credit line, also used for the comment tag
+        artist_details: Resolved (realname, members) by artist resource URL
+        tracklist: Transformed tracklist
+    """
+    key: tuple[str, str]
+    notes: str
+    credit_line: str
+    artist_details: Mapping[str, tuple]
+    tracklist: tuple
+
+def freeze(value: Any) -> Any:
+    """
+    Recursively convert dicts and lists into read-only mappings and tuples
+
+    Args:
+        value: Value to convert
+
+    Returns:
+        Read-only equivalent of the value
+    """
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+def get_snapshot_key(api_response: dict, notes: str, artists_sort: str, format_descriptions: list[str]) -> tuple[str, str]:
+    """
+    Get the key identifying a release and the inputs of its derived fields
+
+    Args:
+        api_response: Full or compact Discogs API response; the content
+            fingerprint of compact releases is part of the key
+        notes: Original notes text from API
+        artists_sort: Original sort artist name from API
+        format_descriptions: List of format descriptions from API
+
+    Returns:
+        tuple[str, str]: Release ID and input fingerprint
+    """
+    release_fingerprint = (api_response or {}).get('fingerprint', '')
+    inputs = json.dumps([release_fingerprint, notes, artists_sort, list(format_descriptions or [])], ensure_ascii=False)
+    fingerprint = hashlib.sha1(inputs.encode('utf-8')).hexdigest()
+    return str((api_response or {}).get('id', '')), fingerprint
+
+def build_release_snapshot(api_response: dict, notes: str, artists_sort: str, format_descriptions: list[str], artist_details: dict = None) -> ReleaseSnapshot:
+    """
+    Resolve artists and compute every network-derived info field of a release
+
+    Args:
+        api_response: Full Discogs API response
+        notes: Original notes text from API
+        artists_sort: Original sort artist name from API
+        format_descriptions: List of format descriptions from API
+        artist_details: Already resolved artist details by resource URL;
+            resolved here when not given
+
+    Returns:
+        ReleaseSnapshot: Immutable snapshot of the derived fields
+    """
+    api_response = api_response or {}
+    format_descriptions = format_descriptions or []
+    if artist_details is None:
+        artist_details = resolve_artist_details(collect_artist_resources(api_response))
+
+    return ReleaseSnapshot(
+        key=get_snapshot_key(api_response, notes, artists_sort, format_descriptions),
+        notes=transform_info_notes(notes, artists_sort, format_descriptions, api_response, artist_details),
+        credit_line=transform_info_credit_line(artists_sort, format_descriptions, api_response, artist_details),
+        artist_details=freeze(artist_details),
+        tracklist=freeze(transform_info_tracklist(
+            api_response.get('tracklist', []),
+            transform_info_artist(artists_sort),  # Album artist as shown in the info panel
+            artist_details
+        ))
+    )
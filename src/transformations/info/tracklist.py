@@ -3,47 +3,25 @@ Tracklist transformations
 """
 import re
 from typing import List, Dict, Optional
-import requests
+from ...api.artist_resolver import get_artist_details
 
-DISCOGS_USER_AGENT = "AlbumCategorizer/1.0"
-
-def get_artist_details(resource_url: str) -> tuple[str, list[str]]:
-    """
-    Fetch artist's details from Discogs API
-    
-    Args:
-        resource_url: Artist's resource URL from Discogs API
-        
-    Returns:
-        Tuple of (realname, list of member names)
-    """
-    try:
-        headers = {'User-Agent': DISCOGS_USER_AGENT}
-        response = requests.get(resource_url, headers=headers)
-        response.raise_for_status()
-        artist_data = response.json()
-        
-        realname = artist_data.get('realname', '')
-        members = [member.get('name', '') for member in artist_data.get('members', [])]
-        # Filter out empty member names
-        members = [name for name in members if name]
-        
-        return realname, members
-    except:
-        return '', []
-
-def format_artist_with_details(artist_name: str, resource_url: str) -> str:
+def format_artist_with_details(artist_name: str, resource_url: str, artist_details: dict = None) -> str:
     """
     Format artist name with real name or member names if available
     
     Args:
         artist_name: Artist's display name
         resource_url: Artist's resource URL from Discogs API
+        artist_details: Already resolved details by resource URL; the artist is
+            fetched only when this is not given
         
     Returns:
         Formatted artist name, potentially with real name or members in parentheses
     """
-    realname, members = get_artist_details(resource_url)
+    if artist_details is not None:
+        realname, members = artist_details.get(resource_url, ('', []))
+    else:
+        realname, members = get_artist_details(resource_url)
     
     # If we have a realname and it's different from the artist name, use that
     if realname and realname.strip() != artist_name.strip():
@@ -99,12 +77,13 @@ def transform_track_duration(duration: str) -> str:
     """
     return duration or ''
 
-def transform_track_extra_artists(extra_artists: List[Dict]) -> List[Dict[str, str]]:
+def transform_track_extra_artists(extra_artists: List[Dict], artist_details: Optional[Dict] = None) -> List[Dict[str, str]]:
     """
     Transform track extra artists
     
     Args:
         extra_artists: Extra artists from API
+        artist_details: Already resolved artist details by resource URL
         
     Returns:
         List of transformed extra artists with role and name
@@ -119,7 +98,7 @@ def transform_track_extra_artists(extra_artists: List[Dict]) -> List[Dict[str, s
         
         # For Remix role, fetch and add artist details
         if role == 'Remix' and name and artist.get('resource_url'):
-            name = format_artist_with_details(name, artist['resource_url'])
+            name = format_artist_with_details(name, artist['resource_url'], artist_details)
             
         if name and role:
             transformed.append({
@@ -129,13 +108,14 @@ def transform_track_extra_artists(extra_artists: List[Dict]) -> List[Dict[str, s
     
     return transformed
 
-def transform_track(track_data: Dict, album_artist: str = '') -> Dict[str, any]:
+def transform_track(track_data: Dict, album_artist: str = '', artist_details: Optional[Dict] = None) -> Dict[str, any]:
     """
     Transform a single track's data
     
     Args:
         track_data: Track data from API
         album_artist: Album's main artist, used as fallback if track has no specific artists
+        artist_details: Already resolved artist details by resource URL
         
     Returns:
         Transformed track data
@@ -167,16 +147,18 @@ def transform_track(track_data: Dict, album_artist: str = '') -> Dict[str, any]:
         'artist': transform_track_artist(artist),
         'title': transform_track_title(track_data.get('title', '')),
         'duration': transform_track_duration(track_data.get('duration', '')),
-        'extra_artists': transform_track_extra_artists(track_data.get('extraartists', []))
+        'extra_artists': transform_track_extra_artists(track_data.get('extraartists', []), artist_details)
     }
 
-def transform_info_tracklist(tracklist: List[Dict], album_artist: str = '') -> List[Dict[str, any]]:
+def transform_info_tracklist(tracklist: List[Dict], album_artist: str = '', artist_details: Optional[Dict] = None) -> List[Dict[str, any]]:
     """
     Transform tracklist data for info panel
     
     Args:
         tracklist: List of tracks from API
         album_artist: Album's main artist, used as fallback if track has no specific artists
+        artist_details: Already resolved artist details by resource URL; when
+            not given, Remix credits are looked up one by one
         
     Returns:
         List of transformed track data
@@ -184,4 +166,4 @@ def transform_info_tracklist(tracklist: List[Dict], album_artist: str = '') -> L
     if not tracklist:
         return []
     
-    return [transform_track(track, album_artist) for track in tracklist]
+    return [transform_track(track, album_artist, artist_details) for track in tracklist]
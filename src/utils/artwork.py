@@ -0,0 +1,88 @@
+"""
+Artwork preparation and image analysis
+"""
+import os
+from io import BytesIO
+from typing import Dict
+from PIL import Image, ImageStat
+
+# Longest side of embedded artwork in pixels, 0 keeps the original size
+ARTWORK_MAX_SIZE = int(os.getenv('ARTWORK_MAX_SIZE', 1000))
+
+# JPEG quality of downscaled or converted artwork
+ARTWORK_QUALITY = int(os.getenv('ARTWORK_QUALITY', 90))
+
+def prepare_artwork(data: bytes, max_size: int = ARTWORK_MAX_SIZE, quality: int = ARTWORK_QUALITY) -> bytes:
+    """
+    Downscale and re-encode artwork as JPEG for embedding
+
+    JPEGs that already fit are returned unchanged, so they aren't
+    re-compressed.
+
+    Args:
+        data: Image data
+        max_size: Longest side in pixels, 0 keeps the original size
+        quality: JPEG quality (1-95) of re-encoded images
+
+    Returns:
+        bytes: JPEG data
+    """
+    with Image.open(BytesIO(data)) as img:
+        fits = not max_size or max(img.size) <= max_size
+        if fits and img.format == 'JPEG':
+            return data
+        img = img.convert('RGB')
+        if not fits:
+            img.thumbnail((max_size, max_size), Image.Resampling.LANCZOS)
+        output = BytesIO()
+        img.save(output, format='JPEG', quality=quality, optimize=True)
+        return output.getvalue()
+
+# Width and height of the grayscale image a difference hash compares, giving 64 bits
+DHASH_SIZE = 8
+
+def get_dhash(img: Image.Image) -> int:
+    """
+    Compute the difference hash of an image
+
+    Similar images have hashes that differ in few bits, regardless of size and
+    JPEG compression.
+
+    Args:
+        img: Image
+
+    Returns:
+        int: 64-bit hash
+    """
+    pixels = list(img.convert('L').resize((DHASH_SIZE + 1, DHASH_SIZE), Image.Resampling.LANCZOS).getdata())
+    value = 0
+    for row in range(DHASH_SIZE):
+        for col in range(DHASH_SIZE):
+            left = pixels[row * (DHASH_SIZE + 1) + col]
+            right = pixels[row * (DHASH_SIZE + 1) + col + 1]
+            value = (value << 1) | (left > right)
+    return value
+
+def get_hash_distance(a: int, b: int) -> int:
+    """Count the bits two image hashes differ in"""
+    return bin(a ^ b).count('1')
+
+def analyze_image_file(path: str) -> Dict:
+    """
+    Hash and measure an image file
+
+    Args:
+        path: Image file path
+
+    Returns:
+        Dict: 'dhash', 'width', 'height', 'bytes' of the file and 'contrast'
+        (standard deviation of the grayscale pixels)
+    """
+    with Image.open(path) as img:
+        return {
+            'dhash': get_dhash(img),
+            'width': img.width,
+            'height': img.height,
+            'bytes': os.path.getsize(path),
+            'contrast': ImageStat.Stat(img.convert('L')).stddev[0]
+        }
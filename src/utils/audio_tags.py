@@ -0,0 +1,200 @@
+"""
+Audio file tag reading from memory
+"""
+from dataclasses import dataclass, field
+from io import BytesIO
+from typing import Dict, Optional
+from mutagen import File
+from mutagen.easyid3 import EasyID3
+from mutagen.easymp4 import EasyMP4Tags
+from mutagen.flac import FLAC, Picture
+from mutagen.id3 import ID3, APIC, COMM, ID3NoHeaderError
+from mutagen.mp4 import MP4Tags
+
+# Vorbis comment (FLAC, Ogg) names of the editor's tags
+VORBIS_TAG_MAPPING = {
+    'TITLE': 'title',
+    'ARTIST': 'artist',
+    'ALBUM': 'album',
+    'ALBUMARTIST': 'albumartist',
+    'DATE': 'date',
+    'GENRE': 'genre',
+    'TRACKNUMBER': 'tracknumber',
+    'DISCNUMBER': 'discnumber',
+    'ORGANIZATION': 'organization',
+    'COPYRIGHT': 'copyright',
+    'DESCRIPTION': 'comment'
+}
+
+# Vorbis comment names the editor's tags are written as
+VORBIS_WRITE_MAPPING = {value: key for key, value in VORBIS_TAG_MAPPING.items()}
+
+# Picture type of front covers in ID3 APIC frames and FLAC pictures
+FRONT_COVER = 3
+
+@dataclass
+class AudioFileInfo:
+    """
+    Everything the tag editor shows about an audio file, from one parse
+
+    Attributes:
+        tags: Tag values by EasyID3 key, e.g. 'title' or 'tracknumber'
+        artwork: Front cover image data
+        length: Duration in seconds
+        info: Stream info: 'format', 'bitrate' (bps), 'sample_rate' (Hz) and 'channels'
+        error: Why the file couldn't be read, None if it could
+    """
+    tags: Dict[str, str] = field(default_factory=dict)
+    artwork: Optional[bytes] = None
+    length: float = 0.0
+    info: Dict = field(default_factory=dict)
+    error: Optional[str] = None
+
+def _read_registered_keys(tags, registry: Dict) -> Dict[str, str]:
+    """Read tags through the getters of an easy tag interface (EasyID3.Get, EasyMP4Tags.Get)"""
+    values = {}
+    for key, getter in registry.items():
+        try:
+            value = getter(tags, key)
+        except (KeyError, ValueError, IndexError):
+            continue
+        if value and value[0]:
+            values[key] = str(value[0])
+    return values
+
+def _read_id3(id3: ID3, result: AudioFileInfo) -> None:
+    """Read ID3 text tags, the English comment and the front cover"""
+    result.tags.update(_read_registered_keys(id3, EasyID3.Get))
+    for frame in id3.getall('COMM'):
+        if frame.lang == 'eng' and frame.text:
+            result.tags['comment'] = str(frame.text[0])
+            break
+    for frame in id3.getall('APIC'):
+        if frame.type == FRONT_COVER:
+            result.artwork = frame.data
+            break
+
+def _read_vorbis(audio, result: AudioFileInfo) -> None:
+    """Read Vorbis comments (or other key-value tags) and the front cover of FLAC files"""
+    for key, value in audio.tags.items():
+        if value:
+            result.tags[VORBIS_TAG_MAPPING.get(key.upper(), key.lower())] = value[0] if isinstance(value, list) else str(value)
+    for picture in getattr(audio, 'pictures', []):
+        if picture.type == FRONT_COVER:
+            result.artwork = picture.data
+            break
+
+def _read_mp4(tags: MP4Tags, result: AudioFileInfo) -> None:
+    """Read MP4 atoms and the first cover"""
+    result.tags.update(_read_registered_keys(tags, EasyMP4Tags.Get))
+    covers = tags.get('covr')
+    if covers:
+        result.artwork = bytes(covers[0])
+
+def read_audio_file(data: bytes, filename: str = '') -> AudioFileInfo:
+    """
+    Read tags, front cover and stream info of an audio file in memory
+
+    The file is parsed once, straight from the buffer, without temporary files.
+
+    Args:
+        data: File contents
+        filename: File name, helps detecting the format
+
+    Returns:
+        AudioFileInfo: Everything that could be read; 'error' is set for
+        files mutagen can't parse
+    """
+    buffer = BytesIO(data)
+    buffer.name = filename
+    result = AudioFileInfo()
+    try:
+        audio = File(buffer)
+    except Exception as e:
+        result.error = str(e)
+        return result
+    if audio is None:
+        result.error = 'Unknown audio format'
+        return result
+
+    stream = audio.info
+    result.length = getattr(stream, 'length', 0.0) or 0.0
+    result.info = {
+        'format': type(audio).__name__,
+        'bitrate': getattr(stream, 'bitrate', None),
+        'sample_rate': getattr(stream, 'sample_rate', None),
+        'channels': getattr(stream, 'channels', None)
+    }
+
+    tags = audio.tags
+    try:
+        if isinstance(tags, ID3):
+            _read_id3(tags, result)
+        elif isinstance(tags, MP4Tags):
+            _read_mp4(tags, result)
+        elif tags is not None:
+            _read_vorbis(audio, result)
+    except Exception as e:
+        result.error = f'Error reading tags: {e}'
+    return result
+
+def _write_flac_tags(path: str, metadata: Dict) -> None:
+    """Replace the Vorbis comments and pictures of a FLAC file"""
+    audio = FLAC(path)
+    audio.clear_pictures()
+    if audio.tags is None:
+        audio.add_tags()
+    else:
+        audio.tags.clear()
+    for key, value in metadata.items():
+        if key == 'artwork':
+            if isinstance(value, bytes):
+                picture = Picture()
+                picture.type = FRONT_COVER
+                picture.mime = 'image/jpeg'
+                picture.desc = 'Front cover'
+                picture.data = value
+                audio.add_picture(picture)
+        elif key != 'length' and value:
+            audio.tags[VORBIS_WRITE_MAPPING.get(key.lower(), key.upper())] = str(value)
+    audio.save()
+
+def _write_id3_tags(path: str, metadata: Dict) -> None:
+    """Replace the ID3 tags of a file, saved as ID3v2.3"""
+    try:
+        ID3(path).delete()
+    except ID3NoHeaderError:
+        pass
+    id3 = ID3()
+    for key, value in metadata.items():
+        if key in ('artwork', 'length', 'comment') or not value:
+            continue
+        setter = EasyID3.Set.get(key)
+        if setter is None:
+            raise ValueError(f'Error setting {key}: unsupported tag')
+        setter(id3, key, [str(value)])
+    if metadata.get('comment'):
+        id3.add(COMM(encoding=3, lang='eng', desc='description', text=metadata['comment']))
+    if isinstance(metadata.get('artwork'), bytes):
+        id3.add(APIC(encoding=3, mime='image/jpeg', type=FRONT_COVER, desc='Cover', data=metadata['artwork']))
+    id3.save(path, v2_version=3)
+
+def write_audio_tags(path: str, metadata: Dict, extension: str) -> None:
+    """
+    Replace the tags and artwork of an audio file
+
+    FLAC files get Vorbis comments, every other format ID3 tags.
+
+    Args:
+        path: Audio file path
+        metadata: Tag values by EasyID3 key; 'artwork' holds JPEG data
+        extension: Original file extension, e.g. '.flac'
+
+    Raises:
+        mutagen.MutagenError: If the file can't be read or written
+        ValueError: If a tag isn't supported
+    """
+    if extension.lower() == '.flac':
+        _write_flac_tags(path, metadata)
+    else:
+        _write_id3_tags(path, metadata)
@@ -2,10 +2,55 @@
 File operations utilities
 """
 import os
+import shutil
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 import streamlit as st
 import requests
-from io import BytesIO
-from PIL import Image
+from ..api.image_cache import get_cached_content_type
+from ..api.images import open_image
+from .audio_tags import write_audio_tags
+
+# Parallel image downloads when saving several images
+MAX_IMAGE_SAVE_WORKERS = 6
+
+# Audio files tagged and written in parallel when saving an album
+MAX_AUDIO_SAVE_WORKERS = min(8, (os.cpu_count() or 1) * 2)
+
+# File extensions of image Content-Types
+IMAGE_EXTENSIONS = {
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+    'image/gif': '.gif',
+    'image/webp': '.webp'
+}
+
+@contextmanager
+def atomic_write(path):
+    """
+    Write a file under a temporary name and rename it into place
+
+    The temporary file is created next to the target with the default
+    permissions, like open() would, so readers never see a partial file and
+    the result isn't private to this user.
+
+    Args:
+        path: Path of the file to write
+
+    Yields:
+        str: Path of the empty temporary file to write to; it replaces the
+        target when the block succeeds and is removed when it fails
+    """
+    temp_path = f"{path}.{uuid.uuid4().hex[:8]}.part"
+    os.close(os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666))
+    try:
+        yield temp_path
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
 
 def create_album_folder(folder_name):
     """Create a folder for the album in the export directory"""
@@ -27,21 +72,26 @@ def create_album_folder(folder_name):
         st.toast(f"Folder already exists: {os.path.basename(album_dir)}", icon="⚠️")
         return False
 
-def create_info_file(folder_name, content):
-    """Create an info file for the album in the export directory"""
+def get_export_dir():
+    """Get the absolute path of the export directory"""
     # Get the absolute path of the current script
     current_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    
-    # Get export directory
-    export_dir = os.path.join(current_dir, 'export', folder_name)
+    return os.path.join(current_dir, 'export')
+
+def get_info_file_path(folder_name):
+    """Get the path of an album's info file in the export directory"""
+    return os.path.join(get_export_dir(), folder_name, f"{folder_name}.txt")
+
+def create_info_file(folder_name, content):
+    """Create an info file for the album in the export directory"""
+    # Create info file path
+    info_file_path = get_info_file_path(folder_name)
 
     # Create export directory if it doesn't exist
+    export_dir = os.path.dirname(info_file_path)
     if not os.path.exists(export_dir):
         os.makedirs(export_dir)
     
-    # Create info file path
-    info_file_path = os.path.join(export_dir, f"{folder_name}.txt")
-    
     # Check if the file already exists
     try:
         with open(info_file_path, 'w', encoding='utf-8') as f:
@@ -52,37 +102,167 @@ def create_info_file(folder_name, content):
         st.toast(f"Error creating info file: {str(e)}", icon="❌")
         return False
 
+def get_image_extension(content_type):
+    """Get the file extension of an image from its Content-Type, '.jpg' if unknown"""
+    content_type = (content_type or '').split(';')[0].strip().lower()
+    return IMAGE_EXTENSIONS.get(content_type, '.jpg')
+
+def write_image_file(image_url, folder_name, image_type):
+    """
+    Write an image into the album folder
+
+    The image is streamed from the image cache (downloading it if needed) to a
+    temporary file next to the target, which is then renamed into place.
+
+    Args:
+        image_url: Image URL
+        folder_name: Album folder name in the export directory
+        image_type: Image type used as the file name suffix, e.g. 'Front'
+
+    Returns:
+        str: Path of the written file
+
+    Raises:
+        requests.exceptions.RequestException: If the download fails
+        OSError: If the file can't be written
+    """
+    export_dir = os.path.join(get_export_dir(), folder_name)
+    os.makedirs(export_dir, exist_ok=True)
+
+    with open_image(image_url) as source:
+        # The Content-Type is known once the image is cached
+        extension = get_image_extension(get_cached_content_type(image_url))
+        file_path = os.path.join(export_dir, f"{folder_name} ({image_type}){extension}")
+
+        with atomic_write(file_path) as temp_path, open(temp_path, 'wb') as target:
+            shutil.copyfileobj(source, target)
+    return file_path
+
+def get_unique_image_types(image_types):
+    """
+    Number repeated image types so every image gets its own file
+
+    Args:
+        image_types: Image types in image order, e.g. ['Front', 'Other', 'Other']
+
+    Returns:
+        list: Types with repeats numbered, e.g. ['Front', 'Other', 'Other 2']
+    """
+    seen = {}
+    unique = []
+    for image_type in image_types:
+        seen[image_type] = seen.get(image_type, 0) + 1
+        unique.append(image_type if seen[image_type] == 1 else f"{image_type} {seen[image_type]}")
+    return unique
+
+def save_images(images, folder_name, on_progress=None):
+    """
+    Write several images into the album folder in parallel
+
+    Images of the same type are numbered ('Other', 'Other 2', ...) instead
+    of overwriting each other.
+
+    Args:
+        images: (image_url, image_type) pairs
+        folder_name: Album folder name in the export directory
+        on_progress: Called with (done, total, image_type, error) after each
+            image, from the calling thread
+
+    Returns:
+        list: (image_type, error) pairs of the failed images
+    """
+    failed = []
+    if not images:
+        return failed
+    image_types = get_unique_image_types([image_type for _, image_type in images])
+    with ThreadPoolExecutor(max_workers=min(MAX_IMAGE_SAVE_WORKERS, len(images))) as executor:
+        futures = {
+            executor.submit(write_image_file, image_url, folder_name, image_type): image_type
+            for (image_url, _), image_type in zip(images, image_types)
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            image_type = futures[future]
+            try:
+                future.result()
+                error = None
+            except requests.exceptions.HTTPError as e:
+                error = f"HTTP {e.response.status_code}"
+            except Exception as e:
+                error = str(e)
+            if error:
+                failed.append((image_type, error))
+            if on_progress:
+                on_progress(done, len(images), image_type, error)
+    return failed
+
 def save_image(image_url, folder_name, image_type):
     """Create an image file for the album in the export directory"""
-    # Get the absolute path of the current script
-    current_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    
-    # Get export directory
-    export_dir = os.path.join(current_dir, 'export', folder_name)
-
-    # Create export directory if it doesn't exist
-    if not os.path.exists(export_dir):
-        os.makedirs(export_dir)
-    
     try:
-        # Download image
-        headers = {
-            'User-Agent': 'AlbumCategorizer/1.0'
-        }
-        response = requests.get(image_url, headers=headers)
-        if response.status_code != 200:
-            st.toast(f"Failed to download image: HTTP {response.status_code}", icon="❌")
-            return False
-
-        # Create filename with type suffix
-        filename = f"{folder_name} ({image_type}).jpg"
-        file_path = os.path.join(export_dir, filename)
-        
-        # Save image
-        with open(file_path, 'wb') as f:
-            f.write(response.content)
-        st.toast(f"Saved image: {os.path.basename(file_path)}", icon="✅")
-        return True
+        file_path = write_image_file(image_url, folder_name, image_type)
+    except requests.exceptions.HTTPError as e:
+        st.toast(f"Failed to download image: HTTP {e.response.status_code}", icon="❌")
+        return False
     except Exception as e:
         st.toast(f"Error saving image: {str(e)}", icon="❌")
         return False
+    st.toast(f"Saved image: {os.path.basename(file_path)}", icon="✅")
+    return True
+
+def write_audio_file(source, export_path, metadata):
+    """
+    Write an audio file with new tags
+
+    The audio data is written to a temporary file next to the target, tagged
+    there and renamed into place, so the target never holds a half-tagged file.
+
+    Args:
+        source: Uploaded file, anything with getvalue() and a name
+        export_path: Path of the tagged file
+        metadata: Tags to write, see write_audio_tags
+
+    Returns:
+        str: Path of the written file
+
+    Raises:
+        mutagen.MutagenError: If the tags can't be written
+        OSError: If the file can't be written
+    """
+    _, extension = os.path.splitext(source.name)
+    with atomic_write(export_path) as temp_path:
+        with open(temp_path, 'wb') as f:
+            f.write(source.getvalue())
+        write_audio_tags(temp_path, metadata, extension)
+    return export_path
+
+def save_audio_files(files, on_progress=None):
+    """
+    Tag and write several audio files in parallel
+
+    Args:
+        files: (source, export_path, metadata) tuples, see write_audio_file
+        on_progress: Called with (done, total, file_name, error) after each
+            file, from the calling thread
+
+    Returns:
+        list: (file_name, error) pairs of the failed files
+    """
+    failed = []
+    if not files:
+        return failed
+    with ThreadPoolExecutor(max_workers=min(MAX_AUDIO_SAVE_WORKERS, len(files))) as executor:
+        futures = {
+            executor.submit(write_audio_file, source, export_path, metadata): os.path.basename(export_path)
+            for source, export_path, metadata in files
+        }
+        for done, future in enumerate(as_completed(futures), 1):
+            file_name = futures[future]
+            try:
+                future.result()
+                error = None
+            except Exception as e:
+                error = str(e) or type(e).__name__
+            if error:
+                failed.append((file_name, error))
+            if on_progress:
+                on_progress(done, len(files), file_name, error)
+    return failed
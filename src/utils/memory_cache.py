@@ -0,0 +1,137 @@
+"""
+Process-wide in-memory LRU caches shared by all sessions
+"""
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+# Byte budgets per cache, overridable with MEMORY_CACHE_<NAME>_MB
+DEFAULT_CACHE_SIZES_MB = {
+    'releases': 64,
+    'artists': 8,
+    'images': 256,
+    'tags': 32
+}
+
+def estimate_size(value: Any) -> int:
+    """
+    Estimate the memory footprint of a cached value in bytes
+
+    Args:
+        value: Cached value
+
+    Returns:
+        int: Approximate size in bytes
+    """
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    if isinstance(value, str):
+        return len(value.encode('utf-8'))
+    try:
+        return len(json.dumps(value, default=str, separators=(',', ':')))
+    except (TypeError, ValueError):
+        return 1024
+
+class MemoryCache:
+    """Thread-safe LRU cache bounded by the total size of its values"""
+
+    def __init__(self, name: str, max_bytes: int):
+        self.name = name
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[Any, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a value and mark it as recently used"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, value: Any, size: Optional[int] = None) -> None:
+        """
+        Store a value, evicting least recently used entries to stay in budget
+
+        Values larger than the whole budget are not cached.
+        """
+        size = estimate_size(value) if size is None else size
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def pop(self, key: str) -> None:
+        """Remove a value if present"""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry[1]
+
+    def clear(self) -> None:
+        """Remove every value and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Get size and usage counters"""
+        with self._lock:
+            return {
+                'cache': self.name,
+                'entries': len(self._entries),
+                'size_mb': round(self._bytes / 1024 / 1024, 2),
+                'max_mb': round(self.max_bytes / 1024 / 1024, 2),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
+
+_caches: Dict[str, MemoryCache] = {}
+_caches_lock = threading.Lock()
+
+def get_memory_cache(name: str) -> MemoryCache:
+    """
+    Get a named cache, creating it on first use
+
+    Args:
+        name: Cache name ('releases', 'artists', 'images', ...)
+
+    Returns:
+        MemoryCache: Cache shared by every session of this server process
+    """
+    cache = _caches.get(name)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.get(name)
+            if cache is None:
+                size_mb = float(os.getenv(f'MEMORY_CACHE_{name.upper()}_MB', DEFAULT_CACHE_SIZES_MB.get(name, 16)))
+                cache = _caches[name] = MemoryCache(name, int(size_mb * 1024 * 1024))
+    return cache
+
+def get_memory_cache_stats() -> List[Dict[str, Any]]:
+    """Get the stats of every cache"""
+    return [cache.stats() for cache in list(_caches.values())]
+
+def clear_memory_caches() -> None:
+    """Clear every cache"""
+    for cache in list(_caches.values()):
+        cache.clear()
@@ -0,0 +1,63 @@
+"""
+SQLite storage utilities
+"""
+import os
+import sqlite3
+import threading
+
+_local = threading.local()
+
+# Databases whose schema was created by this process, by (path, schema)
+_schemas_created = set()
+_schema_lock = threading.Lock()
+
+def get_cache_dir() -> str:
+    """
+    Get the local cache directory, creating it if needed
+
+    The directory defaults to 'cache' next to the 'export' directory and can be
+    overridden with the ALBUM_CATEGORIZER_CACHE_DIR environment variable.
+
+    Returns:
+        str: Absolute path of the cache directory
+    """
+    # Get the absolute path of the current script
+    current_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+    cache_dir = os.getenv('ALBUM_CATEGORIZER_CACHE_DIR') or os.path.join(current_dir, 'cache')
+    os.makedirs(cache_dir, exist_ok=True)
+    return cache_dir
+
+def connect(db_name: str, schema: str = None) -> sqlite3.Connection:
+    """
+    Get a connection to a database in the cache directory
+
+    Connections are kept per thread, so callers can use the returned
+    connection freely from worker threads. The schema script runs once per
+    database and process, under a lock, so concurrent first calls don't race.
+
+    Args:
+        db_name: Database file name inside the cache directory
+        schema: SQL script creating the tables, e.g. 'CREATE TABLE IF NOT EXISTS ...'
+
+    Returns:
+        sqlite3.Connection: Open connection in WAL mode
+    """
+    db_path = os.path.join(get_cache_dir(), db_name)
+    connections = getattr(_local, 'connections', None)
+    if connections is None:
+        connections = _local.connections = {}
+
+    conn = connections.get(db_path)
+    if conn is None:
+        conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        connections[db_path] = conn
+
+    if schema and (db_path, schema) not in _schemas_created:
+        with _schema_lock:
+            if (db_path, schema) not in _schemas_created:
+                conn.executescript(schema)
+                _schemas_created.add((db_path, schema))
+    return conn
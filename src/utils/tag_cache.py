@@ -0,0 +1,84 @@
+"""
+Background tag reading and caching of uploaded audio files
+"""
+import hashlib
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable
+from .audio_tags import AudioFileInfo, read_audio_file
+from .memory_cache import get_memory_cache
+
+# Worker threads parsing uploads, shared by every session
+MAX_TAG_READ_WORKERS = min(8, (os.cpu_count() or 1) + 2)
+
+# Bytes counted per cached file on top of its artwork
+TAG_ENTRY_OVERHEAD = 4096
+
+_executor = ThreadPoolExecutor(max_workers=MAX_TAG_READ_WORKERS, thread_name_prefix='tag-read')
+_pending: Dict[str, Future] = {}
+_pending_lock = threading.Lock()
+
+def get_upload_key(uploaded_file) -> str:
+    """
+    Get the cache key of an uploaded file
+
+    Streamlit gives every upload a unique file ID; objects without one are
+    keyed by a hash of their contents.
+    """
+    file_id = getattr(uploaded_file, 'file_id', None)
+    if file_id:
+        return f'upload:{file_id}'
+    return f'sha256:{hashlib.sha256(uploaded_file.getvalue()).hexdigest()}'
+
+def _read_and_cache(key: str, uploaded_file) -> AudioFileInfo:
+    """Parse an uploaded file and store the result in the 'tags' cache"""
+    try:
+        audio_info = read_audio_file(uploaded_file.getvalue(), uploaded_file.name)
+        get_memory_cache('tags').put(key, audio_info, len(audio_info.artwork or b'') + TAG_ENTRY_OVERHEAD)
+        return audio_info
+    finally:
+        with _pending_lock:
+            _pending.pop(key, None)
+
+def start_tag_reads(uploaded_files: Iterable) -> None:
+    """
+    Parse uploaded files in the background unless they are cached or being parsed
+
+    Args:
+        uploaded_files: Streamlit UploadedFile objects
+    """
+    cache = get_memory_cache('tags')
+    for uploaded_file in uploaded_files:
+        key = get_upload_key(uploaded_file)
+        if cache.get(key) is not None:
+            continue
+        with _pending_lock:
+            if key not in _pending:
+                _pending[key] = _executor.submit(_read_and_cache, key, uploaded_file)
+
+def get_audio_info(uploaded_file) -> AudioFileInfo:
+    """
+    Get the parsed tags, artwork and stream info of an uploaded file
+
+    Waits for a background read of the file if one is running, and parses the
+    file here if it was never read.
+
+    Args:
+        uploaded_file: Streamlit UploadedFile object
+
+    Returns:
+        AudioFileInfo: Shared between sessions, don't modify it
+    """
+    key = get_upload_key(uploaded_file)
+    cache = get_memory_cache('tags')
+    audio_info = cache.get(key)
+    if audio_info is not None:
+        return audio_info
+    with _pending_lock:
+        future = _pending.get(key)
+    if future is not None:
+        return future.result()
+    # A background read may have finished since the first lookup
+    audio_info = cache.get(key)
+    return audio_info if audio_info is not None else _read_and_cache(key, uploaded_file)